@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Archiwum pogody (src.data_handlers.archiwum_pogody): rozmiar na dysku
+w porównaniu z migawką float64 oraz odczyt miesiąca danych w porównaniu
+z odtworzeniem całego archiwum.
+
+Uruchomienie z katalogu projektu:
+    python -m benchmarks.bench_archiwum_pogody [liczba_dni]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from datetime import date
+from src.analyzers.analiza_pogody import AnalizatorPogodowy
+from src.data_handlers.archiwum_pogody import ArchiwumPogody, zapisz_archiwum
+from benchmarks.dane_syntetyczne import generuj_pogode_csv
+
+def _rozmiar(katalog: str) -> int:
+    return sum(os.path.getsize(os.path.join(katalog, p)) for p in os.listdir(katalog))
+
+def main(dni: int = 36_500, powtorzenia: int = 5) -> None:
+    with tempfile.TemporaryDirectory() as katalog:
+        sciezka = os.path.join(katalog, 'pogoda.csv')
+        generuj_pogode_csv(sciezka, dni)
+        analizator = AnalizatorPogodowy()
+        analizator.wczytaj_dane(sciezka, uzyj_migawki=False)
+        magazyn = analizator.magazyn
+
+        t_zapis = timeit.timeit(lambda: zapisz_archiwum(magazyn, os.path.join(katalog, 'archiwum')), number=1)
+        magazyn.zapisz_migawke(os.path.join(katalog, 'migawka'))
+        r_archiwum = _rozmiar(os.path.join(katalog, 'archiwum'))
+        r_migawka = _rozmiar(os.path.join(katalog, 'migawka'))
+        print(f"{len(magazyn)} wierszy: zapis archiwum {t_zapis * 1000:.0f} ms   "
+              f"archiwum {r_archiwum / 1e6:.2f} MB   migawka float64 {r_migawka / 1e6:.2f} MB   "
+              f"stopień kompresji: {r_migawka / r_archiwum:.1f}x")
+
+        archiwum = ArchiwumPogody(os.path.join(katalog, 'archiwum'))
+        od = date.fromordinal(date(2023, 1, 1).toordinal() + dni // 2)
+        do = date.fromordinal(od.toordinal() + 29)
+        t_zakres = min(timeit.repeat(lambda: archiwum.wczytaj_magazyn(od, do), number=1, repeat=powtorzenia))
+        t_calosc = min(timeit.repeat(archiwum.wczytaj_magazyn, number=1, repeat=powtorzenia))
+        print(f"Odczyt 30 dni wszystkich lokalizacji: {t_zakres * 1000:.2f} ms   "
+              f"całe archiwum: {t_calosc * 1000:.1f} ms   przyspieszenie: {t_calosc / t_zakres:.0f}x")
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Tryb Pareto rekomendacji: sort-filter-skyline a porównanie każdej trasy
+z każdą.
+
+Uruchomienie z katalogu projektu:
+    python -m benchmarks.bench_front_pareto [liczba_tras]
+"""
+import os
+import sys
+import tempfile
+import timeit
+import numpy as np
+from src.analyzers.analiza_pogody import AnalizatorPogodowy
+from src.data_handlers.menadzer_danych_tras import MenadzerDanychTras
+from src.models.preferencje import PreferencjeUzytkownika
+from src.recommenders.front_pareto import front_pareto
+from src.recommenders.rekomendator_tras import RekomendatorTras
+from benchmarks.dane_syntetyczne import generuj_trasy_csv, generuj_pogode_csv
+
+def front_parami(kryteria: np.ndarray) -> np.ndarray:
+    """Sprawdzenie dominacji dla każdej pary punktów - O(N^2)."""
+    niezdominowane = [
+        i for i, punkt in enumerate(kryteria)
+        if not ((kryteria <= punkt).all(axis=1) & (kryteria < punkt).any(axis=1)).any()
+    ]
+    return np.array(niezdominowane, dtype=np.int64)
+
+def main(n_tras: int = 100_000, n_parami: int = 10_000) -> None:
+    with tempfile.TemporaryDirectory() as katalog:
+        generuj_trasy_csv(os.path.join(katalog, 'trasy.csv'), n_tras)
+        generuj_pogode_csv(os.path.join(katalog, 'pogoda.csv'), 30)
+        magazyn = MenadzerDanychTras().wczytaj_trasy(os.path.join(katalog, 'trasy.csv'))
+        analizator = AnalizatorPogodowy()
+        analizator.wczytaj_dane(os.path.join(katalog, 'pogoda.csv'))
+
+    pref = PreferencjeUzytkownika(temp_pref=(0, 30), max_opady_mm=100, max_trudnosc=5, max_dlugosc_km=30)
+    rekomendator = RekomendatorTras(magazyn, analizator._dane, pref, indeks_pogody=analizator.indeks)
+    t = min(timeit.repeat(lambda: rekomendator.generuj_front_pareto('2023-01-15'), number=1, repeat=3))
+    print(f"generuj_front_pareto dla {n_tras} tras: {t * 1000:.1f} ms "
+          f"({len(rekomendator.generuj_front_pareto('2023-01-15'))} tras na froncie)")
+
+    kryteria = np.random.default_rng(0).random((n_parami, 4))
+    assert np.array_equal(front_pareto(kryteria), front_parami(kryteria))
+    t_sfs = min(timeit.repeat(lambda: front_pareto(kryteria), number=1, repeat=3))
+    t_parami = timeit.timeit(lambda: front_parami(kryteria), number=1)
+    print(f"{n_parami} losowych punktów 4D: sort-filter-skyline {t_sfs * 1000:.1f} ms   "
+          f"parami {t_parami * 1000:.1f} ms   przyspieszenie: {t_parami / t_sfs:.1f}x")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Zapytania sezonowe: kostka agregatów (KostkaPogodowa) a agregacja
+wszystkich rekordów przy każdym wywołaniu.
+
+Uruchomienie z katalogu projektu:
+    python -m benchmarks.bench_kostka_pogody [liczba_dni]
+"""
+import os
+import sys
+import tempfile
+import timeit
+import numpy as np
+from src.analyzers.agregaty_pogodowe import KostkaPogodowa, SrednieMiesieczneKomfortu
+from src.analyzers.analiza_pogody import AnalizatorPogodowy
+from src.data_handlers.magazyn_pogody import KOLUMNY_POGODY
+from benchmarks.dane_syntetyczne import generuj_pogode_csv
+
+def _agregacja_przy_zapytaniu(analizator: AnalizatorPogodowy, region: str) -> list:
+    """Dotychczasowy algorytm: agregacja całego magazynu przy każdym zapytaniu."""
+    agregat = SrednieMiesieczneKomfortu(region)
+    agregat.dodaj(analizator.magazyn)
+    return agregat.najlepsze_miesiace(region)
+
+def main(dni: int = 36_500, powtorzenia: int = 5) -> None:
+    with tempfile.TemporaryDirectory() as katalog:
+        sciezka = os.path.join(katalog, 'pogoda.csv')
+        generuj_pogode_csv(sciezka, dni)
+        analizator = AnalizatorPogodowy()
+        analizator.wczytaj_dane(sciezka, uzyj_migawki=False)
+    magazyn = analizator.magazyn
+
+    t_budowa = timeit.timeit(lambda: KostkaPogodowa(magazyn), number=1)
+    print(f"Budowa kostki dla {len(magazyn)} wierszy: {t_budowa * 1000:.1f} ms")
+
+    assert analizator.najlepsze_okresy('Tatry') == _agregacja_przy_zapytaniu(analizator, 'Tatry')
+    t_kostka = min(timeit.repeat(lambda: analizator.najlepsze_okresy('Tatry'), number=1, repeat=powtorzenia))
+    t_skan = min(timeit.repeat(lambda: _agregacja_przy_zapytaniu(analizator, 'Tatry'), number=1, repeat=powtorzenia))
+    print(f"najlepsze_okresy: kostka {t_kostka * 1e6:.0f} us   agregacja przy zapytaniu {t_skan * 1000:.2f} ms"
+          f"   przyspieszenie: {t_skan / t_kostka:.0f}x")
+
+    # Dopisanie jednego dnia dla wszystkich lokalizacji
+    ostatni = magazyn.data.max() + 1
+    lokalizacje = list(magazyn.lokalizacje)
+    magazyn.dodaj_kolumny(
+        np.full(len(lokalizacje), ostatni), lokalizacje,
+        {k: np.full(len(lokalizacje), 1.0) for k in KOLUMNY_POGODY},
+    )
+    t_aktualizacja = timeit.timeit(analizator.kostka.aktualizuj, number=1)
+    print(f"Aktualizacja kostki po dopisaniu {len(lokalizacje)} wierszy: {t_aktualizacja * 1000:.1f} ms")
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:2]))
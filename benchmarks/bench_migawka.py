@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Czas zimnego startu: parsowanie CSV a wczytanie binarnej migawki.
+
+Uruchomienie z katalogu projektu:
+    python -m benchmarks.bench_migawka [liczba_tras] [liczba_dni_pogody]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from src.data_handlers.menadzer_danych_tras import MenadzerDanychTras
+from src.analyzers.analiza_pogody import AnalizatorPogodowy
+from src.data_handlers.migawka import kompiluj_trasy, kompiluj_pogode
+from benchmarks.dane_syntetyczne import generuj_trasy_csv, generuj_pogode_csv
+
+def _czas(funkcja) -> float:
+    start = timeit.default_timer()
+    funkcja()
+    return timeit.default_timer() - start
+
+def main(n_tras: int = 200_000, dni: int = 3650) -> None:
+    with tempfile.TemporaryDirectory() as katalog:
+        sciezka_trasy = os.path.join(katalog, 'trasy.csv')
+        sciezka_pogoda = os.path.join(katalog, 'pogoda.csv')
+        generuj_trasy_csv(sciezka_trasy, n_tras)
+        generuj_pogode_csv(sciezka_pogoda, dni)
+
+        t_csv = _czas(lambda: MenadzerDanychTras().wczytaj_trasy(sciezka_trasy, uzyj_migawki=False))
+        t_kompilacja = _czas(lambda: kompiluj_trasy(sciezka_trasy))
+        t_migawka = _czas(lambda: MenadzerDanychTras().wczytaj_trasy(sciezka_trasy))
+        print(f"Trasy ({n_tras}): CSV {t_csv:.3f} s, migawka {t_migawka:.3f} s "
+              f"(kompilacja {t_kompilacja:.3f} s), przyspieszenie {t_csv / t_migawka:.1f}x")
+
+        t_csv = _czas(lambda: AnalizatorPogodowy().wczytaj_dane(sciezka_pogoda, uzyj_migawki=False))
+        t_kompilacja = _czas(lambda: kompiluj_pogode(sciezka_pogoda))
+        t_migawka = _czas(lambda: AnalizatorPogodowy().wczytaj_dane(sciezka_pogoda))
+        print(f"Pogoda ({dni} dni x regiony): CSV {t_csv:.3f} s, migawka {t_migawka:.3f} s "
+              f"(kompilacja {t_kompilacja:.3f} s), przyspieszenie {t_csv / t_migawka:.1f}x")
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:3]))
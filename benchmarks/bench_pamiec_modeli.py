@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Pamięć zajmowana przez rekord (tracemalloc): dawne modele z __dict__
+i własnym RouteRatingManager a modele z __slots__ i internowanymi napisami.
+
+Uruchomienie z katalogu projektu:
+    python -m benchmarks.bench_pamiec_modeli [liczba_tras] [liczba_dni_pogody]
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+from src.data_handlers.route_rating_manager import RouteRatingManager
+from src.data_handlers.wczytywanie_csv import czytaj_wiersze_partiami, parsuj_trase, parsuj_dane_pogodowe
+from src.data_handlers.menadzer_danych_tras import MenadzerDanychTras
+from src.data_handlers.menadzer_pogody import MenadzerDanychPogodowych
+from benchmarks.dane_syntetyczne import generuj_trasy_csv, generuj_pogode_csv
+
+class _DawnaTrasa:
+    """Układ Trasa sprzed zmiany: __dict__ i RouteRatingManager w każdej instancji."""
+
+    def __init__(self, row):
+        self._id = int(row['id'])
+        self._nazwa = row['nazwa']
+        self._region = row['region']
+        self._dlugosc_km = float(row['dlugosc_km'])
+        self._czas_przejscia = row['czas_przejscia']
+        self._trudnosc = float(row['trudnosc'])
+        self._przewyzszenie_m = int(row['przewyzszenie_m'])
+        self._punkt_startowy = row['punkt_startowy']
+        self._punkt_koncowy = row['punkt_koncowy']
+        self._opis = row['opis']
+        self._kategoria = row['kategoria']
+        self._rating_manager = RouteRatingManager()
+
+class _DawneDanePogodowe:
+    """Układ DanePogodowe sprzed zmiany: atrybuty w __dict__, bez internowania lokalizacji."""
+
+    def __init__(self, row):
+        self.data = datetime.strptime(row['date'], '%Y-%m-%d').date()
+        self.lokalizacja = row['location_id']
+        self.temp_srednia = float(row['avg_temp'])
+        self.temp_min = float(row['min_temp'])
+        self.temp_max = float(row['max_temp'])
+        self.opady_mm = float(row['precipitation'])
+        self.godziny_sloneczne = float(row['sunshine_hours'])
+        self.zachmurzenie_pct = float(row['cloud_cover'])
+
+def _bajty_na_rekord(wczytaj) -> float:
+    """Zwraca pamięć zaalokowaną i zatrzymaną przez wczytaj(), podzieloną przez liczbę rekordów."""
+    tracemalloc.start()
+    try:
+        rekordy = wczytaj()
+        zajete, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return zajete / len(rekordy)
+
+def _wszystkie(magazyn):
+    """Tworzy wszystkie obiekty magazynu (zapamiętywane w nim) i zwraca magazyn."""
+    for _ in magazyn:
+        pass
+    return magazyn
+
+def main(n_tras: int = 100_000, dni: int = 3650) -> None:
+    with tempfile.TemporaryDirectory() as katalog:
+        sciezka_trasy = os.path.join(katalog, 'trasy.csv')
+        sciezka_pogoda = os.path.join(katalog, 'pogoda.csv')
+        generuj_trasy_csv(sciezka_trasy, n_tras)
+        generuj_pogode_csv(sciezka_pogoda, dni)
+
+        wyniki = {
+            'Trasa: przed (__dict__, własny menedżer ocen)': lambda: [
+                _DawnaTrasa(row) for partia in czytaj_wiersze_partiami(sciezka_trasy) for row in partia
+            ],
+            'Trasa: po (__slots__, internowanie)': lambda: [
+                parsuj_trase(row) for partia in czytaj_wiersze_partiami(sciezka_trasy) for row in partia
+            ],
+            'Trasa: magazyn kolumnowy bez obiektów': lambda: MenadzerDanychTras().wczytaj_trasy(
+                sciezka_trasy, uzyj_migawki=False
+            ),
+            'DanePogodowe: przed (__dict__)': lambda: [
+                _DawneDanePogodowe(row)
+                for partia in czytaj_wiersze_partiami(sciezka_pogoda) for row in partia
+            ],
+            'DanePogodowe: po (__slots__, internowanie)': lambda: [
+                parsuj_dane_pogodowe(row) for partia in czytaj_wiersze_partiami(sciezka_pogoda) for row in partia
+            ],
+            'DanePogodowe: magazyn, wszystkie obiekty': lambda: _wszystkie(
+                MenadzerDanychPogodowych().wczytaj_dane(sciezka_pogoda, uzyj_migawki=False)
+            ),
+            'DanePogodowe: magazyn kolumnowy bez obiektów': lambda: MenadzerDanychPogodowych().wczytaj_dane(
+                sciezka_pogoda, uzyj_migawki=False
+            ),
+        }
+        for nazwa, wczytaj in wyniki.items():
+            print(f"{nazwa:<48} {_bajty_na_rekord(wczytaj):8.0f} B/rekord")
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:3]))
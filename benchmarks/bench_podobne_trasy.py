@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Porównanie wyszukiwania tras podobnych: drzewo k-d (IndeksPodobienstwaTras)
+i pełne porównanie ze wszystkimi trasami.
+
+Uruchomienie z katalogu projektu:
+    python -m benchmarks.bench_podobne_trasy [liczba_tras]
+"""
+import os
+import sys
+import tempfile
+import timeit
+import numpy as np
+from src.data_handlers.menadzer_danych_tras import MenadzerDanychTras
+from src.data_handlers.indeks_podobienstwa import IndeksPodobienstwaTras
+from benchmarks.dane_syntetyczne import generuj_trasy_csv
+
+def pelne_porownanie(cechy: np.ndarray, wiersz: int, k: int) -> np.ndarray:
+    """Odległości od wszystkich tras i sortowanie - bez indeksu."""
+    odleglosci = ((cechy - cechy[wiersz]) ** 2).sum(axis=1)
+    odleglosci[wiersz] = np.inf
+    return np.lexsort((np.arange(len(odleglosci)), odleglosci))[:k]
+
+def main(n: int = 100_000, zapytania: int = 200, k: int = 5) -> None:
+    with tempfile.TemporaryDirectory() as katalog:
+        sciezka = os.path.join(katalog, 'trasy.csv')
+        generuj_trasy_csv(sciezka, n)
+        menadzer = MenadzerDanychTras()
+        menadzer.wczytaj_trasy(sciezka)
+
+    start = timeit.default_timer()
+    indeks = IndeksPodobienstwaTras(menadzer.magazyn, oceny=lambda id_trasy: None)
+    print(f"Budowa indeksu dla {n} tras: {timeit.default_timer() - start:.3f} s")
+
+    cechy = np.array([indeks.cechy(i) for i in range(n)])
+    wiersze = np.random.default_rng(0).integers(0, n, zapytania).tolist()
+    for wiersz in wiersze[:20]:
+        _, odleglosci = indeks.podobne(wiersz, k)
+        oczekiwane = pelne_porownanie(cechy, wiersz, k)
+        assert np.allclose(odleglosci, np.sqrt(((cechy[oczekiwane] - cechy[wiersz]) ** 2).sum(axis=1)))
+
+    t_drzewo = timeit.timeit(lambda: [indeks.podobne(w, k) for w in wiersze], number=1) / zapytania
+    t_pelne = timeit.timeit(lambda: [pelne_porownanie(cechy, w, k) for w in wiersze], number=1) / zapytania
+    print(f"Zapytanie o {k} podobnych tras: drzewo k-d {t_drzewo * 1000:.2f} ms   "
+          f"pełne porównanie {t_pelne * 1000:.2f} ms   przyspieszenie: {t_pelne / t_drzewo:.1f}x")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Generowanie rekomendacji: ocena trasa po trasie a wektorowy silnik oceny.
+
+Uruchomienie z katalogu projektu:
+    python -m benchmarks.bench_rekomendacje [liczba_tras]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from datetime import date
+import numpy as np
+from src.analyzers.analiza_pogody import AnalizatorPogodowy
+from src.data_handlers.magazyn_pogody import KOLUMNY_POGODY
+from src.data_handlers.menadzer_danych_tras import MenadzerDanychTras
+from src.models.preferencje import PreferencjeUzytkownika
+from src.recommenders.pamiec_wynikow import PamiecWynikow
+from src.recommenders.rekomendator_tras import RekomendatorTras
+from benchmarks.dane_syntetyczne import generuj_trasy_csv, generuj_pogode_csv
+
+DZIEN = date(2023, 6, 15)
+
+def _rekomendacje_w_petli(trasy, indeks, pref) -> list:
+    """Dotychczasowy algorytm: wywołania metod preferencji dla każdej trasy."""
+    wyniki = []
+    for trasa in trasy:
+        if not trasa.dopasowana_do_preferencji(pref):
+            continue
+        dane = indeks.pobierz(trasa.region, DZIEN)
+        if not dane:
+            continue
+        pogoda_score = pref.zgodnosc_z_pogoda(dane)
+        if pogoda_score == 0:
+            continue
+        score = pogoda_score * pref.wagi.get('pogoda', 0.5) + pref.zgodnosc_z_trasa(trasa) * pref.wagi.get('trudnosc', 0.5)
+        wyniki.append({'trasa': trasa, 'dane_pogodowe': dane, 'score': score})
+    wyniki.sort(key=lambda x: x['score'], reverse=True)
+    return wyniki
+
+def _zmien_opady(magazyn, dzien: date) -> None:
+    """Zmienia opady w pierwszym wierszu danego dnia - jak aktualizacja pogody jednego regionu."""
+    wiersz = np.flatnonzero(magazyn.data == np.datetime64(dzien))[:1]
+    kolumny = {k: magazyn.kolumna(k)[wiersz] for k in KOLUMNY_POGODY}
+    kolumny['opady_mm'] = (kolumny['opady_mm'] + 0.1) % 5
+    magazyn.zastap_kolumny(wiersz, magazyn.data[wiersz], [magazyn.lokalizacje[magazyn.lokalizacja_kod[wiersz[0]]]],
+                           kolumny)
+
+def main(n_tras: int = 100_000, n_uzytkownikow: int = 50) -> None:
+    with tempfile.TemporaryDirectory() as katalog:
+        sciezka_trasy = os.path.join(katalog, 'trasy.csv')
+        sciezka_pogoda = os.path.join(katalog, 'pogoda.csv')
+        generuj_trasy_csv(sciezka_trasy, n_tras)
+        generuj_pogode_csv(sciezka_pogoda, 365)
+        magazyn = MenadzerDanychTras().wczytaj_trasy(sciezka_trasy)
+        analizator = AnalizatorPogodowy()
+        analizator.wczytaj_dane(sciezka_pogoda)
+
+    pref = PreferencjeUzytkownika(temp_pref=(10, 25), max_opady_mm=8, max_trudnosc=4, max_dlugosc_km=20)
+    trasy = list(magazyn)
+    rekomendator = RekomendatorTras(magazyn, analizator._dane, pref, analizator.indeks)
+
+    petla = _rekomendacje_w_petli(trasy, analizator.indeks, pref)
+    wektorowo = rekomendator.generuj_rekomendacje(DZIEN.isoformat())
+    assert [(r['trasa'].id, r['score']) for r in petla] == [(r['trasa'].id, r['score']) for r in wektorowo]
+
+    t_petla = min(timeit.repeat(lambda: _rekomendacje_w_petli(trasy, analizator.indeks, pref), number=1, repeat=3))
+    t_ocena = min(timeit.repeat(lambda: rekomendator.ocen(DZIEN), number=1, repeat=3))
+    t_wektorowo = min(timeit.repeat(lambda: rekomendator.generuj_rekomendacje(DZIEN.isoformat()), number=1, repeat=3))
+    assert rekomendator.generuj_rekomendacje(DZIEN.isoformat(), top_k=10) == wektorowo[:10]
+    # Jednorazowo: nowy rekomendator bez pamięci (ranking, partycje i odcinanie regionów od zera)
+    t_top_k = min(timeit.repeat(
+        lambda: RekomendatorTras(magazyn, analizator._dane, pref, analizator.indeks).ocen(DZIEN, top_k=10),
+        number=1, repeat=3
+    ))
+    # Jak serwer: nowy rekomendator na zapytanie, partycje współdzielone przez pamięć wyników
+    pamiec = PamiecWynikow()
+    RekomendatorTras(magazyn, analizator._dane, pref, analizator.indeks, pamiec=pamiec).ocen(DZIEN, top_k=10)
+    t_top_k_serwer = min(timeit.repeat(
+        lambda: RekomendatorTras(magazyn, analizator._dane, pref, analizator.indeks, pamiec=pamiec).ocen(DZIEN, top_k=10),
+        number=1, repeat=3
+    ))
+    t_top_k_ponownie = min(timeit.repeat(lambda: rekomendator.ocen(DZIEN, top_k=10), number=1, repeat=3))
+    t_top_k_zmiana = min(timeit.repeat(lambda: (_zmien_opady(analizator.magazyn, DZIEN), rekomendator.ocen(DZIEN, top_k=10)),
+                                       number=1, repeat=5))
+
+    uzytkownicy = [
+        PreferencjeUzytkownika(temp_pref=(10, 25), max_opady_mm=4 + i % 8, max_trudnosc=2 + i % 4,
+                               max_dlugosc_km=10 + i % 15, wagi={'pogoda': 0.3 + (i % 5) / 10, 'trudnosc': 0.5})
+        for i in range(n_uzytkownikow)
+    ]
+    osobni = [RekomendatorTras(magazyn, analizator._dane, p, analizator.indeks) for p in uzytkownicy]
+    grupa = max(1, RekomendatorTras.ROZMIAR_MACIERZY_WSADOWEJ // n_tras)
+    t_osobno = min(timeit.repeat(lambda: [r.ocen(DZIEN) for r in osobni], number=1, repeat=3))
+    t_wsadowo = min(timeit.repeat(
+        lambda: [rekomendator.ocen_wsadowo(uzytkownicy[i:i + grupa], DZIEN) for i in range(0, n_uzytkownikow, grupa)],
+        number=1, repeat=3
+    ))
+    print(f"{n_tras} tras, {len(wektorowo)} rekomendacji (wyniki identyczne)")
+    print(f"  trasa po trasie:             {t_petla * 1000:8.1f} ms")
+    print(f"  wektorowo (tablice wyników): {t_ocena * 1000:8.1f} ms  ({t_petla / t_ocena:.0f}x)")
+    print(f"  wektorowo (lista słowników): {t_wektorowo * 1000:8.1f} ms  ({t_petla / t_wektorowo:.0f}x)")
+    print(f"  top_k=10, nowy rekomendator:         {t_top_k * 1000:8.2f} ms")
+    print(f"  top_k=10, nowy, wspólna pamięć:      {t_top_k_serwer * 1000:8.2f} ms")
+    print(f"  top_k=10, ponownie (bez zmian):      {t_top_k_ponownie * 1000:8.2f} ms")
+    print(f"  top_k=10, po zmianie pogody regionu: {t_top_k_zmiana * 1000:8.2f} ms")
+    print(f"{n_uzytkownikow} użytkowników, ocena wszystkich tras:")
+    print(f"  ocen() dla każdego osobno:   {t_osobno * 1000:8.1f} ms")
+    print(f"  ocen_wsadowo() (macierz):    {t_wsadowo * 1000:8.1f} ms  ({t_osobno / t_wsadowo:.1f}x)")
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Wyszukiwanie najbliższej stacji pogodowej: drzewo k-d (IndeksStacji)
+a obliczenie odległości do wszystkich stacji.
+
+Uruchomienie z katalogu projektu:
+    python -m benchmarks.bench_stacje_pogody [liczba_stacji]
+"""
+import sys
+import timeit
+import numpy as np
+from src.data_handlers.indeks_stacji import IndeksStacji, PROMIEN_ZIEMI_KM
+
+def najblizsza_skanem(szerokosci: np.ndarray, dlugosci: np.ndarray, punkt) -> int:
+    """Odległość po okręgu wielkim (haversine) do każdej stacji."""
+    s1, d1 = np.radians(punkt)
+    s2, d2 = np.radians(szerokosci), np.radians(dlugosci)
+    h = np.sin((s2 - s1) / 2) ** 2 + np.cos(s1) * np.cos(s2) * np.sin((d2 - d1) / 2) ** 2
+    return int(np.argmin(2 * PROMIEN_ZIEMI_KM * np.arcsin(np.sqrt(h))))
+
+def main(n: int = 5000, zapytania: int = 2000) -> None:
+    rng = np.random.default_rng(0)
+    szerokosci, dlugosci = rng.uniform(49, 55, n), rng.uniform(14, 24, n)
+    nazwy = [f'Stacja {i}' for i in range(n)]
+    t_budowa = timeit.timeit(lambda: IndeksStacji(dict(zip(nazwy, zip(szerokosci, dlugosci)))), number=1)
+    indeks = IndeksStacji(dict(zip(nazwy, zip(szerokosci, dlugosci))))
+    punkty = list(zip(rng.uniform(49, 55, zapytania).tolist(), rng.uniform(14, 24, zapytania).tolist()))
+
+    for punkt in punkty[:50]:
+        assert indeks.najblizsze(punkt)[0][0] == nazwy[najblizsza_skanem(szerokosci, dlugosci, punkt)]
+    t_drzewo = timeit.timeit(lambda: [indeks.najblizsze(p) for p in punkty], number=1) / zapytania
+    t_skan = timeit.timeit(lambda: [najblizsza_skanem(szerokosci, dlugosci, p) for p in punkty], number=1) / zapytania
+    print(f"{n} stacji: budowa indeksu {t_budowa * 1000:.1f} ms   zapytanie: drzewo k-d {t_drzewo * 1e6:.0f} us   "
+          f"skan {t_skan * 1e6:.0f} us   przyspieszenie: {t_skan / t_drzewo:.1f}x")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Średnie kroczące i trendy pogody regionu: pętla po obiektach DanePogodowe
+a okna z sum skumulowanych (AnalizatorPogodowy.trendy).
+
+Uruchomienie z katalogu projektu:
+    python -m benchmarks.bench_trendy_pogody [liczba_dni]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from datetime import timedelta
+import numpy as np
+from src.analyzers.analiza_pogody import AnalizatorPogodowy
+from benchmarks.dane_syntetyczne import generuj_pogode_csv
+
+def _trendy_w_petli(analizator: AnalizatorPogodowy, region: str, okno: int) -> list:
+    """Średnia i nachylenie prostej MNK temperatury liczone osobno dla każdego dnia."""
+    dane = {d.data: d for d in analizator.magazyn if d.lokalizacja == region}
+    wyniki = []
+    dzien, koniec = min(dane), max(dane)
+    while dzien <= koniec:
+        punkty = [(-k, dane[dzien - timedelta(days=k)].temp_srednia) for k in range(okno)
+                  if dzien - timedelta(days=k) in dane]
+        n = len(punkty)
+        sx = sum(x for x, _ in punkty)
+        sy = sum(y for _, y in punkty)
+        sxx = sum(x * x for x, _ in punkty)
+        sxy = sum(x * y for x, y in punkty)
+        mianownik = n * sxx - sx * sx
+        wyniki.append((sy / n, (n * sxy - sx * sy) / mianownik if mianownik else float('nan')))
+        dzien += timedelta(days=1)
+    return wyniki
+
+def main(dni: int = 3650, powtorzenia: int = 3) -> None:
+    with tempfile.TemporaryDirectory() as katalog:
+        sciezka = os.path.join(katalog, 'pogoda.csv')
+        generuj_pogode_csv(sciezka, dni)
+        analizator = AnalizatorPogodowy()
+        analizator.wczytaj_dane(sciezka, uzyj_migawki=False)
+
+    trendy = analizator.trendy('Tatry')
+    for okno in (7, 30):
+        oczekiwane = np.array(_trendy_w_petli(analizator, 'Tatry', okno))
+        wynik = trendy['temp_srednia'][okno]
+        assert np.allclose(wynik['srednia'], oczekiwane[:, 0]) and np.allclose(wynik['trend'][1:], oczekiwane[1:, 1])
+
+    t_wektorowo = min(timeit.repeat(lambda: analizator.trendy('Tatry'), number=1, repeat=powtorzenia))
+    t_petla = min(timeit.repeat(
+        lambda: [_trendy_w_petli(analizator, 'Tatry', okno) for okno in (7, 30)], number=1, repeat=powtorzenia
+    ))
+    print(f"Trendy regionu ({dni} dni, okna 7 i 30 dni): sumy skumulowane {t_wektorowo * 1000:.2f} ms "
+          f"(3 kolumny)   pętla {t_petla * 1000:.1f} ms (1 kolumna)   przyspieszenie: {t_petla / t_wektorowo:.0f}x")
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:2]))
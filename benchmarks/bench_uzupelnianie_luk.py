@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Uzupełnianie luk w danych pogodowych (src.data_handlers.uzupelnianie_luk):
+wektorowa interpolacja całego magazynu a pętla po dniach każdej lokalizacji.
+
+Uruchomienie z katalogu projektu:
+    python -m benchmarks.bench_uzupelnianie_luk [liczba_dni]
+"""
+import os
+import random
+import sys
+import tempfile
+import timeit
+from datetime import timedelta
+from src.analyzers.analiza_pogody import AnalizatorPogodowy
+from src.data_handlers.magazyn_pogody import KOLUMNY_POGODY
+from src.data_handlers.uzupelnianie_luk import MAKS_LUKA, uzupelnij_luki
+from benchmarks.dane_syntetyczne import generuj_pogode_csv
+
+def _uzupelnianie_w_petli(rekordy, maks_luka: int = MAKS_LUKA) -> list:
+    """Interpolacja liniowa dzień po dniu na obiektach DanePogodowe."""
+    po_lokalizacji = {}
+    for d in rekordy:
+        po_lokalizacji.setdefault(d.lokalizacja, {}).setdefault(d.data, d)
+    wyniki = []
+    for lokalizacja, dni in po_lokalizacji.items():
+        daty = sorted(dni)
+        for lewy, prawy in zip(daty, daty[1:]):
+            odstep = (prawy - lewy).days
+            if not 1 < odstep <= maks_luka + 1:
+                continue
+            for krok in range(1, odstep):
+                wyniki.append((lokalizacja, lewy + timedelta(days=krok), {
+                    k: getattr(dni[lewy], k) + (getattr(dni[prawy], k) - getattr(dni[lewy], k)) * (krok / odstep)
+                    for k in KOLUMNY_POGODY
+                }))
+    return wyniki
+
+def main(dni: int = 36_500, udzial_brakow: float = 0.05) -> None:
+    with tempfile.TemporaryDirectory() as katalog:
+        sciezka = os.path.join(katalog, 'pogoda.csv')
+        generuj_pogode_csv(sciezka, dni)
+        rnd = random.Random(1)
+        with open(sciezka, encoding='utf-8') as f:
+            linie = f.read().splitlines()
+        with open(sciezka, 'w', encoding='utf-8') as f:
+            f.write('\n'.join([linie[0]] + [l for l in linie[1:] if rnd.random() >= udzial_brakow]) + '\n')
+        analizator = AnalizatorPogodowy(uzupelnianie_luk=None)
+        analizator.wczytaj_dane(sciezka, uzyj_migawki=False)
+    magazyn = analizator.magazyn
+    pomiary = len(magazyn)
+
+    t_petla = timeit.timeit(lambda: _uzupelnianie_w_petli(magazyn), number=1)
+    t_wektor = timeit.timeit(lambda: uzupelnij_luki(magazyn), number=1)
+    uzupelnione = int(magazyn.uzupelnione.sum())
+    assert uzupelnione == len(_uzupelnianie_w_petli(magazyn[:pomiary]))
+    print(f"{pomiary} pomiarów, uzupełniono {uzupelnione} dni: wektorowo {t_wektor * 1000:.1f} ms   "
+          f"w pętli {t_petla * 1000:.0f} ms   przyspieszenie: {t_petla / t_wektor:.0f}x")
+
+    t_ponowne = timeit.timeit(lambda: uzupelnij_luki(magazyn), number=1)
+    print(f"Ponowne uzupełnianie bez zmian w danych: {t_ponowne * 1000:.1f} ms")
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:2]))
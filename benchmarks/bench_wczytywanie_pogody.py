@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Przepustowość wczytywania danych pogodowych (wiersze na sekundę):
+parsowanie wiersz po wierszu (strptime + float) a wektorowy loader.
+
+Uruchomienie z katalogu projektu:
+    python -m benchmarks.bench_wczytywanie_pogody [liczba_dni]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from src.data_handlers.menadzer_pogody import MenadzerDanychPogodowych
+from src.data_handlers.wczytywanie_csv import czytaj_wiersze_partiami, parsuj_dane_pogodowe
+from benchmarks.dane_syntetyczne import generuj_pogode_csv
+
+def _czas(funkcja) -> float:
+    start = timeit.default_timer()
+    funkcja()
+    return timeit.default_timer() - start
+
+def _wiersz_po_wierszu(sciezka: str) -> list:
+    return [parsuj_dane_pogodowe(row) for partia in czytaj_wiersze_partiami(sciezka) for row in partia]
+
+def main(dni: int = 36_500) -> None:
+    with tempfile.TemporaryDirectory() as katalog:
+        sciezka = os.path.join(katalog, 'pogoda.csv')
+        generuj_pogode_csv(sciezka, dni)
+        n = len(MenadzerDanychPogodowych().wczytaj_dane(sciezka, uzyj_migawki=False))
+
+        wyniki = {
+            'wiersz po wierszu': _czas(lambda: _wiersz_po_wierszu(sciezka)),
+            'wektorowo': _czas(lambda: MenadzerDanychPogodowych().wczytaj_dane(sciezka, uzyj_migawki=False)),
+            'wektorowo + wszystkie obiekty': _czas(
+                lambda: list(MenadzerDanychPogodowych().wczytaj_dane(sciezka, uzyj_migawki=False))
+            ),
+        }
+        print(f"Pogoda: {n} wierszy")
+        for nazwa, czas in wyniki.items():
+            print(f"  {nazwa:<30} {czas:.3f} s  {n / czas:,.0f} wierszy/s")
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:2]))
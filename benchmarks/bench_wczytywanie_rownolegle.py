@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Wczytywanie danych podzielonych na pliki (jeden na region): jeden proces
+a pula procesów.
+
+Uruchomienie z katalogu projektu:
+    python -m benchmarks.bench_wczytywanie_rownolegle [tras_na_plik] [dni_pogody]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from src.data_handlers.menadzer_danych_tras import MenadzerDanychTras
+from src.data_handlers.menadzer_pogody import MenadzerDanychPogodowych
+from benchmarks.dane_syntetyczne import generuj_trasy_csv, generuj_pogode_csv, REGIONY
+
+def _czas(funkcja) -> float:
+    start = timeit.default_timer()
+    funkcja()
+    return timeit.default_timer() - start
+
+def main(tras_na_plik: int = 50_000, dni: int = 3650) -> None:
+    with tempfile.TemporaryDirectory() as katalog:
+        katalog_tras = os.path.join(katalog, 'trasy')
+        katalog_pogody = os.path.join(katalog, 'pogoda')
+        os.makedirs(katalog_tras)
+        os.makedirs(katalog_pogody)
+        for i, region in enumerate(REGIONY):
+            generuj_trasy_csv(os.path.join(katalog_tras, f'{region}.csv'), tras_na_plik, seed=i,
+                              pierwszy_id=i * tras_na_plik + 1)
+            generuj_pogode_csv(os.path.join(katalog_pogody, f'{region}.csv'), dni, regiony=[region], seed=i)
+
+        print(f"{len(REGIONY)} plików, {os.cpu_count()} rdzeni")
+        for procesy in (1, None):
+            t_trasy = _czas(lambda: MenadzerDanychTras().wczytaj_trasy(katalog_tras, uzyj_migawki=False,
+                                                                       procesy=procesy))
+            t_pogoda = _czas(lambda: MenadzerDanychPogodowych().wczytaj_dane(katalog_pogody, uzyj_migawki=False,
+                                                                            procesy=procesy))
+            print(f"procesy={procesy or 'wszystkie rdzenie'}: trasy {t_trasy:.3f} s, pogoda {t_pogoda:.3f} s")
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:3]))
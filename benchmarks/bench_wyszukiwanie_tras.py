@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Porównanie wyszukiwania tras: indeks zakresowy, maska na magazynie kolumnowym
+i skan listy obiektów Trasa.
+
+Uruchomienie z katalogu projektu:
+    python -m benchmarks.bench_wyszukiwanie_tras [liczba_tras]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from typing import List, Dict, Any
+from src.data_handlers.menadzer_danych_tras import MenadzerDanychTras
+from src.models.trasy import Trasa
+from benchmarks.dane_syntetyczne import generuj_trasy_csv
+
+ZAPYTANIA = [
+    {'min_length': 8, 'max_length': 10, 'min_difficulty': 3, 'max_difficulty': 4, 'region': 'Tatry'},
+    {'max_length': 12, 'region': 'wszystkie'},
+    {'min_difficulty': 4.5, 'region': 'Bieszczady'},
+]
+
+def skan_listy(trasy: List[Trasa], parametry: Dict[str, Any]) -> List[Trasa]:
+    """Dotychczasowa implementacja wyszukiwania - pętla po obiektach Trasa."""
+    wyniki = []
+    for trasa in trasy:
+        if 'min_length' in parametry and trasa.dlugosc_km < parametry['min_length']:
+            continue
+        if 'max_length' in parametry and trasa.dlugosc_km > parametry['max_length']:
+            continue
+        if 'min_difficulty' in parametry and trasa.trudnosc < parametry['min_difficulty']:
+            continue
+        if 'max_difficulty' in parametry and trasa.trudnosc > parametry['max_difficulty']:
+            continue
+        if 'region' in parametry and parametry['region'] != 'wszystkie':
+            if trasa.region != parametry['region']:
+                continue
+        wyniki.append(trasa)
+    return wyniki
+
+def main(n: int = 200_000, powtorzenia: int = 5) -> None:
+    with tempfile.TemporaryDirectory() as katalog:
+        sciezka = os.path.join(katalog, 'trasy.csv')
+        generuj_trasy_csv(sciezka, n)
+        menadzer = MenadzerDanychTras()
+        start = timeit.default_timer()
+        menadzer.wczytaj_trasy(sciezka)
+        print(f"Wczytanie {n} tras do magazynu: {timeit.default_timer() - start:.3f} s")
+
+    lista = list(menadzer.magazyn)
+    for parametry in ZAPYTANIA:
+        assert [t.id for t in menadzer.wyszukaj_trasy(parametry)] == [t.id for t in skan_listy(lista, parametry)]
+        t_kol = min(timeit.repeat(lambda: menadzer.wyszukaj_trasy(parametry), number=1, repeat=powtorzenia))
+        t_maska = min(timeit.repeat(lambda: menadzer.magazyn.maska(parametry), number=1, repeat=powtorzenia))
+        t_lista = min(timeit.repeat(lambda: skan_listy(lista, parametry), number=1, repeat=powtorzenia))
+        print(f"{parametry}\n  wyszukaj_trasy (indeks): {t_kol * 1000:8.2f} ms   sama maska: {t_maska * 1000:8.2f} ms"
+              f"   skan listy: {t_lista * 1000:8.2f} ms   przyspieszenie: {t_lista / t_kol:5.1f}x")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import csv
+import random
+from datetime import date, timedelta
+
+REGIONY = ['Tatry', 'Beskidy', 'Pieniny', 'Bieszczady', 'Gorce', 'Karkonosze', 'Sudety', 'Podkarpacie']
+KATEGORIE = ['Górska', 'Leśna', 'Widokowa', 'Rodzinna']
+
+POLA_TRAS = ['id', 'nazwa', 'region', 'dlugosc_km', 'czas_przejscia', 'trudnosc', 'przewyzszenie_m',
+             'punkt_startowy', 'punkt_koncowy', 'opis', 'kategoria']
+POLA_POGODY = ['date', 'location_id', 'avg_temp', 'min_temp', 'max_temp', 'precipitation',
+               'sunshine_hours', 'cloud_cover']
+
+def generuj_trasy_csv(sciezka: str, n: int, seed: int = 0, pierwszy_id: int = 1) -> None:
+    """Zapisuje do pliku CSV n losowych tras w formacie data/trasy/trasy.csv (id od pierwszy_id)."""
+    rnd = random.Random(seed)
+    with open(sciezka, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(POLA_TRAS)
+        for i in range(pierwszy_id, pierwszy_id + n):
+            dlugosc = round(rnd.uniform(1, 30), 1)
+            godziny = int(dlugosc / 3.5)
+            writer.writerow([
+                i, f'Trasa {i}', rnd.choice(REGIONY), dlugosc, f'{godziny}h{rnd.randrange(0, 60, 15):02d}min',
+                round(rnd.uniform(1, 5) * 2) / 2, rnd.randint(0, 1800), f'Start {i}', f'Meta {i}',
+                rnd.choice(['Trasa z widokiem na góry', 'Spacer przez las', 'Szlak nad jeziorem']),
+                rnd.choice(KATEGORIE)
+            ])
+
+def generuj_pogode_csv(sciezka: str, dni: int, regiony=REGIONY, start: date = date(2023, 1, 1), seed: int = 0) -> None:
+    """Zapisuje do pliku CSV dzienne dane pogodowe dla regionów w formacie data/pogoda/pogoda.csv."""
+    rnd = random.Random(seed)
+    with open(sciezka, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(POLA_POGODY)
+        for region in regiony:
+            for d in range(dni):
+                avg = round(rnd.uniform(-5, 30), 1)
+                writer.writerow([
+                    (start + timedelta(days=d)).isoformat(), region, avg, round(avg - 5, 1), round(avg + 6, 1),
+                    round(max(0.0, rnd.uniform(-4, 12)), 1), round(rnd.uniform(0, 14), 1), rnd.randint(0, 100)
+                ])
@@ -69,6 +69,12 @@ def pobierz_parametry_wyszukiwania():
             continue
 
 if __name__ == '__main__':
+    # Tryb serwera: python main.py --serwer [--port 8080] - dane wczytywane raz, zapytania JSON przez HTTP
+    if len(sys.argv) > 1 and sys.argv[1] == '--serwer':
+        from src.interface.serwer_rekomendacji import main as uruchom_serwer
+        uruchom_serwer(sys.argv[2:])
+        sys.exit(0)
+
     menadzer_tras = MenadzerDanychTras()
     analizator_pogodowy = AnalizatorPogodowy()
     
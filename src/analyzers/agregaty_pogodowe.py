@@ -0,0 +1,322 @@
+from calendar import month_name
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from src.models.dane_pogodowe import DanePogodowe
+from src.data_handlers.magazyn_pogody import MagazynPogody, KOLUMNA_KOMFORTU
+
+class SrednieMiesieczneKomfortu:
+    """
+    Przyrostowy agregat średniego indeksu komfortu per lokalizacja i miesiąc.
+
+    Przechowuje jedynie sumy i liczności, więc można go zasilać kolejnymi
+    partiami danych bez trzymania wszystkich rekordów w pamięci.
+    """
+
+    def __init__(self, lokalizacja: Optional[str] = None, z_uzupelnionymi: bool = False):
+        """
+        Args:
+            lokalizacja: Jeśli podana, agregowane są tylko rekordy tej lokalizacji
+            z_uzupelnionymi: Czy doliczać wiersze magazynu z uzupełnionych luk
+                (MagazynPogody.uzupelnione); domyślnie tylko pomiary
+        """
+        self._lokalizacja = lokalizacja
+        self._z_uzupelnionymi = z_uzupelnionymi
+        # lokalizacja -> miesiąc -> [suma indeksów, liczba rekordów]
+        self._sumy: Dict[str, Dict[int, List[float]]] = {}
+        self._pierwsza_lokalizacja: Optional[str] = None
+
+    def dodaj(self, partia: Iterable[DanePogodowe]) -> None:
+        """Dolicza do agregatu partię rekordów pogodowych."""
+        if isinstance(partia, MagazynPogody):
+            self._dodaj_kolumny(partia)
+            return
+        for d in partia:
+            if self._pierwsza_lokalizacja is None:
+                self._pierwsza_lokalizacja = d.lokalizacja
+            if self._lokalizacja is not None and d.lokalizacja != self._lokalizacja:
+                continue
+            miesiace = self._sumy.setdefault(d.lokalizacja, {})
+            suma = miesiace.setdefault(d.data.month, [0, 0])
+            suma[0] += d.oblicz_indeks_komfortu()
+            suma[1] += 1
+
+    def _dodaj_kolumny(self, magazyn: MagazynPogody) -> None:
+        """
+        Dolicza magazyn pogody wprost z kolumn, bez tworzenia obiektów DanePogodowe.
+
+        Sumy rosną w kolejności wierszy (np.add.at), a miesiące dopisywane są
+        w kolejności pierwszego wystąpienia - wynik jak przy dodawaniu rekord po rekordzie.
+        """
+        if not len(magazyn):
+            return
+        kody = magazyn.lokalizacja_kod
+        if self._pierwsza_lokalizacja is None:
+            self._pierwsza_lokalizacja = magazyn.lokalizacje[kody[0]]
+        if self._lokalizacja is not None:
+            kod = magazyn.kod_lokalizacji(self._lokalizacja)
+            if kod is None:
+                return
+            wiersze = np.flatnonzero(kody == kod)
+        else:
+            wiersze = np.arange(len(magazyn))
+        if not self._z_uzupelnionymi:
+            wiersze = wiersze[~magazyn.uzupelnione[wiersze]]
+
+        miesiace = magazyn.data[wiersze].astype('datetime64[M]').astype(np.int64) % 12 + 1
+        grupy, pierwsze, numery = np.unique(
+            kody[wiersze].astype(np.int64) * 13 + miesiace, return_index=True, return_inverse=True
+        )
+        sumy = [None] * len(grupy)
+        for g in np.argsort(pierwsze, kind='stable').tolist():
+            kod, miesiac = divmod(int(grupy[g]), 13)
+            sumy[g] = self._sumy.setdefault(magazyn.lokalizacje[kod], {}).setdefault(miesiac, [0, 0])
+        wartosci = np.array([s[0] for s in sumy], dtype=np.float64)
+        np.add.at(wartosci, numery, magazyn.kolumna(KOLUMNA_KOMFORTU)[wiersze])
+        liczby = np.bincount(numery, minlength=len(grupy))
+        for suma, wartosc, liczba in zip(sumy, wartosci.tolist(), liczby.tolist()):
+            suma[0] = wartosc
+            suma[1] += liczba
+
+    @property
+    def lokalizacje(self) -> Collection[str]:
+        """Zagregowane lokalizacje (klucze słownika sum)."""
+        return self._sumy.keys()
+
+    @property
+    def pierwsza_lokalizacja(self) -> Optional[str]:
+        """Lokalizacja pierwszego dodanego rekordu."""
+        return self._pierwsza_lokalizacja
+
+    def najlepsze_miesiace(self, lokalizacja: str, top_n: int = 3) -> List[str]:
+        """
+        Zwraca nazwy miesięcy o najwyższym średnim komforcie.
+
+        Args:
+            lokalizacja: Nazwa lokalizacji
+            top_n: Liczba zwracanych miesięcy
+
+        Returns:
+            Lista nazw miesięcy (angielskich, jak calendar.month_name)
+        """
+        srednie = [(m, s / n) for m, (s, n) in self._sumy.get(lokalizacja, {}).items()]
+        srednie.sort(key=lambda x: x[1], reverse=True)
+        return [month_name[m] for m, _ in srednie[:top_n]]
+
+class KostkaPogodowa:
+    """
+    Kostka agregatów pogody: lokalizacja x miesiąc x statystyka.
+
+    Dla każdej pary (lokalizacja, miesiąc) przechowuje sumę, minimum,
+    maksimum i liczbę wartości kolumn KOLUMNY, więc zapytania sezonowe
+    nie przeglądają rekordów. Wartości NaN są pomijane.
+
+    Kostka aktualizowana jest przyrostowo: dopisane wiersze magazynu są
+    doliczane, a komórki, w których zmieniono wiersz (minimum i maksimum
+    nie dają się odjąć), liczone są od nowa z wierszy tych komórek.
+    Zmienione wiersze odczytywane są z dziennika magazynu
+    (MagazynPogody.zastapione_od). Wiersze z uzupełnionych luk (MagazynPogody.uzupelnione) domyślnie nie
+    są agregowane.
+    """
+
+    KOLUMNY = (KOLUMNA_KOMFORTU, 'temp_srednia', 'opady_mm', 'godziny_sloneczne')
+    STATYSTYKI = ('srednia', 'min', 'max', 'liczba')
+
+    def __init__(self, magazyn: MagazynPogody, z_uzupelnionymi: bool = False):
+        """
+        Args:
+            magazyn: Magazyn pogody, którego wiersze agreguje kostka
+            z_uzupelnionymi: Czy agregować także wiersze uzupełnionych luk
+        """
+        self._magazyn = magazyn
+        self._z_uzupelnionymi = z_uzupelnionymi
+        # wersja magazynu, z której zbudowano kostkę
+        self._wersja: Optional[int] = None
+        # komórki (kod lokalizacji * 12 + miesiąc - 1) zagregowanych wierszy
+        self._komorki = np.empty(0, dtype=np.int64)
+        # komórka x kolumna
+        self._suma = np.empty((0, len(self.KOLUMNY)))
+        self._min = np.empty((0, len(self.KOLUMNY)))
+        self._max = np.empty((0, len(self.KOLUMNY)))
+        self._liczba = np.empty((0, len(self.KOLUMNY)), dtype=np.int64)
+        # pierwszy wiersz komórki - rozstrzyga remisy jak kolejność wystąpienia w SrednieMiesieczneKomfortu
+        self._pierwszy = np.empty(0, dtype=np.int64)
+        self.aktualizuj()
+
+    def _wyzeruj(self, komorki: np.ndarray) -> None:
+        self._suma[komorki] = 0.0
+        self._min[komorki] = np.inf
+        self._max[komorki] = -np.inf
+        self._liczba[komorki] = 0
+        self._pierwszy[komorki] = np.iinfo(np.int64).max
+
+    def aktualizuj(self) -> None:
+        """Uzgadnia kostkę z magazynem po dopisaniu lub zmianie jego wierszy."""
+        if self._wersja == self._magazyn.wersja:
+            return
+        liczba = len(self._magazyn)
+        znane = len(self._komorki)
+        zmienione = None if self._wersja is None else self._magazyn.zastapione_od(self._wersja)
+        if zmienione is None or znane > liczba:
+            # Dziennik nie sięga wersji kostki - kostka liczona od nowa
+            znane = 0
+            zmienione = np.empty(0, dtype=np.int64)
+            self._wyzeruj(np.arange(len(self._pierwszy)))
+        zmienione = np.unique(zmienione[zmienione < znane])
+
+        # Komórki liczone tylko dla nowych i zmienionych wierszy
+        do_wyliczenia = np.concatenate([zmienione, np.arange(znane, liczba)])
+        miesiace = self._magazyn.data[do_wyliczenia].astype('datetime64[M]').astype(np.int64) % 12
+        komorki = np.concatenate([self._komorki[:znane], np.empty(liczba - znane, dtype=np.int64)])
+        stare_komorki = komorki[zmienione]
+        komorki[do_wyliczenia] = self._magazyn.lokalizacja_kod[do_wyliczenia].astype(np.int64) * 12 + miesiace
+
+        nowe_komorki = np.arange(len(self._pierwszy), 12 * len(self._magazyn.lokalizacje))
+        for nazwa in ('_suma', '_min', '_max', '_liczba'):
+            tablica = getattr(self, nazwa)
+            setattr(self, nazwa, np.concatenate([tablica, np.empty((len(nowe_komorki), tablica.shape[1]), tablica.dtype)]))
+        self._pierwszy = np.concatenate([self._pierwszy, np.empty(len(nowe_komorki), dtype=np.int64)])
+        self._wyzeruj(nowe_komorki)
+
+        if len(zmienione):
+            dotkniete = np.union1d(stare_komorki, komorki[zmienione])
+            self._wyzeruj(dotkniete)
+            self._dolicz(np.flatnonzero(np.isin(komorki[:znane], dotkniete)), komorki)
+        self._dolicz(np.arange(znane, liczba), komorki)
+
+        self._komorki = komorki
+        self._wersja = self._magazyn.wersja
+
+    def _dolicz(self, wiersze: np.ndarray, komorki: np.ndarray) -> None:
+        """Dolicza wiersze magazynu do ich komórek w kolejności wierszy."""
+        if not self._z_uzupelnionymi:
+            wiersze = wiersze[~self._magazyn.uzupelnione[wiersze]]
+        if not len(wiersze):
+            return
+        komorki = komorki[wiersze]
+        for j, nazwa in enumerate(self.KOLUMNY):
+            wartosci = self._magazyn.kolumna(nazwa)[wiersze]
+            znane = ~np.isnan(wartosci)
+            k, wartosci = komorki[znane], wartosci[znane]
+            np.add.at(self._suma[:, j], k, wartosci)
+            np.minimum.at(self._min[:, j], k, wartosci)
+            np.maximum.at(self._max[:, j], k, wartosci)
+            self._liczba[:, j] += np.bincount(k, minlength=len(self._liczba))
+        np.minimum.at(self._pierwszy, komorki, wiersze)
+
+    def _komorka(self, lokalizacja: str, miesiac: int) -> Optional[int]:
+        if not 1 <= miesiac <= 12:
+            raise ValueError(f"Niepoprawny miesiąc: {miesiac}")
+        self.aktualizuj()
+        kod = self._magazyn.kod_lokalizacji(lokalizacja)
+        if kod is None or not self._liczba[kod * 12 + miesiac - 1].any():
+            return None
+        return kod * 12 + miesiac - 1
+
+    def statystyki(self, lokalizacja: str, miesiac: int) -> Optional[Dict[str, Dict[str, float]]]:
+        """
+        Zwraca statystyki pogody lokalizacji w danym miesiącu (ze wszystkich lat).
+
+        Args:
+            lokalizacja: Nazwa lokalizacji
+            miesiac: Numer miesiąca (1-12)
+
+        Returns:
+            Słownik kolumna -> {'srednia', 'min', 'max', 'liczba'} lub None, jeśli brak danych
+
+        Raises:
+            ValueError: Gdy numer miesiąca jest spoza zakresu 1-12
+        """
+        komorka = self._komorka(lokalizacja, miesiac)
+        if komorka is None:
+            return None
+        wynik = {}
+        for j, nazwa in enumerate(self.KOLUMNY):
+            liczba = int(self._liczba[komorka, j])
+            if not liczba:
+                wynik[nazwa] = {'srednia': None, 'min': None, 'max': None, 'liczba': 0}
+                continue
+            wynik[nazwa] = {
+                'srednia': float(self._suma[komorka, j]) / liczba,
+                'min': float(self._min[komorka, j]),
+                'max': float(self._max[komorka, j]),
+                'liczba': liczba,
+            }
+        return wynik
+
+    def srednie_miesieczne(self, lokalizacja: str, kolumna: str = KOLUMNA_KOMFORTU) -> Dict[int, float]:
+        """
+        Zwraca średnie wartości kolumny w miesiącach, dla których są dane.
+
+        Args:
+            lokalizacja: Nazwa lokalizacji
+            kolumna: Jedna z KOLUMNY
+
+        Returns:
+            Słownik numer miesiąca -> średnia, w kolejności pierwszego wystąpienia miesiąca w danych
+        """
+        self.aktualizuj()
+        kod = self._magazyn.kod_lokalizacji(lokalizacja)
+        if kod is None:
+            return {}
+        j = self.KOLUMNY.index(kolumna)
+        komorki = np.arange(kod * 12, kod * 12 + 12)
+        komorki = komorki[self._liczba[komorki, j] > 0]
+        komorki = komorki[np.argsort(self._pierwszy[komorki], kind='stable')]
+        return {
+            int(k) % 12 + 1: s / n
+            for k, s, n in zip(komorki.tolist(), self._suma[komorki, j].tolist(), self._liczba[komorki, j].tolist())
+        }
+
+    def najlepsze_miesiace(self, lokalizacja: str, top_n: int = 3) -> List[str]:
+        """
+        Zwraca nazwy miesięcy o najwyższym średnim komforcie (jak SrednieMiesieczneKomfortu).
+
+        Args:
+            lokalizacja: Nazwa lokalizacji
+            top_n: Liczba zwracanych miesięcy
+
+        Returns:
+            Lista nazw miesięcy (angielskich, jak calendar.month_name)
+        """
+        srednie = list(self.srednie_miesieczne(lokalizacja).items())
+        srednie.sort(key=lambda x: x[1], reverse=True)
+        return [month_name[m] for m, _ in srednie[:top_n]]
+
+def okna_kroczace(wartosci: np.ndarray, okno: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Liczy średnią kroczącą i trend w oknie kolejnych dni kończącym się w każdym dniu.
+
+    Sumy okien wyznaczane są z różnic sum skumulowanych, więc koszt nie
+    zależy od długości okna. Trend to nachylenie prostej najmniejszych
+    kwadratów dopasowanej do dni okna (zmiana wartości na dzień). Dni bez
+    danych (NaN) są pomijane; pierwsze okna obejmują tylko dostępne dni.
+
+    Args:
+        wartosci: Wartości kolejnych dni kalendarzowych (NaN - brak danych)
+        okno: Długość okna w dniach
+
+    Returns:
+        Krotka (średnia, trend); NaN, gdy okno nie zawiera danych
+        (trend - gdy zawiera mniej niż dwa dni)
+    """
+    if okno < 1:
+        raise ValueError("Okno musi obejmować co najmniej jeden dzień")
+    n = len(wartosci)
+    znane = ~np.isnan(wartosci)
+    # Numery dni wyśrodkowane, by ograniczyć błędy zaokrągleń sum kwadratów
+    x = np.where(znane, np.arange(n) - (n - 1) / 2, 0.0)
+    y = np.where(znane, wartosci, 0.0)
+    poczatki = np.maximum(np.arange(1, n + 1) - okno, 0)
+
+    def sumy_okien(a: np.ndarray) -> np.ndarray:
+        skumulowane = np.concatenate([[0.0], np.cumsum(a)])
+        return skumulowane[1:] - skumulowane[poczatki]
+
+    liczba = sumy_okien(znane.astype(np.float64))
+    suma_x, suma_y = sumy_okien(x), sumy_okien(y)
+    suma_xx, suma_xy = sumy_okien(x * x), sumy_okien(x * y)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        srednia = np.where(liczba > 0, suma_y / liczba, np.nan)
+        mianownik = liczba * suma_xx - suma_x * suma_x
+        trend = np.where((liczba >= 2) & (mianownik > 0), (liczba * suma_xy - suma_x * suma_y) / mianownik, np.nan)
+    return srednia, trend
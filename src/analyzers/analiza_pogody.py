@@ -1,35 +1,59 @@
-from collections import defaultdict
-from calendar import month_name
-from src.models.dane_pogodowe import DanePogodowe
-from typing import Dict, List, Any, Optional
-from statistics import mean
-from datetime import datetime
-import csv
 from datetime import datetime, date
-
-import csv
-from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from src.config import REGION_COORDINATES
 from src.models.dane_pogodowe import DanePogodowe
+from src.data_handlers.archiwum_pogody import ArchiwumPogody, zapisz_archiwum
+from src.data_handlers.indeks_pogody import IndeksPogody
+from src.data_handlers.indeks_stacji import IndeksStacji, StacjeMagazynu, najblizsza_stacja
+from src.data_handlers.magazyn_pogody import MagazynPogody, KOLUMNA_KOMFORTU, KOLUMNY_POGODY
+from src.data_handlers.menadzer_pogody import MenadzerDanychPogodowych
+from src.data_handlers.uzupelnianie_luk import MAKS_LUKA
+from src.analyzers.agregaty_pogodowe import KostkaPogodowa, SrednieMiesieczneKomfortu, okna_kroczace
 
 class AnalizatorPogodowy:
-    def __init__(self, dane_pogodowe: List[DanePogodowe] = None):
-        """Inicjalizuje analizator pogodowy."""
-        self._dane = dane_pogodowe or []
-        # Mapowanie nazw regionów
-        self._region_map = {
-            'Tatry': 'Tatry',
-            'Beskidy': 'Beskidy',
-            'Pieniny': 'Pieniny',
-            'Bieszczady': 'Bieszczady',
-            'Gorce': 'Tatry',  # Używamy danych z Tatr dla Gorców (najbliższy region)
-            'Karkonosze': 'Karkonosze',
-            'Jura Krakowsko-Częstochowska': 'Jura Krakowsko-Częstochowska',
-            'Góry Stołowe': 'Góry Stołowe',
-            'Sudety': 'Sudety',
-            'Podkarpacie': 'Podkarpacie',
-            'wszystkie': None  # Dla wszystkich regionów
-        }
+    # Kolumny i okna (dni) statystyk kroczących - patrz trendy
+    KOLUMNY_TRENDOW = ('temp_srednia', 'opady_mm', KOLUMNA_KOMFORTU)
+    OKNA_TRENDOW = (7, 30)
+
+    def __init__(self, dane_pogodowe: List[DanePogodowe] = None,
+                 wspolrzedne: Optional[Dict[str, Tuple[float, float]]] = None,
+                 uzupelnianie_luk: Optional[str] = 'liniowa', maks_luka: int = MAKS_LUKA):
+        """
+        Inicjalizuje analizator pogodowy.
+
+        Args:
+            dane_pogodowe: Początkowe rekordy pogodowe
+            wspolrzedne: Region lub stacja -> (szerokość, długość geograficzna);
+                domyślnie config.REGION_COORDINATES
+            uzupelnianie_luk: Metoda uzupełniania krótkich luk przy każdym wczytaniu
+                danych (jak w MenadzerDanychPogodowych); None wyłącza uzupełnianie
+            maks_luka: Najdłuższa uzupełniana luka w dniach
+        """
+        self._menadzer = MenadzerDanychPogodowych(uzupelnianie_luk, maks_luka)
+        self._dane = self._menadzer.magazyn
+        if dane_pogodowe:
+            self._dane.dolacz(MagazynPogody.z_rekordow(dane_pogodowe))
+            self._menadzer.uzupelnij_luki()
+        self._indeks = IndeksPogody(self._dane)
+        self._kostka = KostkaPogodowa(self._dane)
+        self._wspolrzedne = REGION_COORDINATES if wspolrzedne is None else wspolrzedne
+        self._stacje = StacjeMagazynu(self._dane, self._wspolrzedne)
+
+    @property
+    def magazyn(self) -> MagazynPogody:
+        """Kolumnowy magazyn wczytanych danych pogodowych."""
+        return self._dane
+
+    @property
+    def indeks(self) -> IndeksPogody:
+        """Indeks (lokalizacja, data) wczytanych danych pogodowych."""
+        return self._indeks
+
+    @property
+    def kostka(self) -> KostkaPogodowa:
+        """Agregaty pogody w podziale na lokalizację i miesiąc."""
+        return self._kostka
 
     def pobierz_dane_dla_lokacji(self, lokalizacja: str) -> Optional[DanePogodowe]:
         """
@@ -41,37 +65,74 @@ class AnalizatorPogodowy:
         Returns:
             Optional[DanePogodowe]: Dane pogodowe dla lokalizacji lub None jeśli nie znaleziono
         """
-        dane_lokalizacji = [d for d in self._dane if d.lokalizacja == lokalizacja]
-        if not dane_lokalizacji:
-            return None
-        # Zwróć najnowsze dane
-        return max(dane_lokalizacji, key=lambda x: x.data)
+        return self._indeks.najnowsze(lokalizacja)
 
-    def wczytaj_dane(self, sciezka: str) -> None:
+    def wczytaj_dane(self, sciezka: str, uzyj_migawki: bool = True, procesy: Optional[int] = None) -> None:
         """
-        Wczytuje dane pogodowe z pliku CSV.
+        Wczytuje dane pogodowe z pliku CSV, katalogu lub wzorca glob
+        (MenadzerDanychPogodowych.wczytaj_dane).
+
+        Ponowne wczytanie tego samego pliku stosuje jedynie zmiany
+        (jak przeladuj_dane) zamiast dublować rekordy.
         
         Args:
             sciezka: Ścieżka do pliku CSV z danymi pogodowymi
+            uzyj_migawki: Czy skorzystać z migawki binarnej (src.data_handlers.migawka),
+                jeśli jest nowsza niż plik CSV
+            procesy: Liczba procesów parsujących pliki (domyślnie liczba rdzeni)
         """
-        try:
-            with open(sciezka, newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    dane = DanePogodowe(
-                        data=datetime.strptime(row['date'], '%Y-%m-%d').date(),
-                        lokalizacja=row['location_id'],
-                        temp_srednia=float(row['avg_temp']),
-                        temp_min=float(row['min_temp']),
-                        temp_max=float(row['max_temp']),
-                        opady_mm=float(row['precipitation']),
-                        godziny_sloneczne=float(row['sunshine_hours']),
-                        zachmurzenie_pct=float(row['cloud_cover'])
-                    )
-                    self._dane.append(dane)
-        except Exception as e:
-            print(f"Wystąpił błąd podczas wczytywania danych pogodowych: {str(e)}")
-            raise
+        self._menadzer.wczytaj_dane(sciezka, uzyj_migawki, procesy)
+        self._indeks.aktualizuj()
+        self._kostka.aktualizuj()
+
+    def przeladuj_dane(self, sciezka: str, pelne_sprawdzenie: bool = False) -> Tuple[int, int]:
+        """
+        Przyrostowo przeładowuje wcześniej wczytany plik z danymi pogodowymi.
+
+        Parsowane są tylko wiersze dopisane lub zmienione od ostatniego odczytu
+        (np. godzinowa aktualizacja), a indeks aktualizowany jest o te rekordy.
+
+        Args:
+            sciezka: Ścieżka do pliku CSV przekazana wcześniej do wczytaj_dane
+            pelne_sprawdzenie: Porównaj skróty wszystkich wierszy zamiast zakładać,
+                że plik był tylko dopisywany
+
+        Returns:
+            Krotka (liczba dodanych rekordów, liczba zmienionych rekordów)
+        """
+        zmiany = self._menadzer.przeladuj_dane(sciezka, pelne_sprawdzenie)
+        self._indeks.aktualizuj()
+        self._kostka.aktualizuj()
+        return zmiany
+
+    def zapisz_archiwum(self, katalog: str) -> None:
+        """
+        Zapisuje wczytane dane do skompresowanego archiwum (src.data_handlers.archiwum_pogody).
+
+        Args:
+            katalog: Katalog archiwum
+        """
+        zapisz_archiwum(self._dane, katalog)
+
+    def wczytaj_archiwum(self, katalog: str, od: Optional[date] = None, do: Optional[date] = None,
+                         lokalizacje: Optional[Sequence[str]] = None) -> int:
+        """
+        Dołącza rekordy z archiwum pogody, rozpakowując tylko bloki obejmujące zakres dat.
+
+        Args:
+            katalog: Katalog archiwum zapisanego przez zapisz_archiwum
+            od: Pierwszy dzień (włącznie); None - od początku archiwum
+            do: Ostatni dzień (włącznie); None - do końca archiwum
+            lokalizacje: Wczytywane lokalizacje; None - wszystkie
+
+        Returns:
+            Liczba dołączonych rekordów
+        """
+        wiersze = self._dane.dolacz(ArchiwumPogody(katalog).wczytaj_magazyn(od, do, lokalizacje))
+        self._menadzer.uzupelnij_luki()
+        self._indeks.aktualizuj()
+        self._kostka.aktualizuj()
+        return len(wiersze)
 
     def statystyki_dla_lokacji(self, region: str, data: Optional[datetime] = None) -> Dict[str, Any]:
         """
@@ -85,27 +146,18 @@ class AnalizatorPogodowy:
             Słownik ze statystykami pogodowymi
         """
         try:
-            # Sprawdź czy region jest w mapowaniu
-            if region not in self._region_map:
-                raise ValueError(f"Nieznany region: {region}")
-            
-            mapped_region = self._region_map[region]
-            
-            # Jeśli wybrano wszystkie regiony, użyj pierwszego dostępnego
-            if mapped_region is None and self._dane:
-                mapped_region = self._dane[0].lokalizacja
-            
+            # Najbliższa stacja z danymi (dla "wszystkie" - pierwsza dostępna)
+            mapped_region = self.lokalizacja_pogody(region)
+            if mapped_region is None:
+                raise ValueError(f"Brak danych pogodowych dla regionu {region}")
+
             # Jeśli nie podano daty, użyj najnowszej dostępnej
-            if data is None and self._dane:
-                matching_data = [d for d in self._dane if d.lokalizacja == mapped_region]
-                if not matching_data:
+            if data is None:
+                dane = self._indeks.najnowsze(mapped_region)
+                if not dane and self._dane:
                     raise ValueError(f"Brak danych pogodowych dla regionu {region}")
-                data = max(d.data for d in matching_data)
-            
-            # Znajdź dane pogodowe dla regionu i daty
-            dane = next((d for d in self._dane 
-                        if d.lokalizacja == mapped_region 
-                        and (data is None or d.data == (data.date() if isinstance(data, datetime) else data))), None)
+            else:
+                dane = self._indeks.pobierz(mapped_region, data)
             
             if not dane:
                 raise ValueError(f"Brak danych pogodowych dla regionu {region} na dzień {data}")
@@ -127,24 +179,176 @@ class AnalizatorPogodowy:
             print(f"Wystąpił błąd podczas analizy danych pogodowych: {str(e)}")
             raise
 
-    def najlepsze_okresy(self, lok: str, top_n: int = 3) -> List[str]:
-        """Zwraca najlepsze miesiące do odwiedzenia danej lokalizacji."""
-        # Sprawdź czy region jest w mapowaniu
-        if lok not in self._region_map:
-            raise ValueError(f"Nieznany region: {lok}")
-            
-        mapped_region = self._region_map[lok]
-        if mapped_region is None and self._dane:
-            mapped_region = self._dane[0].lokalizacja
-            
-        miesiace = defaultdict(list)
-        for d in self._dane:
-            if d.lokalizacja == mapped_region:
-                miesiace[d.data.month].append(d.oblicz_indeks_komfortu())
-                
-        srednie = []
-        for m, vals in miesiace.items():
-            srednie.append((m, sum(vals)/len(vals)))
-        srednie.sort(key=lambda x: x[1], reverse=True)
-        
-        return [month_name[m] for m, _ in srednie[:top_n]]
\ No newline at end of file
+    def najlepsze_okresy(self, lok: str, top_n: int = 3,
+                         partie: Optional[Iterable[Sequence[DanePogodowe]]] = None) -> List[str]:
+        """
+        Zwraca najlepsze miesiące do odwiedzenia danej lokalizacji.
+
+        Średnie komfortu wczytanych danych odczytywane są z kostki agregatów
+        (KostkaPogodowa), bez przeglądania rekordów.
+
+        Args:
+            lok: Nazwa regionu
+            top_n: Liczba zwracanych miesięcy
+            partie: Opcjonalny strumień partii danych (np. z
+                MenadzerDanychPogodowych.wczytaj_dane_partiami) agregowany
+                na bieżąco zamiast wczytanych danych analizatora
+        """
+        if partie is None:
+            return self._kostka.najlepsze_miesiace(self.lokalizacja_pogody(lok), top_n)
+
+        # Stacje ze strumienia znane są dopiero po jego przejściu
+        agregat = SrednieMiesieczneKomfortu()
+        for partia in partie:
+            agregat.dodaj(partia)
+
+        # Dla strumienia "wszystkie" oznacza lokalizację pierwszego rekordu
+        if lok == 'wszystkie':
+            mapped_region = agregat.pierwsza_lokalizacja
+        else:
+            lokalizacje = agregat.lokalizacje
+            stacje = IndeksStacji({l: self._wspolrzedne[l] for l in lokalizacje if l in self._wspolrzedne})
+            mapped_region = najblizsza_stacja(lok, lokalizacje, stacje, self._wspolrzedne)
+        return agregat.najlepsze_miesiace(mapped_region, top_n)
+
+    def statystyki_sezonowe(self, region: str, miesiac: int) -> Optional[Dict[str, Dict[str, float]]]:
+        """
+        Zwraca statystyki pogody regionu w danym miesiącu ze wszystkich lat (KostkaPogodowa).
+
+        Args:
+            region: Nazwa regionu
+            miesiac: Numer miesiąca (1-12)
+
+        Returns:
+            Słownik kolumna -> {'srednia', 'min', 'max', 'liczba'} lub None, jeśli brak danych
+        """
+        lokalizacja = self.lokalizacja_pogody(region)
+        return None if lokalizacja is None else self._kostka.statystyki(lokalizacja, miesiac)
+
+    def lokalizacja_pogody(self, region: str) -> Optional[str]:
+        """
+        Wskazuje lokalizację (stację), której dane pogodowe opisują region.
+
+        Region z własnymi danymi wskazuje sam siebie; region o znanych
+        współrzędnych - najbliższą stację z danymi (indeks przestrzenny
+        IndeksStacji); "wszystkie" - pierwszą wczytaną lokalizację.
+
+        Args:
+            region: Nazwa regionu (np. Trasa.region)
+
+        Returns:
+            Nazwa lokalizacji w magazynie pogody lub None, jeśli nie da się jej wskazać
+        """
+        if region == 'wszystkie':
+            return self._dane.lokalizacje[self._dane.lokalizacja_kod[0]] if self._dane else None
+        return self._stacje(region)
+
+    def dane_dla_regionu(self, region: str, data: date, k: int = 1, potega: float = 2.0) -> Optional[DanePogodowe]:
+        """
+        Zwraca pogodę regionu w danym dniu z najbliższej stacji lub interpolowaną z k stacji.
+
+        Przy k > 1 pomiary stacji (spośród k najbliższych) mających dane z tego
+        dnia są uśredniane z wagami odwrotnie proporcjonalnymi do odległości
+        podniesionej do potęgi; indeks komfortu liczony jest z uśrednionych pomiarów.
+
+        Args:
+            region: Nazwa regionu
+            data: Dzień
+            k: Liczba stacji (1 - bez interpolacji)
+            potega: Wykładnik odległości w wagach
+
+        Returns:
+            Rekord pogodowy (przy interpolacji z lokalizacją równą regionowi) lub None
+        """
+        wspolrzedne = self._wspolrzedne.get(region)
+        if k <= 1 or wspolrzedne is None:
+            lokalizacja = self.lokalizacja_pogody(region)
+            return None if lokalizacja is None else self._indeks.pobierz(lokalizacja, data)
+
+        wiersze, wagi = [], []
+        for stacja, waga in self._stacje.indeks.wagi(wspolrzedne, k, potega):
+            wiersz = self._indeks.pozycja(stacja, data)
+            if wiersz is not None:
+                wiersze.append(wiersz)
+                wagi.append(waga)
+        if not wiersze:
+            return None
+        if len(wiersze) == 1:
+            return self._dane[wiersze[0]]
+        wagi = np.array(wagi) / sum(wagi)
+        return DanePogodowe(
+            self._dane.data[wiersze[0]].astype(date), region,
+            *(float(wagi @ self._dane.kolumna(kolumna)[wiersze]) for kolumna in KOLUMNY_POGODY)
+        )
+
+    def trendy(self, region: str, okna: Sequence[int] = OKNA_TRENDOW,
+               kolumny: Sequence[str] = KOLUMNY_TRENDOW, z_uzupelnionymi: bool = False) -> Dict[str, Any]:
+        """
+        Liczy średnie kroczące i trendy pogody regionu dla każdego dnia jego historii.
+
+        Dane regionu rozkładane są na kolejne dni kalendarzowe (od pierwszego
+        do ostatniego dnia z danymi), a okna liczone wektorowo z sum
+        skumulowanych (okna_kroczace).
+
+        Args:
+            region: Nazwa regionu
+            okna: Długości okien w dniach
+            kolumny: Kolumny magazynu pogody (np. 'temp_srednia', 'opady_mm', KOLUMNA_KOMFORTU)
+            z_uzupelnionymi: Czy wliczać do okien dni z uzupełnionych luk
+                (MagazynPogody.uzupelnione); domyślnie tylko pomiary
+
+        Returns:
+            Słownik {'daty': tablica datetime64[D], kolumna: {okno: {'srednia': tablica,
+            'trend': tablica}}}; trend to zmiana wartości na dzień
+        """
+        lokalizacja = self.lokalizacja_pogody(region)
+        kod = self._dane.kod_lokalizacji(lokalizacja) if lokalizacja is not None else None
+        if kod is None:
+            raise ValueError(f"Brak danych pogodowych dla regionu {region}")
+        daty_regionu = self._dane.data[self._dane.lokalizacja_kod == kod]
+        daty = np.arange(daty_regionu.min(), daty_regionu.max() + 1)
+        wiersze = self._indeks.pozycje([lokalizacja], daty)[0]
+        obecne = wiersze >= 0
+        if not z_uzupelnionymi:
+            obecne[obecne] = ~self._dane.uzupelnione[wiersze[obecne]]
+
+        wynik: Dict[str, Any] = {'daty': daty}
+        for kolumna in kolumny:
+            wartosci = np.full(len(daty), np.nan)
+            wartosci[obecne] = self._dane.kolumna(kolumna)[wiersze[obecne]]
+            wynik[kolumna] = {}
+            for okno in okna:
+                srednia, trend = okna_kroczace(wartosci, okno)
+                wynik[kolumna][okno] = {'srednia': srednia, 'trend': trend}
+        return wynik
+
+    def poprawa_warunkow(self, region: str, data: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Ocenia, czy warunki pogodowe w regionie się poprawiają.
+
+        Warunki uznawane są za poprawiające się, gdy komfort w oknie
+        7-dniowym rośnie i jest wyższy niż średnia z 30 dni.
+
+        Args:
+            region: Nazwa regionu
+            data: Dzień oceny (domyślnie ostatni dzień z danymi regionu)
+
+        Returns:
+            Słownik {'data', 'poprawa', kolumna: {'srednia_7', 'srednia_30', 'trend_7', 'trend_30'}}
+        """
+        trendy = self.trendy(region, (7, 30))
+        daty = trendy['daty']
+        dzien = daty[-1] if data is None else np.datetime64(data.date() if isinstance(data, datetime) else data, 'D')
+        if not daty[0] <= dzien <= daty[-1]:
+            raise ValueError(f"Brak danych pogodowych dla regionu {region} na dzień {dzien}")
+        i = int((dzien - daty[0]).astype(np.int64))
+
+        wynik: Dict[str, Any] = {'data': dzien.astype(date)}
+        for kolumna in self.KOLUMNY_TRENDOW:
+            wynik[kolumna] = {
+                f'{nazwa}_{okno}': float(trendy[kolumna][okno][nazwa][i])
+                for okno in (7, 30) for nazwa in ('srednia', 'trend')
+            }
+        komfort = wynik[KOLUMNA_KOMFORTU]
+        wynik['poprawa'] = bool(komfort['trend_7'] > 0 and komfort['srednia_7'] > komfort['srednia_30'])
+        return wynik
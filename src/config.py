@@ -5,8 +5,17 @@ REGION_COORDINATES: Dict[str, tuple] = {
     "Tatry": (49.2320, 20.0000),
     "Beskidy": (49.6000, 19.0000),
     "Pieniny": (49.4200, 20.4100),
-    "Bieszczady": (49.1500, 22.5000)
+    "Bieszczady": (49.1500, 22.5000),
+    "Gorce": (49.5500, 20.1100),
+    "Karkonosze": (50.7800, 15.7000),
+    "Jura Krakowsko-Częstochowska": (50.6000, 19.5000),
+    "Góry Stołowe": (50.4600, 16.3500),
+    "Sudety": (50.5500, 16.5000),
+    "Podkarpacie": (49.9000, 22.0000)
 }
 
 # Cache settings
-CACHE_DIR = "cache" 
\ No newline at end of file
+CACHE_DIR = "cache" 
+# Result cache settings (src.recommenders.pamiec_wynikow)
+RESULT_CACHE_MAX_ENTRIES = 1024
+RESULT_CACHE_TTL_S = 900.0
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Skompresowane archiwum wieloletnich danych pogodowych.
+
+Archiwum to katalog z plikiem bloki.bin, tablicą przesunięć bloków
+(przesuniecia.npy) i plikiem meta.json zapisywanym na końcu. Dane każdej
+lokalizacji rozkładane są na kolejne dni kalendarzowe (od pierwszego do
+ostatniego dnia z danymi) i dzielone na bloki po ROZMIAR_BLOKU dni.
+
+W bloku każda kolumna pomiarów zapisywana jest jako liczby int16
+(wartość * SKALA, czyli z dokładnością 0.1 jak w plikach CSV), kodowane
+różnicowo względem poprzedniego dnia i kompresowane zlib osobno dla
+młodszych i starszych bajtów. Bloki są niezależne (pierwsza różnica
+liczona od zera), więc odczyt zakresu dat rozpakowuje tylko bloki, które
+go obejmują.
+"""
+import json
+import os
+import zlib
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from src.data_handlers.magazyn_pogody import MagazynPogody, KOLUMNY_POGODY
+
+WERSJA_FORMATU = 1
+ROZMIAR_BLOKU = 256
+# Liczba kroków kwantyzacji na jednostkę pomiaru
+SKALA = 10
+# Wartość int16 oznaczająca brak pomiaru (NaN lub dzień bez rekordu)
+_BRAK = np.iinfo(np.int16).min
+# Kolumna obecności rekordu w danym dniu (uint8)
+_OBECNE = 'obecne'
+
+def _kompresuj(tablica: np.ndarray) -> bytes:
+    # Bajty o tej samej pozycji obok siebie - małe różnice dają ciągi zer
+    bajty = tablica.view(np.uint8).reshape(-1, tablica.itemsize)
+    return zlib.compress(np.ascontiguousarray(bajty.T).tobytes())
+
+def _dekompresuj(dane, typ) -> np.ndarray:
+    typ = np.dtype(typ)
+    bajty = np.frombuffer(zlib.decompress(dane), dtype=np.uint8).reshape(typ.itemsize, -1)
+    return np.ascontiguousarray(bajty.T).view(typ).ravel()
+
+def _kwantyzuj(wartosci: np.ndarray, kolumna: str) -> np.ndarray:
+    """
+    Zamienia wartości float64 na int16 z krokiem 1 / SKALA.
+
+    Raises:
+        ValueError: Gdy wartość nie mieści się w zakresie int16
+    """
+    znane = ~np.isnan(wartosci)
+    skwantowane = np.rint(np.where(znane, wartosci, 0.0) * SKALA)
+    if np.any(np.abs(skwantowane) >= -_BRAK):
+        raise ValueError(f"Wartości kolumny {kolumna} poza zakresem archiwum")
+    return np.where(znane, skwantowane, _BRAK).astype(np.int16)
+
+def zapisz_archiwum(magazyn: MagazynPogody, katalog: str, rozmiar_bloku: int = ROZMIAR_BLOKU) -> None:
+    """
+    Zapisuje dane magazynu pogody do archiwum.
+
+    Przy powtórzonej parze (lokalizacja, dzień) zapisywany jest pierwszy
+    rekord (jak w IndeksPogody), a wiersze uzupełnionych luk są pomijane.
+    Wartości zaokrąglane są do 1 / SKALA; indeks komfortu nie jest
+    zapisywany, bo wynika z pomiarów.
+
+    Args:
+        magazyn: Magazyn pogody
+        katalog: Katalog archiwum (tworzony, jeśli nie istnieje)
+        rozmiar_bloku: Liczba dni w bloku
+
+    Raises:
+        ValueError: Gdy wartość pomiaru nie mieści się w zakresie int16 po kwantyzacji
+    """
+    os.makedirs(katalog, exist_ok=True)
+    kolumny = [*KOLUMNY_POGODY, _OBECNE]
+    lokalizacje = {}
+    przesuniecia = [0]
+    bloki = 0
+    # Pomiary posortowane po (lokalizacja, dzień), pierwszy rekord dnia przed duplikatami;
+    # wiersze uzupełnione (MagazynPogody.uzupelnione) nie są archiwizowane
+    pomiary = np.flatnonzero(~magazyn.uzupelnione)
+    kolejnosc = pomiary[np.lexsort((magazyn.data[pomiary], magazyn.lokalizacja_kod[pomiary]))]
+    klucze = magazyn.klucze()[kolejnosc]
+    pierwsze = np.ones(len(klucze), dtype=bool)
+    pierwsze[1:] = klucze[1:] != klucze[:-1]
+    kolejnosc = kolejnosc[pierwsze]
+    kody = magazyn.lokalizacja_kod[kolejnosc]
+    granice = np.flatnonzero(np.diff(kody, prepend=-1, append=-1))
+
+    with open(os.path.join(katalog, 'bloki.bin'), 'wb') as plik:
+        for poczatek, koniec in zip(granice[:-1], granice[1:]):
+            wiersze = kolejnosc[poczatek:koniec]
+            dni = magazyn.data[wiersze].astype(np.int64)
+            start = int(dni[0])
+            liczba_dni = int(dni[-1]) - start + 1
+            pozycje = dni - start
+
+            siatka = {}
+            for k in KOLUMNY_POGODY:
+                siatka[k] = np.full(liczba_dni, _BRAK, dtype=np.int16)
+                siatka[k][pozycje] = _kwantyzuj(magazyn.kolumna(k)[wiersze], k)
+            siatka[_OBECNE] = np.zeros(liczba_dni, dtype=np.uint8)
+            siatka[_OBECNE][pozycje] = 1
+
+            nazwa = magazyn.lokalizacje[kody[poczatek]]
+            lokalizacje[nazwa] = {'start': start, 'dni': liczba_dni, 'pierwszy_blok': bloki}
+            for od in range(0, liczba_dni, rozmiar_bloku):
+                for k in kolumny:
+                    blok = siatka[k][od:od + rozmiar_bloku]
+                    if k != _OBECNE:
+                        # Różnice w arytmetyce modulo 2^16 - odwracalne przez cumsum int16
+                        blok = np.diff(blok, prepend=np.int16(0))
+                    dane = _kompresuj(blok)
+                    plik.write(dane)
+                    przesuniecia.append(przesuniecia[-1] + len(dane))
+                bloki += 1
+
+    np.save(os.path.join(katalog, 'przesuniecia.npy'), np.asarray(przesuniecia, dtype=np.int64))
+    with open(os.path.join(katalog, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'wersja': WERSJA_FORMATU, 'rozmiar_bloku': rozmiar_bloku, 'skala': SKALA,
+            'kolumny': kolumny, 'lokalizacje': lokalizacje,
+        }, f, ensure_ascii=False)
+
+class ArchiwumPogody:
+    """
+    Odczyt archiwum zapisanego przez zapisz_archiwum.
+
+    Plik bloków mapowany jest z dysku, a bloki rozpakowywane dopiero przy
+    odczycie obejmującego je zakresu dat.
+    """
+
+    def __init__(self, katalog: str):
+        """
+        Otwiera archiwum.
+
+        Args:
+            katalog: Katalog archiwum
+
+        Raises:
+            ValueError: Gdy archiwum ma nieobsługiwaną wersję formatu
+        """
+        with open(os.path.join(katalog, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('wersja') != WERSJA_FORMATU:
+            raise ValueError(f"Nieobsługiwana wersja archiwum pogody: {meta.get('wersja')}")
+        self._rozmiar_bloku = meta['rozmiar_bloku']
+        self._skala = meta['skala']
+        self._kolumny = meta['kolumny']
+        self._lokalizacje = meta['lokalizacje']
+        self._przesuniecia = np.load(os.path.join(katalog, 'przesuniecia.npy'))
+        sciezka = os.path.join(katalog, 'bloki.bin')
+        self._bloki = np.memmap(sciezka, dtype=np.uint8, mode='r') if os.path.getsize(sciezka) else b''
+        # liczba rozpakowanych bloków (lokalizacja x zakres dni), do pomiarów
+        self.rozpakowane_bloki = 0
+
+    @property
+    def lokalizacje(self) -> List[str]:
+        """Nazwy lokalizacji zapisanych w archiwum."""
+        return list(self._lokalizacje)
+
+    def zakres(self, lokalizacja: str) -> Optional[Tuple[np.datetime64, np.datetime64]]:
+        """
+        Zwraca pierwszy i ostatni dzień danych lokalizacji.
+
+        Returns:
+            Para datetime64[D] lub None, gdy lokalizacji nie ma w archiwum
+        """
+        opis = self._lokalizacje.get(lokalizacja)
+        if opis is None:
+            return None
+        start = np.datetime64(opis['start'], 'D')
+        return start, start + (opis['dni'] - 1)
+
+    def _blok(self, numer: int, kolumna: int):
+        i = numer * len(self._kolumny) + kolumna
+        return self._bloki[self._przesuniecia[i]:self._przesuniecia[i + 1]]
+
+    def wczytaj(self, lokalizacja: str, od=None, do=None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Odczytuje dni z danymi lokalizacji w zakresie dat (włącznie).
+
+        Args:
+            lokalizacja: Nazwa lokalizacji
+            od: Pierwszy dzień (date, napis ISO lub datetime64); None - od początku
+            do: Ostatni dzień; None - do końca
+
+        Returns:
+            Daty (datetime64[D]) i słownik kolumn pomiarów float64 (NaN dla braków)
+        """
+        opis = self._lokalizacje.get(lokalizacja)
+        pusty = (np.empty(0, dtype='datetime64[D]'), {k: np.empty(0) for k in KOLUMNY_POGODY})
+        if opis is None:
+            return pusty
+        start, liczba_dni = opis['start'], opis['dni']
+        poczatek = 0 if od is None else max(int(np.datetime64(od, 'D').astype(np.int64)) - start, 0)
+        koniec = liczba_dni if do is None else min(int(np.datetime64(do, 'D').astype(np.int64)) - start + 1, liczba_dni)
+        if poczatek >= koniec:
+            return pusty
+
+        pierwszy, ostatni = poczatek // self._rozmiar_bloku, (koniec - 1) // self._rozmiar_bloku
+        bloki = range(opis['pierwszy_blok'] + pierwszy, opis['pierwszy_blok'] + ostatni + 1)
+        self.rozpakowane_bloki += len(bloki)
+        wyciecie = slice(poczatek - pierwszy * self._rozmiar_bloku, koniec - pierwszy * self._rozmiar_bloku)
+
+        wyniki = {}
+        for c, k in enumerate(self._kolumny):
+            if k == _OBECNE:
+                wartosci = [_dekompresuj(self._blok(b, c), np.uint8) for b in bloki]
+            else:
+                # Każdy blok zaczyna się od wartości bezwzględnej, więc cumsum liczony osobno
+                wartosci = [np.cumsum(_dekompresuj(self._blok(b, c), np.int16), dtype=np.int16) for b in bloki]
+            wyniki[k] = np.concatenate(wartosci)[wyciecie]
+
+        dni = np.flatnonzero(wyniki.pop(_OBECNE))
+        daty = (np.int64(start + poczatek) + dni).astype('datetime64[D]')
+        kolumny = {}
+        for k in KOLUMNY_POGODY:
+            skwantowane = wyniki[k][dni]
+            kolumny[k] = np.where(skwantowane == _BRAK, np.nan, skwantowane / self._skala)
+        return daty, kolumny
+
+    def wczytaj_magazyn(self, od=None, do=None, lokalizacje=None) -> MagazynPogody:
+        """
+        Odtwarza magazyn pogody z zakresu dat wybranych lokalizacji.
+
+        Args:
+            od: Pierwszy dzień (włącznie); None - od początku
+            do: Ostatni dzień (włącznie); None - do końca
+            lokalizacje: Nazwy lokalizacji; None - wszystkie z archiwum
+
+        Returns:
+            Magazyn z rekordami posortowanymi po lokalizacji i dacie
+        """
+        magazyn = MagazynPogody()
+        daty, nazwy, kolumny = [], [], {k: [] for k in KOLUMNY_POGODY}
+        for lokalizacja in (self._lokalizacje if lokalizacje is None else lokalizacje):
+            d, wartosci = self.wczytaj(lokalizacja, od, do)
+            daty.append(d)
+            nazwy.append(np.full(len(d), lokalizacja, dtype=object))
+            for k in KOLUMNY_POGODY:
+                kolumny[k].append(wartosci[k])
+        if daty:
+            magazyn.dodaj_kolumny(
+                np.concatenate(daty), np.concatenate(nazwy), {k: np.concatenate(v) for k, v in kolumny.items()}
+            )
+        return magazyn
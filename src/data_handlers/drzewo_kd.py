@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import heapq
+from typing import List, Optional, Tuple
+import numpy as np
+
+class DrzewoKD:
+    """
+    Drzewo k-d nad punktami w tablicy NumPy (najbliżsi sąsiedzi w metryce euklidesowej).
+
+    Węzeł dzieli punkty medianą wymiaru o największym rozrzucie, a liście
+    to ciągłe fragmenty tablicy punktów w kolejności drzewa, więc odległości
+    do punktów liścia liczone są wektorowo. Wyszukiwanie przegląda węzły od
+    najmniejszego dolnego ograniczenia odległości (prostopadłościan węzła).
+    """
+
+    ROZMIAR_LISCIA = 16
+
+    def __init__(self, punkty: np.ndarray, rozmiar_liscia: int = ROZMIAR_LISCIA):
+        """
+        Args:
+            punkty: Macierz (liczba punktów, liczba wymiarów)
+            rozmiar_liscia: Maksymalna liczba punktów w liściu
+        """
+        self._punkty = np.asarray(punkty, dtype=np.float64)
+        n, wymiary = self._punkty.shape
+        kolejnosc = np.arange(n)
+        # węzeł -> [początek, koniec, lewe dziecko, prawe dziecko] (dzieci -1 w liściu)
+        wezly: List[List[int]] = []
+        dolne: List[np.ndarray] = []
+        gorne: List[np.ndarray] = []
+        stos = [(0, n, -1, 0)]
+        while stos:
+            od, do, rodzic, strona = stos.pop()
+            numer = len(wezly)
+            if rodzic >= 0:
+                wezly[rodzic][2 + strona] = numer
+            punkty_wezla = self._punkty[kolejnosc[od:do]]
+            wezly.append([od, do, -1, -1])
+            dolne.append(punkty_wezla.min(axis=0) if do > od else np.zeros(wymiary))
+            gorne.append(punkty_wezla.max(axis=0) if do > od else np.zeros(wymiary))
+            if do - od <= rozmiar_liscia:
+                continue
+            wymiar = int(np.argmax(gorne[-1] - dolne[-1]))
+            srodek = (do - od) // 2
+            podzial = np.argpartition(punkty_wezla[:, wymiar], srodek)
+            kolejnosc[od:do] = kolejnosc[od:do][podzial]
+            stos.append((od + srodek, do, numer, 1))
+            stos.append((od, od + srodek, numer, 0))
+        self._kolejnosc = kolejnosc
+        self._wezly = np.array(wezly, dtype=np.int64).reshape(-1, 4)
+        self._dolne = np.array(dolne).reshape(-1, wymiary)
+        self._gorne = np.array(gorne).reshape(-1, wymiary)
+
+    @property
+    def punkty(self) -> np.ndarray:
+        return self._punkty
+
+    def __len__(self) -> int:
+        return len(self._punkty)
+
+    def najblizsze(self, cel: np.ndarray, k: int, aktywne: Optional[np.ndarray] = None,
+                   pomin: int = -1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Wyszukuje k punktów najbliższych celowi.
+
+        Args:
+            cel: Punkt zapytania
+            k: Liczba zwracanych punktów
+            aktywne: Maska punktów branych pod uwagę (domyślnie wszystkie)
+            pomin: Numer punktu pomijanego (np. samego celu)
+
+        Returns:
+            Krotka (numery punktów, kwadraty odległości) rosnąco według odległości
+            (przy remisie - według numeru punktu)
+        """
+        if k < 1:
+            raise ValueError("k musi być dodatnie")
+        cel = np.asarray(cel, dtype=np.float64)
+        # Kopiec maksymalny k najlepszych: (-odległość², -numer)
+        najlepsze: List[Tuple[float, int]] = []
+        kolejka = [(0.0, 0)] if len(self._punkty) else []
+        while kolejka:
+            ograniczenie, numer = heapq.heappop(kolejka)
+            if len(najlepsze) == k and ograniczenie > -najlepsze[0][0]:
+                break
+            od, do, lewe, prawe = self._wezly[numer].tolist()
+            if lewe < 0:
+                pozycje = self._kolejnosc[od:do]
+                if aktywne is not None:
+                    pozycje = pozycje[aktywne[pozycje]]
+                odleglosci = ((self._punkty[pozycje] - cel) ** 2).sum(axis=1)
+                if len(najlepsze) == k:
+                    # Do kopca trafiają tylko punkty nie dalsze niż obecny k-ty
+                    blizsze = odleglosci <= -najlepsze[0][0]
+                    pozycje, odleglosci = pozycje[blizsze], odleglosci[blizsze]
+                for p, d in zip(pozycje.tolist(), odleglosci.tolist()):
+                    if p == pomin:
+                        continue
+                    wpis = (-d, -p)
+                    if len(najlepsze) < k:
+                        heapq.heappush(najlepsze, wpis)
+                    elif wpis > najlepsze[0]:
+                        heapq.heapreplace(najlepsze, wpis)
+                continue
+            # Dolne ograniczenia odległości od prostopadłościanów obu dzieci naraz
+            dzieci = self._wezly[numer, 2:]
+            roznice = np.maximum(self._dolne[dzieci] - cel, 0) + np.maximum(cel - self._gorne[dzieci], 0)
+            for dziecko, ograniczenie in zip((lewe, prawe), (roznice ** 2).sum(axis=1).tolist()):
+                if len(najlepsze) < k or ograniczenie <= -najlepsze[0][0]:
+                    heapq.heappush(kolejka, (ograniczenie, dziecko))
+
+        najlepsze.sort(reverse=True)
+        return (
+            np.array([-p for _, p in najlepsze], dtype=np.int64),
+            np.array([-d for d, _ in najlepsze], dtype=np.float64),
+        )
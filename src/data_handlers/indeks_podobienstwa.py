@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from src.data_handlers.drzewo_kd import DrzewoKD
+from src.data_handlers.magazyn_tras import MagazynTras
+from src.data_handlers.route_rating_manager import RouteRatingManager
+
+class IndeksPodobienstwaTras:
+    """
+    Indeks najbliższych sąsiadów (drzewo k-d) do wyszukiwania tras podobnych.
+
+    Cechy trasy to długość, trudność, przewyższenie i średnia ocena
+    (standaryzowane do średniej 0 i odchylenia 1) oraz kategoria i region
+    (kodowanie 1 z n, przeskalowane tak, by różna kategoria lub region
+    oddalały trasy o jedno odchylenie). Podobieństwo to odległość
+    euklidesowa cech.
+
+    Wiersze dodane lub zmienione po zbudowaniu drzewa trafiają do bufora
+    przeszukiwanego wprost, a ich poprzednie położenie w drzewie jest
+    wygaszane; drzewo budowane jest od nowa, gdy bufor przekroczy
+    UDZIAL_PRZEBUDOWY liczby tras.
+    """
+
+    ROZMIAR_LISCIA = 16
+    UDZIAL_PRZEBUDOWY = 0.1
+
+    def __init__(self, magazyn: MagazynTras, oceny: Optional[Callable[[int], Optional[float]]] = None):
+        """
+        Buduje indeks dla wszystkich tras w magazynie.
+
+        Args:
+            magazyn: Kolumnowy magazyn tras
+            oceny: Funkcja zwracająca średnią ocenę trasy o danym id lub None
+                (domyślnie RouteRatingManager.get_route_rating)
+        """
+        self._magazyn = magazyn
+        self._oceny = oceny if oceny is not None else RouteRatingManager().get_route_rating
+        # numer wiersza -> średnia ocena (NaN - brak ocen)
+        self._ocena = np.empty(0, dtype=np.float64)
+        self._zbuduj()
+
+    def _zbuduj(self) -> None:
+        """Wylicza parametry standaryzacji i buduje drzewo ze wszystkich wierszy magazynu."""
+        self._uzupelnij_oceny(np.arange(len(self._ocena), len(self._magazyn)))
+        wiersze = np.arange(len(self._magazyn))
+        kategorie = self._magazyn.kategorie(wiersze)
+        self._kategorie: Dict[str, int] = {k: i for i, k in enumerate(dict.fromkeys(kategorie))}
+        self._liczba_regionow = len(self._magazyn.regiony)
+
+        liczbowe = self._liczbowe(wiersze)
+        # średnie i odchylenia z pominięciem brakujących ocen (także gdy brak wszystkich)
+        znane = ~np.isnan(liczbowe)
+        liczby = np.maximum(znane.sum(axis=0), 1)
+        self._srednie = np.where(znane, liczbowe, 0).sum(axis=0) / liczby
+        odchylenia = np.sqrt((np.where(znane, liczbowe - self._srednie, 0) ** 2).sum(axis=0) / liczby)
+        self._odchylenia = np.where(odchylenia > 0, odchylenia, 1.0)
+
+        self._punkty = self._cechy(wiersze, liczbowe, kategorie)
+        self._wiersze = wiersze
+        self._aktualne = np.ones(len(wiersze), dtype=bool)
+        # wiersz magazynu -> pozycja w self._punkty
+        self._pozycje = np.arange(len(wiersze))
+        self._bufor: Dict[int, np.ndarray] = {}
+        self._drzewo = DrzewoKD(self._punkty, self.ROZMIAR_LISCIA)
+
+    def _uzupelnij_oceny(self, wiersze: np.ndarray) -> None:
+        if len(self._ocena) < len(self._magazyn):
+            self._ocena = np.concatenate([self._ocena, np.full(len(self._magazyn) - len(self._ocena), np.nan)])
+        for i, id_trasy in zip(wiersze.tolist(), self._magazyn.id[wiersze].tolist()):
+            ocena = self._oceny(id_trasy)
+            self._ocena[i] = np.nan if ocena is None else ocena
+
+    def _liczbowe(self, wiersze: np.ndarray) -> np.ndarray:
+        return np.column_stack([
+            self._magazyn.dlugosc_km[wiersze], self._magazyn.trudnosc[wiersze],
+            self._magazyn.przewyzszenie_m[wiersze].astype(np.float64), self._ocena[wiersze],
+        ])
+
+    def _cechy(self, wiersze: np.ndarray, liczbowe: Optional[np.ndarray] = None,
+               kategorie: Optional[List[str]] = None) -> np.ndarray:
+        """Zwraca standaryzowane wektory cech wierszy (brak oceny - średnia ocena)."""
+        if liczbowe is None:
+            liczbowe = self._liczbowe(wiersze)
+        if kategorie is None:
+            kategorie = self._magazyn.kategorie(wiersze)
+        standaryzowane = np.nan_to_num((liczbowe - self._srednie) / self._odchylenia)
+        skala = 1 / math.sqrt(2)
+        kategoria = np.zeros((len(wiersze), len(self._kategorie)))
+        kategoria[np.arange(len(wiersze)), [self._kategorie[k] for k in kategorie]] = skala
+        region = np.zeros((len(wiersze), self._liczba_regionow))
+        region[np.arange(len(wiersze)), self._magazyn.region_kod[wiersze]] = skala
+        return np.hstack([standaryzowane, kategoria, region])
+
+    def usun(self, wiersze) -> None:
+        """
+        Usuwa wiersze z indeksu. Należy wywołać przed zmianą tych wierszy w magazynie.
+
+        Args:
+            wiersze: Numery wierszy magazynu
+        """
+        for i in np.asarray(wiersze, dtype=np.int64).tolist():
+            self._bufor.pop(i, None)
+            if i < len(self._pozycje):
+                self._aktualne[self._pozycje[i]] = False
+
+    def dodaj(self, wiersze) -> None:
+        """
+        Wstawia do indeksu nowe lub zmienione wiersze magazynu.
+
+        Args:
+            wiersze: Numery wierszy magazynu
+        """
+        wiersze = np.asarray(wiersze, dtype=np.int64)
+        if not len(wiersze):
+            return
+        self._uzupelnij_oceny(wiersze)
+        kategorie = self._magazyn.kategorie(wiersze)
+        nowe_wartosci = any(k not in self._kategorie for k in kategorie) or \
+            len(self._magazyn.regiony) != self._liczba_regionow
+        if nowe_wartosci or len(self._bufor) + len(wiersze) > self.UDZIAL_PRZEBUDOWY * len(self._magazyn):
+            self._zbuduj()
+            return
+        self.usun(wiersze)
+        for i, cechy in zip(wiersze.tolist(), self._cechy(wiersze, kategorie=kategorie)):
+            self._bufor[i] = cechy
+
+    @property
+    def rozmiar_bufora(self) -> int:
+        """Liczba wierszy dodanych lub zmienionych od ostatniego zbudowania drzewa."""
+        return len(self._bufor)
+
+    def cechy(self, wiersz: int) -> np.ndarray:
+        """Zwraca standaryzowany wektor cech wiersza magazynu."""
+        if wiersz in self._bufor:
+            return self._bufor[wiersz]
+        return self._punkty[self._pozycje[wiersz]]
+
+    def podobne(self, wiersz: int, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Wyszukuje k tras najbardziej podobnych do trasy z danego wiersza (bez niej samej).
+
+        Args:
+            wiersz: Numer wiersza magazynu
+            k: Liczba zwracanych tras
+
+        Returns:
+            Krotka (numery wierszy, odległości) rosnąco według odległości
+            (przy remisie - według numeru wiersza)
+        """
+        if k < 1:
+            raise ValueError("k musi być dodatnie")
+        cel = self.cechy(wiersz)
+        pomin = int(self._pozycje[wiersz]) if wiersz < len(self._pozycje) else -1
+        pozycje, odleglosci = self._drzewo.najblizsze(cel, k, self._aktualne, pomin)
+        wiersze = self._wiersze[pozycje]
+        if self._bufor:
+            # Wiersze zmienione od zbudowania drzewa porównywane są wprost
+            z_bufora = np.array([w for w in self._bufor if w != wiersz], dtype=np.int64)
+            punkty = np.array([self._bufor[w] for w in z_bufora.tolist()]).reshape(len(z_bufora), len(cel))
+            wiersze = np.concatenate([wiersze, z_bufora])
+            odleglosci = np.concatenate([odleglosci, ((punkty - cel) ** 2).sum(axis=1)])
+            kolejnosc = np.lexsort((wiersze, odleglosci))[:k]
+            wiersze, odleglosci = wiersze[kolejnosc], odleglosci[kolejnosc]
+        return wiersze, np.sqrt(odleglosci)
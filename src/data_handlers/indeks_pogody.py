@@ -0,0 +1,141 @@
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+from src.models.dane_pogodowe import DanePogodowe
+from src.data_handlers.magazyn_pogody import MagazynPogody
+
+_EPOKA = date(1970, 1, 1).toordinal()
+
+class IndeksPogody:
+    """
+    Indeks danych pogodowych.
+
+    Pozwala w czasie O(1) pobrać rekord dla pary (lokalizacja, data)
+    oraz najnowszy rekord danej lokalizacji. Indeks przechowuje numery
+    wierszy magazynu pogody, więc zmiana wartości pomiarów nie wymaga
+    jego aktualizacji - tylko zmiana lokalizacji lub daty wiersza.
+    """
+
+    def __init__(self, dane: Union[MagazynPogody, Iterable[DanePogodowe]] = ()):
+        """
+        Inicjalizuje indeks.
+
+        Args:
+            dane: Magazyn pogody albo rekordy pogodowe (zostaną umieszczone w nowym magazynie)
+        """
+        self._magazyn = dane if isinstance(dane, MagazynPogody) else MagazynPogody.z_rekordow(dane)
+        # klucz (kod lokalizacji, dzień) -> numer wiersza pierwszego rekordu z tym kluczem
+        self._po_dacie: Dict[int, int] = {}
+        # kod lokalizacji -> numer wiersza najnowszego rekordu
+        self._najnowsze: Dict[int, int] = {}
+        # klucze zaindeksowanych wierszy - do wykrywania zmian przy aktualizacji
+        self._klucze = np.empty(0, dtype=np.int64)
+        # posortowane klucze i numery wierszy (_po_dacie w postaci tablic) - budowane przy pierwszym użyciu
+        self._tablice: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.aktualizuj()
+
+    @property
+    def magazyn(self) -> MagazynPogody:
+        """Magazyn, którego wiersze wskazuje indeks."""
+        return self._magazyn
+
+    def aktualizuj(self) -> None:
+        """
+        Uzgadnia indeks z magazynem po dopisaniu lub zmianie jego wierszy.
+
+        Nowe wiersze są dopisywane do indeksu; jeśli któryś z wcześniej
+        zaindeksowanych wierszy zmienił lokalizację lub datę, indeks jest
+        budowany od nowa.
+        """
+        klucze = self._magazyn.klucze()
+        znane = len(self._klucze)
+        if znane and np.array_equal(klucze[:znane], self._klucze):
+            nowe = np.arange(znane, len(klucze))
+        else:
+            self._po_dacie.clear()
+            self._najnowsze.clear()
+            nowe = np.arange(len(klucze))
+        self._klucze = klucze
+        if not len(nowe):
+            return
+        self._tablice = None
+
+        # Pierwsze wystąpienie każdego klucza wśród nowych wierszy
+        unikalne, pierwsze = np.unique(klucze[nowe], return_index=True)
+        for klucz, wiersz in zip(unikalne.tolist(), nowe[pierwsze].tolist()):
+            self._po_dacie.setdefault(klucz, wiersz)
+
+        # Najnowszy rekord lokalizacji: najpóźniejsza data, przy remisie najwcześniejszy wiersz
+        kody = self._magazyn.lokalizacja_kod[nowe]
+        dni = self._magazyn.data[nowe].astype(np.int64)
+        kolejnosc = np.lexsort((nowe, -dni, kody))
+        poczatki = np.flatnonzero(np.r_[True, kody[kolejnosc][1:] != kody[kolejnosc][:-1]])
+        for wiersz in nowe[kolejnosc[poczatki]].tolist():
+            kod = int(self._magazyn.lokalizacja_kod[wiersz])
+            obecny = self._najnowsze.get(kod)
+            if obecny is None or self._magazyn.data[wiersz] > self._magazyn.data[obecny]:
+                self._najnowsze[kod] = wiersz
+
+    def pozycja(self, lokalizacja: str, data: date) -> Optional[int]:
+        """Zwraca numer wiersza magazynu dla lokalizacji i dnia lub None."""
+        kod = self._magazyn.kod_lokalizacji(lokalizacja)
+        if kod is None:
+            return None
+        if isinstance(data, datetime):
+            data = data.date()
+        return self._po_dacie.get(self._magazyn.klucz(kod, data.toordinal() - _EPOKA))
+
+    def pozycje(self, lokalizacje: List[str], dni: np.ndarray) -> np.ndarray:
+        """
+        Zwraca numery wierszy magazynu dla wszystkich par (lokalizacja, dzień) naraz.
+
+        Args:
+            lokalizacje: Nazwy lokalizacji
+            dni: Tablica dni (datetime64[D])
+
+        Returns:
+            Tablica int64 o kształcie (liczba lokalizacji, liczba dni); -1 oznacza brak danych
+        """
+        if self._tablice is None:
+            klucze = np.fromiter(self._po_dacie.keys(), dtype=np.int64, count=len(self._po_dacie))
+            wiersze = np.fromiter(self._po_dacie.values(), dtype=np.int64, count=len(self._po_dacie))
+            kolejnosc = np.argsort(klucze)
+            self._tablice = (klucze[kolejnosc], wiersze[kolejnosc])
+        posortowane, wiersze = self._tablice
+
+        kody = np.array([self._magazyn.kod_lokalizacji(l) for l in lokalizacje], dtype=object)
+        znane = np.array([k is not None for k in kody], dtype=bool)
+        kody = np.where(znane, kody, 0).astype(np.int64)
+        szukane = self._magazyn.klucz(kody[:, None], np.asarray(dni, dtype='datetime64[D]').astype(np.int64)[None, :])
+        miejsca = np.minimum(np.searchsorted(posortowane, szukane), max(len(posortowane) - 1, 0))
+        wynik = np.full(szukane.shape, -1, dtype=np.int64)
+        if len(posortowane):
+            trafione = (posortowane[miejsca] == szukane) & znane[:, None]
+            wynik[trafione] = wiersze[miejsca[trafione]]
+        return wynik
+
+    def pobierz(self, lokalizacja: str, data: date) -> Optional[DanePogodowe]:
+        """
+        Pobiera rekord pogodowy dla lokalizacji i dnia.
+
+        Args:
+            lokalizacja: Nazwa lokalizacji
+            data: Dzień (obiekt date lub datetime)
+
+        Returns:
+            Optional[DanePogodowe]: Rekord lub None jeśli brak danych
+        """
+        wiersz = self.pozycja(lokalizacja, data)
+        return None if wiersz is None else self._magazyn[wiersz]
+
+    def najnowsze(self, lokalizacja: str) -> Optional[DanePogodowe]:
+        """Zwraca najnowszy rekord dla lokalizacji lub None."""
+        wiersz = self._najnowsze.get(self._magazyn.kod_lokalizacji(lokalizacja))
+        return None if wiersz is None else self._magazyn[wiersz]
+
+    def lokalizacje(self) -> List[str]:
+        """Zwraca listę lokalizacji obecnych w indeksie."""
+        return [self._magazyn.lokalizacje[kod] for kod in self._najnowsze]
+
+    def __len__(self) -> int:
+        return len(self._po_dacie)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+import math
+from typing import Collection, Dict, List, Optional, Tuple
+import numpy as np
+from src.data_handlers.drzewo_kd import DrzewoKD
+from src.data_handlers.magazyn_pogody import MagazynPogody
+
+PROMIEN_ZIEMI_KM = 6371.0
+
+def _na_sferze(wspolrzedne: np.ndarray) -> np.ndarray:
+    """Zamienia pary (szerokość, długość) w stopniach na punkty sfery jednostkowej."""
+    szerokosc, dlugosc = np.radians(wspolrzedne).T
+    return np.column_stack([
+        np.cos(szerokosc) * np.cos(dlugosc), np.cos(szerokosc) * np.sin(dlugosc), np.sin(szerokosc)
+    ])
+
+class IndeksStacji:
+    """
+    Indeks przestrzenny stacji (lokalizacji) pogodowych.
+
+    Współrzędne geograficzne zamieniane są na punkty sfery jednostkowej -
+    odległość w linii prostej rośnie razem z odległością po powierzchni
+    Ziemi, więc najbliższe stacje wyszukuje drzewo k-d bez przeglądania
+    wszystkich stacji.
+    """
+
+    def __init__(self, stacje: Dict[str, Tuple[float, float]]):
+        """
+        Args:
+            stacje: Nazwa stacji -> (szerokość, długość geograficzna) w stopniach
+        """
+        self._nazwy: List[str] = list(stacje)
+        wspolrzedne = np.array([stacje[n] for n in self._nazwy], dtype=np.float64).reshape(-1, 2)
+        self._drzewo = DrzewoKD(_na_sferze(wspolrzedne))
+
+    def __len__(self) -> int:
+        return len(self._nazwy)
+
+    def najblizsze(self, wspolrzedne: Tuple[float, float], k: int = 1) -> List[Tuple[str, float]]:
+        """
+        Wyszukuje k stacji najbliższych punktowi.
+
+        Args:
+            wspolrzedne: (szerokość, długość geograficzna) w stopniach
+            k: Liczba zwracanych stacji
+
+        Returns:
+            Lista krotek (nazwa stacji, odległość w km) od najbliższej
+        """
+        cel = _na_sferze(np.array([wspolrzedne], dtype=np.float64))[0]
+        numery, cieciwy = self._drzewo.najblizsze(cel, k)
+        return [
+            (self._nazwy[i], 2 * PROMIEN_ZIEMI_KM * math.asin(min(1.0, math.sqrt(c) / 2)))
+            for i, c in zip(numery.tolist(), cieciwy.tolist())
+        ]
+
+    def wagi(self, wspolrzedne: Tuple[float, float], k: int = 3, potega: float = 2.0) -> List[Tuple[str, float]]:
+        """
+        Zwraca wagi k najbliższych stacji do interpolacji odwrotnie proporcjonalnej do odległości.
+
+        Args:
+            wspolrzedne: (szerokość, długość geograficzna) w stopniach
+            k: Liczba uwzględnianych stacji
+            potega: Wykładnik odległości (waga = 1 / odległość ** potega)
+
+        Returns:
+            Lista krotek (nazwa stacji, waga) od najbliższej; wagi sumują się do 1.
+            Stacja położona dokładnie w punkcie otrzymuje całą wagę.
+        """
+        najblizsze = self.najblizsze(wspolrzedne, k)
+        if not najblizsze:
+            return []
+        if najblizsze[0][1] == 0:
+            return [(najblizsze[0][0], 1.0)]
+        odwrotnosci = [1 / odleglosc ** potega for _, odleglosc in najblizsze]
+        suma = sum(odwrotnosci)
+        return [(nazwa, w / suma) for (nazwa, _), w in zip(najblizsze, odwrotnosci)]
+
+def najblizsza_stacja(region: str, lokalizacje: Collection[str], stacje: IndeksStacji,
+                      wspolrzedne: Dict[str, Tuple[float, float]]) -> Optional[str]:
+    """
+    Wskazuje lokalizację z danymi opisującą region: sam region, jeśli ma dane,
+    a w przeciwnym razie najbliższą stację o znanych współrzędnych.
+
+    Args:
+        region: Nazwa regionu
+        lokalizacje: Lokalizacje z danymi pogodowymi
+        stacje: Indeks stacji spośród lokalizacji
+        wspolrzedne: Region lub stacja -> (szerokość, długość geograficzna)
+
+    Returns:
+        Nazwa lokalizacji lub None, gdy współrzędne regionu są nieznane
+    """
+    if region in lokalizacje:
+        return region
+    punkt = wspolrzedne.get(region)
+    if punkt is None:
+        return None
+    najblizsze = stacje.najblizsze(punkt, 1)
+    return najblizsze[0][0] if najblizsze else None
+
+class StacjeMagazynu:
+    """
+    Przypisanie regionów do najbliższych stacji z danymi w magazynie pogody.
+
+    Indeks stacji i zapamiętane przypisania budowane są od nowa, gdy
+    w magazynie pojawi się nowa lokalizacja.
+    """
+
+    def __init__(self, magazyn: MagazynPogody, wspolrzedne: Dict[str, Tuple[float, float]]):
+        """
+        Args:
+            magazyn: Magazyn pogody
+            wspolrzedne: Region lub stacja -> (szerokość, długość geograficzna) w stopniach
+        """
+        self._magazyn = magazyn
+        self._wspolrzedne = wspolrzedne
+        # (liczba lokalizacji magazynu, nazwy lokalizacji, indeks stacji, region -> lokalizacja)
+        self._stan: Optional[Tuple[int, Collection[str], IndeksStacji, Dict[str, Optional[str]]]] = None
+
+    def _aktualny(self) -> Tuple[int, Collection[str], IndeksStacji, Dict[str, Optional[str]]]:
+        liczba = len(self._magazyn.lokalizacje)
+        if self._stan is None or self._stan[0] != liczba:
+            lokalizacje = set(self._magazyn.lokalizacje)
+            stacje = IndeksStacji({l: self._wspolrzedne[l] for l in lokalizacje if l in self._wspolrzedne})
+            self._stan = (liczba, lokalizacje, stacje, {})
+        return self._stan
+
+    @property
+    def indeks(self) -> IndeksStacji:
+        """Indeks stacji z danymi, dla których znane są współrzędne."""
+        return self._aktualny()[2]
+
+    def __call__(self, region: str) -> Optional[str]:
+        """Zwraca lokalizację z danymi opisującą region (najblizsza_stacja) lub None."""
+        _, lokalizacje, stacje, wyniki = self._aktualny()
+        if region not in wyniki:
+            wyniki[region] = najblizsza_stacja(region, lokalizacje, stacje, self._wspolrzedne)
+        return wyniki[region]
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+from src.data_handlers.magazyn_tras import MagazynTras
+
+class IndeksZakresowyTras:
+    """
+    Indeks zakresowy po długości, trudności i przewyższeniu tras,
+    partycjonowany po regionie.
+
+    Dla każdej partycji i każdego atrybutu przechowywana jest posortowana
+    tablica wartości oraz odpowiadające im numery wierszy magazynu.
+    Zapytanie wyszukuje binarnie zakres w najbardziej selektywnym
+    atrybucie, a pozostałe warunki sprawdza już tylko dla kandydatów.
+    """
+
+    # atrybut -> (klucz dolnej granicy, klucz górnej granicy) w parametrach wyszukiwania
+    _ATRYBUTY = {
+        'dlugosc_km': ('min_length', 'max_length'),
+        'trudnosc': ('min_difficulty', 'max_difficulty'),
+        'przewyzszenie_m': ('min_elevation', 'max_elevation'),
+    }
+
+    def __init__(self, magazyn: MagazynTras):
+        """
+        Buduje indeks dla wszystkich tras w magazynie.
+
+        Args:
+            magazyn: Kolumnowy magazyn tras
+        """
+        self._magazyn = magazyn
+        # kod regionu (None - wszystkie regiony) -> atrybut -> (posortowane wartości, numery wierszy)
+        self._partycje: Dict[Optional[int], Dict[str, Tuple[np.ndarray, np.ndarray]]] = {}
+        self._partycje[None] = self._zbuduj_partycje(np.arange(len(magazyn)))
+        for kod in range(len(magazyn.regiony)):
+            wiersze = np.flatnonzero(magazyn.region_kod == kod)
+            self._partycje[kod] = self._zbuduj_partycje(wiersze)
+
+    def _zbuduj_partycje(self, wiersze: np.ndarray) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        partycja = {}
+        for atrybut in self._ATRYBUTY:
+            wartosci = getattr(self._magazyn, atrybut)[wiersze]
+            kolejnosc = np.argsort(wartosci, kind='stable')
+            partycja[atrybut] = (wartosci[kolejnosc], wiersze[kolejnosc])
+        return partycja
+
+    def usun(self, wiersze) -> None:
+        """
+        Usuwa wiersze z indeksu. Należy wywołać przed zmianą tych wierszy w magazynie.
+
+        Args:
+            wiersze: Numery wierszy magazynu
+        """
+        wiersze = np.asarray(wiersze, dtype=np.int64)
+        if not len(wiersze):
+            return
+        for kod in [None, *np.unique(self._magazyn.region_kod[wiersze]).tolist()]:
+            partycja = self._partycje[kod]
+            for atrybut, (wartosci, numery) in partycja.items():
+                zostaw = ~np.isin(numery, wiersze)
+                partycja[atrybut] = (wartosci[zostaw], numery[zostaw])
+
+    def dodaj(self, wiersze) -> None:
+        """
+        Wstawia do indeksu nowe lub zmienione wiersze magazynu.
+
+        Args:
+            wiersze: Numery wierszy magazynu
+        """
+        wiersze = np.asarray(wiersze, dtype=np.int64)
+        if not len(wiersze):
+            return
+        kody = self._magazyn.region_kod[wiersze]
+        for kod in [None, *np.unique(kody).tolist()]:
+            nowe = wiersze if kod is None else wiersze[kody == kod]
+            if kod not in self._partycje:
+                self._partycje[kod] = self._zbuduj_partycje(np.empty(0, dtype=np.int64))
+            partycja = self._partycje[kod]
+            for atrybut, (wartosci, numery) in partycja.items():
+                nowe_wartosci = getattr(self._magazyn, atrybut)[nowe]
+                kolejnosc = np.argsort(nowe_wartosci, kind='stable')
+                miejsca = np.searchsorted(wartosci, nowe_wartosci[kolejnosc], 'right')
+                partycja[atrybut] = (
+                    np.insert(wartosci, miejsca, nowe_wartosci[kolejnosc]),
+                    np.insert(numery, miejsca, nowe[kolejnosc]),
+                )
+
+    def zapytanie(self, parametry: Dict[str, Any]) -> np.ndarray:
+        """
+        Zwraca numery wierszy tras spełniających parametry wyszukiwania.
+
+        Args:
+            parametry: Słownik parametrów jak w MenadzerDanychTras.wyszukaj_trasy
+
+        Returns:
+            Rosnąca tablica numerów wierszy magazynu
+        """
+        region = parametry.get('region', 'wszystkie')
+        kod = None if region == 'wszystkie' else self._magazyn.kod_regionu(region)
+        if region != 'wszystkie' and kod is None:
+            return np.empty(0, dtype=np.int64)
+        partycja = self._partycje[kod]
+
+        # Wybierz atrybut o najwęższym zakresie kandydatów
+        zakresy = {}
+        for atrybut, (klucz_min, klucz_max) in self._ATRYBUTY.items():
+            if klucz_min not in parametry and klucz_max not in parametry:
+                continue
+            wartosci, _ = partycja[atrybut]
+            od = np.searchsorted(wartosci, parametry[klucz_min], 'left') if klucz_min in parametry else 0
+            do = np.searchsorted(wartosci, parametry[klucz_max], 'right') if klucz_max in parametry else len(wartosci)
+            zakresy[atrybut] = (od, max(od, do))
+
+        if not zakresy:
+            return np.sort(partycja['dlugosc_km'][1])
+
+        wybrany = min(zakresy, key=lambda a: zakresy[a][1] - zakresy[a][0])
+        od, do = zakresy[wybrany]
+        kandydaci = partycja[wybrany][1][od:do]
+
+        # Pozostałe warunki sprawdź tylko dla kandydatów
+        maska = np.ones(len(kandydaci), dtype=bool)
+        for atrybut in zakresy:
+            if atrybut == wybrany:
+                continue
+            klucz_min, klucz_max = self._ATRYBUTY[atrybut]
+            wartosci = getattr(self._magazyn, atrybut)[kandydaci]
+            if klucz_min in parametry:
+                maska &= wartosci >= parametry[klucz_min]
+            if klucz_max in parametry:
+                maska &= wartosci <= parametry[klucz_max]
+        return np.sort(kandydaci[maska])
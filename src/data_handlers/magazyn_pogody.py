@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional, Tuple
+import itertools
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+from src.models.dane_pogodowe import DanePogodowe, indeks_komfortu
+
+# atrybut DanePogodowe -> kolumna pliku CSV
+KOLUMNY_POGODY = {
+    'temp_srednia': 'avg_temp',
+    'temp_min': 'min_temp',
+    'temp_max': 'max_temp',
+    'opady_mm': 'precipitation',
+    'godziny_sloneczne': 'sunshine_hours',
+    'zachmurzenie_pct': 'cloud_cover',
+}
+
+# kolumna wyliczana przy wczytaniu z kolumn pomiarów (DanePogodowe.oblicz_indeks_komfortu)
+KOLUMNA_KOMFORTU = 'indeks_komfortu'
+
+# Wersje unikalne także między instancjami (jak w MagazynTras)
+_WERSJE = itertools.count(1)
+
+# Liczba ostatnich zmian magazynu pamiętanych w dzienniku (patrz MagazynPogody.zastapione_od)
+MAKS_DZIENNIKA = 1024
+
+class MagazynPogody(Sequence):
+    """
+    Kolumnowy magazyn danych pogodowych.
+
+    Daty przechowywane są jako datetime64[D], lokalizacje jako kody
+    liczbowe, a wartości pomiarów w tablicach float64. Indeks komfortu
+    liczony jest raz, przy dodaniu wierszy, i przechowywany jako kolumna
+    KOLUMNA_KOMFORTU. Obiekty DanePogodowe tworzone są dopiero przy
+    pierwszym odwołaniu do wiersza. Wiersze dopisane przy uzupełnianiu luk
+    (src.data_handlers.uzupelnianie_luk) oznaczone są w tablicy uzupelnione.
+    """
+
+    def __init__(self):
+        """Inicjalizuje pusty magazyn."""
+        self._data = np.empty(0, dtype='datetime64[D]')
+        self._lokalizacja_kod = np.empty(0, dtype=np.int32)
+        self._uzupelnione = np.empty(0, dtype=bool)
+        self._kolumny: Dict[str, np.ndarray] = {
+            k: np.empty(0, dtype=np.float64) for k in (*KOLUMNY_POGODY, KOLUMNA_KOMFORTU)
+        }
+        self._lokalizacje: List[str] = []
+        self._kody_lokalizacji: Dict[str, int] = {}
+        self._obiekty: List[Optional[DanePogodowe]] = []
+        # wersja zawartości - zmienia się przy każdej modyfikacji
+        self._wersja = next(_WERSJE)
+        # (wersja po zmianie, wiersze nadpisane w tej zmianie) - patrz zastapione_od
+        self._dziennik: List[Tuple[int, np.ndarray]] = [(self._wersja, np.empty(0, dtype=np.int64))]
+
+    @classmethod
+    def z_rekordow(cls, rekordy: Iterable[DanePogodowe]) -> 'MagazynPogody':
+        """Tworzy magazyn z istniejących obiektów DanePogodowe."""
+        rekordy = list(rekordy)
+        magazyn = cls()
+        magazyn.dodaj_kolumny(
+            np.asarray([d.data for d in rekordy], dtype='datetime64[D]'),
+            [d.lokalizacja for d in rekordy],
+            {k: np.asarray([getattr(d, k) for d in rekordy], dtype=np.float64) for k in KOLUMNY_POGODY},
+        )
+        magazyn._obiekty = rekordy
+        return magazyn
+
+    def _przekoduj(self, lokalizacje) -> np.ndarray:
+        """Zamienia nazwy lokalizacji na kody magazynu (nowe nazwy w kolejności wystąpienia)."""
+        kody, nazwy = pd.factorize(np.asarray(lokalizacje, dtype=object))
+        mapowanie = np.asarray([self._kod(n) for n in nazwy], dtype=np.int32)
+        return mapowanie[kody] if len(kody) else np.empty(0, dtype=np.int32)
+
+    def _kod(self, lokalizacja: str) -> int:
+        kod = self._kody_lokalizacji.get(lokalizacja)
+        if kod is None:
+            kod = len(self._lokalizacje)
+            lokalizacja = sys.intern(str(lokalizacja))
+            self._kody_lokalizacji[lokalizacja] = kod
+            self._lokalizacje.append(lokalizacja)
+        return kod
+
+    def dodaj_kolumny(self, daty: np.ndarray, lokalizacje, kolumny: Dict[str, np.ndarray],
+                      uzupelnione=False) -> np.ndarray:
+        """
+        Dopisuje na koniec magazynu rekordy podane kolumnami.
+
+        Pomiar dnia, który wcześniej uzupełniono (src.data_handlers.uzupelnianie_luk),
+        nadpisuje w miejscu wiersz uzupełniony zamiast dopisywać drugi wiersz
+        tej samej pary (lokalizacja, dzień).
+
+        Args:
+            daty: Tablica datetime64[D]
+            lokalizacje: Nazwy lokalizacji (sekwencja napisów)
+            kolumny: Wartości pomiarów dla każdej kolumny z KOLUMNY_POGODY; indeks
+                komfortu (KOLUMNA_KOMFORTU) jest wyliczany, jeśli go nie podano
+            uzupelnione: Czy rekordy są wartościami uzupełnionymi, a nie pomiarami
+                (wartość wspólna lub tablica bool)
+
+        Returns:
+            Numery wierszy magazynu, w których zapisano kolejne rekordy
+        """
+        daty = np.asarray(daty, dtype='datetime64[D]')
+        lokalizacje = np.asarray(lokalizacje, dtype=object)
+        uzupelnione = np.broadcast_to(np.asarray(uzupelnione, dtype=bool), (len(daty),))
+        kolumny = self._z_komfortem(kolumny)
+        kody = self._przekoduj(lokalizacje)
+        pozycje = self._wiersze_uzupelnione(daty, kody, uzupelnione)
+        w_miejscu = pozycje >= 0
+        if w_miejscu.any():
+            self.zastap_kolumny(pozycje[w_miejscu], daty[w_miejscu], lokalizacje[w_miejscu],
+                                {k: np.asarray(v)[w_miejscu] for k, v in kolumny.items()})
+        dopisane = ~w_miejscu
+        baza = len(self)
+        self._data = np.concatenate([self._data, daty[dopisane]])
+        self._lokalizacja_kod = np.concatenate([self._lokalizacja_kod, kody[dopisane]])
+        for k in self._kolumny:
+            self._kolumny[k] = np.concatenate([self._kolumny[k], np.asarray(kolumny[k], dtype=np.float64)[dopisane]])
+        self._uzupelnione = np.concatenate([self._uzupelnione, uzupelnione[dopisane]])
+        self._obiekty.extend([None] * (len(self._data) - baza))
+        self._nowa_wersja(np.empty(0, dtype=np.int64))
+        pozycje[dopisane] = np.arange(baza, len(self))
+        return pozycje
+
+    def _wiersze_uzupelnione(self, daty: np.ndarray, kody: np.ndarray, uzupelnione: np.ndarray) -> np.ndarray:
+        """
+        Dla każdego pomiaru zwraca wiersz uzupełniony z tą samą parą (lokalizacja, dzień) lub -1.
+
+        Przy kilku pomiarach tej samej pary wiersz otrzymuje tylko pierwszy z nich.
+        """
+        pozycje = np.full(len(daty), -1, dtype=np.int64)
+        wiersze = np.flatnonzero(self._uzupelnione)
+        pomiary = np.flatnonzero(~uzupelnione)
+        if not len(wiersze) or not len(pomiary):
+            return pozycje
+        klucze_wierszy = self.klucz(
+            self._lokalizacja_kod[wiersze].astype(np.int64), self._data[wiersze].astype(np.int64)
+        )
+        kolejnosc = np.argsort(klucze_wierszy, kind='stable')
+        klucze_wierszy, wiersze = klucze_wierszy[kolejnosc], wiersze[kolejnosc]
+        klucze, pierwsze = np.unique(
+            self.klucz(kody[pomiary].astype(np.int64), daty[pomiary].astype(np.int64)), return_index=True
+        )
+        pomiary = pomiary[pierwsze]
+        miejsca = np.minimum(np.searchsorted(klucze_wierszy, klucze), len(klucze_wierszy) - 1)
+        trafione = klucze_wierszy[miejsca] == klucze
+        pozycje[pomiary[trafione]] = wiersze[miejsca[trafione]]
+        return pozycje
+
+    def zastap_kolumny(self, pozycje: np.ndarray, daty: np.ndarray, lokalizacje,
+                       kolumny: Dict[str, np.ndarray], uzupelnione=False) -> None:
+        """Nadpisuje wskazane wiersze nowymi wartościami (argumenty jak w dodaj_kolumny)."""
+        zmiany = {
+            '_data': np.asarray(daty, dtype='datetime64[D]'), '_lokalizacja_kod': self._przekoduj(lokalizacje),
+            '_uzupelnione': uzupelnione,
+        }
+        for atrybut, wartosci in zmiany.items():
+            setattr(self, atrybut, self._zapisywalna(getattr(self, atrybut)))
+            getattr(self, atrybut)[pozycje] = wartosci
+        kolumny = self._z_komfortem(kolumny)
+        for k in self._kolumny:
+            self._kolumny[k] = self._zapisywalna(self._kolumny[k])
+            self._kolumny[k][pozycje] = kolumny[k]
+        for i in np.asarray(pozycje).tolist():
+            self._obiekty[i] = None
+        self._nowa_wersja(np.asarray(pozycje, dtype=np.int64))
+
+    def _nowa_wersja(self, zastapione: np.ndarray) -> None:
+        """Nadaje nową wersję zawartości i zapisuje w dzienniku nadpisane wiersze."""
+        self._wersja = next(_WERSJE)
+        self._dziennik.append((self._wersja, zastapione))
+        if len(self._dziennik) > MAKS_DZIENNIKA:
+            del self._dziennik[0]
+
+    def zastapione_od(self, wersja: int) -> Optional[np.ndarray]:
+        """
+        Zwraca wiersze nadpisane (zastap_kolumny, także pomiarem dnia uzupełnionego) od podanej wersji.
+
+        Wiersze dopisane od tej wersji to wiersze od ówczesnej długości
+        magazynu. Pozwala to aktualizować struktury pochodne (np.
+        KostkaPogodowa) bez porównywania wszystkich wierszy.
+
+        Args:
+            wersja: Wersja magazynu, z którą uzgodniono strukturę pochodną
+
+        Returns:
+            Numery wierszy (mogą się powtarzać) lub None, gdy dziennik nie sięga
+            tej wersji albo zawartość magazynu zastąpiono w całości lub usunięto
+            z niego wiersze
+        """
+        wersje = [w for w, _ in self._dziennik]
+        if wersja not in wersje:
+            return None
+        zmiany = [z for _, z in self._dziennik[wersje.index(wersja) + 1:]]
+        return np.concatenate(zmiany) if zmiany else np.empty(0, dtype=np.int64)
+
+    @staticmethod
+    def _z_komfortem(kolumny: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Uzupełnia kolumny pomiarów o indeks komfortu, jeśli go brakuje."""
+        if KOLUMNA_KOMFORTU in kolumny:
+            return kolumny
+        komfort = indeks_komfortu(kolumny['temp_srednia'], kolumny['opady_mm'], kolumny['zachmurzenie_pct'])
+        return {**kolumny, KOLUMNA_KOMFORTU: komfort}
+
+    @staticmethod
+    def _zapisywalna(tablica: np.ndarray) -> np.ndarray:
+        # Kolumny zmapowane z migawki są tylko do odczytu
+        return tablica if tablica.flags.writeable else np.array(tablica)
+
+    def dolacz(self, inny: 'MagazynPogody') -> np.ndarray:
+        """
+        Dołącza rekordy innego magazynu. Pusty magazyn przejmuje tablice
+        bez kopiowania (np. zmapowane z migawki).
+
+        Returns:
+            Numery wierszy, w których zapisano kolejne rekordy innego magazynu
+            (jak w dodaj_kolumny)
+        """
+        if not len(self) and not self._lokalizacje:
+            self._data = inny._data
+            self._lokalizacja_kod = inny._lokalizacja_kod
+            self._uzupelnione = inny._uzupelnione
+            self._kolumny = dict(inny._kolumny)
+            self._lokalizacje = list(inny._lokalizacje)
+            self._kody_lokalizacji = dict(inny._kody_lokalizacji)
+            self._obiekty = list(inny._obiekty)
+            # Nowa zawartość w całości - dziennik zaczyna się od nowa
+            self._wersja = next(_WERSJE)
+            self._dziennik = [(self._wersja, np.empty(0, dtype=np.int64))]
+            return np.arange(len(self))
+        return self.dodaj_kolumny(
+            inny._data, np.asarray(inny._lokalizacje, dtype=object)[inny._lokalizacja_kod], inny._kolumny,
+            inny._uzupelnione
+        )
+
+    def usun_wiersze(self, pozycje: np.ndarray) -> np.ndarray:
+        """
+        Usuwa wskazane wiersze, zachowując kolejność pozostałych.
+
+        Returns:
+            Tablica stary numer wiersza -> nowy numer (-1 dla usuniętych), np. dla
+            SledzonyPlikCSV.przenumeruj_pozycje
+        """
+        zostaja = np.ones(len(self), dtype=bool)
+        zostaja[pozycje] = False
+        numery = np.full(len(self), -1, dtype=np.int64)
+        numery[zostaja] = np.arange(int(zostaja.sum()))
+        self._data = self._data[zostaja]
+        self._lokalizacja_kod = self._lokalizacja_kod[zostaja]
+        self._uzupelnione = self._uzupelnione[zostaja]
+        self._kolumny = {k: v[zostaja] for k, v in self._kolumny.items()}
+        self._obiekty = [o for o, z in zip(self._obiekty, zostaja.tolist()) if z]
+        # Numery wierszy się przesunęły - dziennik zaczyna się od nowa
+        self._wersja = next(_WERSJE)
+        self._dziennik = [(self._wersja, np.empty(0, dtype=np.int64))]
+        return numery
+
+    def kod_lokalizacji(self, lokalizacja: str) -> Optional[int]:
+        """Zwraca kod lokalizacji lub None, jeśli magazyn nie zawiera jej danych."""
+        return self._kody_lokalizacji.get(lokalizacja)
+
+    @property
+    def lokalizacje(self) -> List[str]:
+        """Nazwy lokalizacji indeksowane kodem."""
+        return self._lokalizacje
+
+    @property
+    def wersja(self) -> int:
+        """Wersja zawartości magazynu - zmienia się przy każdej modyfikacji."""
+        return self._wersja
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data
+
+    @property
+    def lokalizacja_kod(self) -> np.ndarray:
+        return self._lokalizacja_kod
+
+    @property
+    def uzupelnione(self) -> np.ndarray:
+        """Maska wierszy z wartościami uzupełnionymi zamiast pomiarów."""
+        return self._uzupelnione
+
+    @staticmethod
+    def klucz(kod, dzien):
+        """Klucz (lokalizacja, dzień): kod w starszych 32 bitach, numer dnia od 1970-01-01 w młodszych."""
+        return (kod << 32) | (dzien + 2 ** 31)
+
+    def klucze(self) -> np.ndarray:
+        """Zwraca klucze (lokalizacja, dzień) wszystkich wierszy jako int64."""
+        return self.klucz(self._lokalizacja_kod.astype(np.int64), self._data.astype(np.int64))
+
+    def kolumna(self, nazwa: str) -> np.ndarray:
+        """Zwraca kolumnę pomiarów (np. 'temp_srednia', 'opady_mm') lub indeksu komfortu (KOLUMNA_KOMFORTU)."""
+        return self._kolumny[nazwa]
+
+    def indeks_komfortu(self, wagi: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Zwraca indeks komfortu wszystkich wierszy.
+
+        Args:
+            wagi: Własne wagi składowych 'temp', 'opady' i 'zachmurzenie'; bez nich
+                zwracana jest kolumna wyliczona przy wczytaniu
+
+        Returns:
+            Tablica float64 indeksów komfortu
+        """
+        if wagi is None:
+            return self._kolumny[KOLUMNA_KOMFORTU]
+        return indeks_komfortu(
+            self._kolumny['temp_srednia'], self._kolumny['opady_mm'], self._kolumny['zachmurzenie_pct'], wagi
+        )
+
+    def __len__(self) -> int:
+        return len(self._obiekty)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Indeks rekordu pogodowego poza zakresem")
+        dane = self._obiekty[i]
+        if dane is None:
+            dane = DanePogodowe(
+                self._data[i].item(),
+                self._lokalizacje[self._lokalizacja_kod[i]],
+                *(float(self._kolumny[k][i]) for k in KOLUMNY_POGODY),
+                indeks_komfortu=float(self._kolumny[KOLUMNA_KOMFORTU][i])
+            )
+            self._obiekty[i] = dane
+        return dane
+
+    def zapisz_migawke(self, katalog: str) -> None:
+        """Zapisuje kolumny magazynu jako pliki .npy i listę lokalizacji w lokalizacje.json."""
+        os.makedirs(katalog, exist_ok=True)
+        np.save(os.path.join(katalog, 'data.npy'), self._data)
+        np.save(os.path.join(katalog, 'lokalizacja_kod.npy'), self._lokalizacja_kod)
+        np.save(os.path.join(katalog, 'uzupelnione.npy'), self._uzupelnione)
+        for k, tablica in self._kolumny.items():
+            np.save(os.path.join(katalog, f'{k}.npy'), tablica)
+        with open(os.path.join(katalog, 'lokalizacje.json'), 'w', encoding='utf-8') as f:
+            json.dump(self._lokalizacje, f, ensure_ascii=False)
+
+    @classmethod
+    def wczytaj_migawke(cls, katalog: str, mmap: bool = True) -> 'MagazynPogody':
+        """Odtwarza magazyn zapisany przez zapisz_migawke, opcjonalnie mapując kolumny z dysku."""
+        tryb = 'r' if mmap else None
+        magazyn = cls()
+        magazyn._data = np.load(os.path.join(katalog, 'data.npy'), mmap_mode=tryb)
+        magazyn._lokalizacja_kod = np.load(os.path.join(katalog, 'lokalizacja_kod.npy'), mmap_mode=tryb)
+        magazyn._uzupelnione = np.load(os.path.join(katalog, 'uzupelnione.npy'), mmap_mode=tryb)
+        magazyn._kolumny = {
+            k: np.load(os.path.join(katalog, f'{k}.npy'), mmap_mode=tryb) for k in (*KOLUMNY_POGODY, KOLUMNA_KOMFORTU)
+        }
+        with open(os.path.join(katalog, 'lokalizacje.json'), encoding='utf-8') as f:
+            magazyn._lokalizacje = [sys.intern(n) for n in json.load(f)]
+        magazyn._kody_lokalizacji = {n: i for i, n in enumerate(magazyn._lokalizacje)}
+        magazyn._obiekty = [None] * len(magazyn._data)
+        return magazyn
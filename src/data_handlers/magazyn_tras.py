@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+from collections.abc import Sequence
+from typing import List, Dict, Any, Optional, Iterable, Sequence as SekwencjaTyp
+import itertools
+import json
+import os
+import sys
+import numpy as np
+from src.models.trasy import Trasa
+
+# Wersje są unikalne także między instancjami, więc para (wersja tras,
+# wersja pogody) jednoznacznie wskazuje zawartość danych
+_WERSJE = itertools.count(1)
+
+class MagazynTras(Sequence):
+    """
+    Kolumnowy magazyn tras.
+
+    Parametry liczbowe tras przechowywane są w tablicach NumPy, a obiekty
+    Trasa tworzone są dopiero przy pierwszym odwołaniu do danego wiersza.
+    """
+
+    _POLA_TEKSTOWE = ('nazwa', 'czas_przejscia', 'punkt_startowy', 'punkt_koncowy', 'opis', 'kategoria')
+    _KOLUMNY = ('id', 'dlugosc_km', 'trudnosc', 'przewyzszenie_m', 'region_kod')
+
+    def __init__(self):
+        """Inicjalizuje pusty magazyn tras."""
+        self._id = np.empty(0, dtype=np.int64)
+        self._dlugosc_km = np.empty(0, dtype=np.float64)
+        self._trudnosc = np.empty(0, dtype=np.float64)
+        self._przewyzszenie_m = np.empty(0, dtype=np.int64)
+        self._region_kod = np.empty(0, dtype=np.int32)
+        self._regiony: List[str] = []
+        self._kody_regionow: Dict[str, int] = {}
+        self._teksty: List[tuple] = []
+        self._obiekty: List[Optional[Trasa]] = []
+        # wersja zawartości - zmienia się przy każdej modyfikacji, pozwala odbiorcom
+        # unieważniać wyniki wyliczone z poprzedniej zawartości
+        self._wersja = next(_WERSJE)
+
+    def dodaj_wiersze(self, wiersze: Iterable[Dict[str, str]]) -> int:
+        """
+        Dopisuje do magazynu wiersze odczytane z pliku CSV.
+
+        Args:
+            wiersze: Słowniki z polami trasy (jak z csv.DictReader)
+
+        Returns:
+            Liczba dodanych tras
+        """
+        kolumny, teksty = self._parsuj_wiersze(wiersze)
+        for nazwa, nowe in kolumny.items():
+            setattr(self, '_' + nazwa, np.concatenate([getattr(self, '_' + nazwa), nowe]))
+        self._teksty.extend(teksty)
+        self._obiekty.extend([None] * len(teksty))
+        self._wersja = next(_WERSJE)
+        return len(teksty)
+
+    def zastap_wiersze(self, pozycje: SekwencjaTyp[int], wiersze: Iterable[Dict[str, str]]) -> None:
+        """
+        Nadpisuje istniejące wiersze magazynu nowymi wartościami.
+
+        Args:
+            pozycje: Numery nadpisywanych wierszy
+            wiersze: Nowe wartości wierszy (w tej samej kolejności)
+        """
+        kolumny, teksty = self._parsuj_wiersze(wiersze)
+        pozycje = np.asarray(pozycje, dtype=np.int64)
+        for nazwa, nowe in kolumny.items():
+            tablica = getattr(self, '_' + nazwa)
+            if not tablica.flags.writeable:
+                # Kolumny zmapowane z migawki są tylko do odczytu
+                tablica = np.array(tablica)
+                setattr(self, '_' + nazwa, tablica)
+            tablica[pozycje] = nowe
+        for i, tekst in zip(pozycje.tolist(), teksty):
+            self._teksty[i] = tekst
+            self._obiekty[i] = None
+        self._wersja = next(_WERSJE)
+
+    def _parsuj_wiersze(self, wiersze: Iterable[Dict[str, str]]):
+        """Zamienia wiersze CSV na tablice kolumn liczbowych i listę krotek pól tekstowych."""
+        ids, dlugosci, trudnosci, przewyzszenia, kody, teksty = [], [], [], [], [], []
+        for row in wiersze:
+            ids.append(int(row['id']))
+            dlugosci.append(float(row['dlugosc_km']))
+            trudnosci.append(float(row['trudnosc']))
+            przewyzszenia.append(int(row['przewyzszenie_m']))
+            kody.append(self._kod_regionu(row['region']))
+            teksty.append(self._tekst(row[pole] for pole in self._POLA_TEKSTOWE))
+        kolumny = {
+            'id': np.asarray(ids, dtype=np.int64),
+            'dlugosc_km': np.asarray(dlugosci, dtype=np.float64),
+            'trudnosc': np.asarray(trudnosci, dtype=np.float64),
+            'przewyzszenie_m': np.asarray(przewyzszenia, dtype=np.int64),
+            'region_kod': np.asarray(kody, dtype=np.int32),
+        }
+        return kolumny, teksty
+
+    def dolacz(self, inny: 'MagazynTras') -> int:
+        """
+        Dołącza na koniec magazynu wszystkie trasy z innego magazynu.
+
+        Kody regionów drugiego magazynu są przeliczane na kody tego magazynu.
+        Jeśli ten magazyn jest pusty, przejmuje tablice bez kopiowania
+        (np. tablice zmapowane z migawki).
+
+        Returns:
+            Liczba dołączonych tras
+        """
+        przekodowanie = np.asarray([self._kod_regionu(r) for r in inny._regiony], dtype=np.int32)
+        if np.array_equal(przekodowanie, np.arange(len(przekodowanie))):
+            kody = inny._region_kod
+        else:
+            kody = przekodowanie[inny._region_kod]
+        for nazwa in self._KOLUMNY:
+            nowa = kody if nazwa == 'region_kod' else getattr(inny, '_' + nazwa)
+            if len(self):
+                nowa = np.concatenate([getattr(self, '_' + nazwa), nowa])
+            setattr(self, '_' + nazwa, nowa)
+        self._teksty.extend(inny._teksty)
+        self._obiekty.extend([None] * len(inny))
+        self._wersja = next(_WERSJE)
+        return len(inny)
+
+    def zapisz_migawke(self, katalog: str) -> None:
+        """
+        Zapisuje magazyn w formacie kolumnowym: po jednym pliku .npy na
+        kolumnę liczbową oraz tablicę napisów w teksty.json.
+
+        Args:
+            katalog: Katalog docelowy (tworzony w razie potrzeby)
+        """
+        os.makedirs(katalog, exist_ok=True)
+        for nazwa in self._KOLUMNY:
+            np.save(os.path.join(katalog, f'{nazwa}.npy'), getattr(self, '_' + nazwa))
+        with open(os.path.join(katalog, 'teksty.json'), 'w', encoding='utf-8') as f:
+            json.dump({'regiony': self._regiony, 'wiersze': self._teksty}, f, ensure_ascii=False)
+
+    @classmethod
+    def wczytaj_migawke(cls, katalog: str, mmap: bool = True) -> 'MagazynTras':
+        """
+        Odtwarza magazyn zapisany przez zapisz_migawke.
+
+        Args:
+            katalog: Katalog migawki
+            mmap: Czy mapować kolumny z dysku zamiast wczytywać je do pamięci
+
+        Returns:
+            Magazyn tras
+        """
+        magazyn = cls()
+        for nazwa in cls._KOLUMNY:
+            setattr(magazyn, '_' + nazwa, np.load(os.path.join(katalog, f'{nazwa}.npy'), mmap_mode='r' if mmap else None))
+        with open(os.path.join(katalog, 'teksty.json'), encoding='utf-8') as f:
+            teksty = json.load(f)
+        magazyn._regiony = [sys.intern(r) for r in teksty['regiony']]
+        magazyn._kody_regionow = {r: i for i, r in enumerate(magazyn._regiony)}
+        magazyn._teksty = [cls._tekst(wiersz) for wiersz in teksty['wiersze']]
+        magazyn._obiekty = [None] * len(magazyn._teksty)
+        return magazyn
+
+    @staticmethod
+    def _tekst(pola: Iterable[str]) -> tuple:
+        """Tworzy krotkę pól tekstowych; powtarzalna kategoria trasy jest internowana."""
+        *pola, kategoria = pola
+        return (*pola, sys.intern(kategoria))
+
+    def _kod_regionu(self, region: str) -> int:
+        """Zwraca kod liczbowy regionu, dopisując go do słownika przy pierwszym wystąpieniu."""
+        kod = self._kody_regionow.get(region)
+        if kod is None:
+            kod = len(self._regiony)
+            region = sys.intern(region)
+            self._kody_regionow[region] = kod
+            self._regiony.append(region)
+        return kod
+
+    def kod_regionu(self, region: str) -> Optional[int]:
+        """Zwraca kod regionu lub None, jeśli w magazynie nie ma tras z tego regionu."""
+        return self._kody_regionow.get(region)
+
+    @property
+    def id(self) -> np.ndarray:
+        return self._id
+
+    @property
+    def dlugosc_km(self) -> np.ndarray:
+        return self._dlugosc_km
+
+    @property
+    def trudnosc(self) -> np.ndarray:
+        return self._trudnosc
+
+    @property
+    def przewyzszenie_m(self) -> np.ndarray:
+        return self._przewyzszenie_m
+
+    @property
+    def region_kod(self) -> np.ndarray:
+        return self._region_kod
+
+    @property
+    def regiony(self) -> List[str]:
+        return self._regiony
+
+    @property
+    def wersja(self) -> int:
+        """Wersja zawartości magazynu - zmienia się przy każdym dodaniu lub zastąpieniu wierszy."""
+        return self._wersja
+
+    def __len__(self) -> int:
+        return len(self._obiekty)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Indeks trasy poza zakresem")
+        trasa = self._obiekty[i]
+        if trasa is None:
+            trasa = self._zbuduj(i)
+            self._obiekty[i] = trasa
+        return trasa
+
+    def _zbuduj(self, i: int) -> Trasa:
+        """Tworzy obiekt Trasa dla wiersza o podanym indeksie."""
+        nazwa, czas_przejscia, punkt_startowy, punkt_koncowy, opis, kategoria = self._teksty[i]
+        return Trasa(
+            id=int(self._id[i]),
+            nazwa=nazwa,
+            region=self._regiony[self._region_kod[i]],
+            dlugosc_km=float(self._dlugosc_km[i]),
+            czas_przejscia=czas_przejscia,
+            trudnosc=float(self._trudnosc[i]),
+            przewyzszenie_m=int(self._przewyzszenie_m[i]),
+            punkt_startowy=punkt_startowy,
+            punkt_koncowy=punkt_koncowy,
+            opis=opis,
+            kategoria=kategoria
+        )
+
+    def maska(self, parametry: Dict[str, Any]) -> np.ndarray:
+        """
+        Buduje maskę logiczną wierszy spełniających parametry wyszukiwania.
+
+        Args:
+            parametry: Słownik parametrów jak w MenadzerDanychTras.wyszukaj_trasy
+
+        Returns:
+            Tablica bool o długości równej liczbie tras
+        """
+        maska = np.ones(len(self), dtype=bool)
+        if 'min_length' in parametry:
+            maska &= self._dlugosc_km >= parametry['min_length']
+        if 'max_length' in parametry:
+            maska &= self._dlugosc_km <= parametry['max_length']
+        if 'min_difficulty' in parametry:
+            maska &= self._trudnosc >= parametry['min_difficulty']
+        if 'max_difficulty' in parametry:
+            maska &= self._trudnosc <= parametry['max_difficulty']
+        if 'min_elevation' in parametry:
+            maska &= self._przewyzszenie_m >= parametry['min_elevation']
+        if 'max_elevation' in parametry:
+            maska &= self._przewyzszenie_m <= parametry['max_elevation']
+        if 'region' in parametry and parametry['region'] != 'wszystkie':
+            kod = self.kod_regionu(parametry['region'])
+            if kod is None:
+                maska[:] = False
+            else:
+                maska &= self._region_kod == kod
+        return maska
+
+    def kategorie(self, indeksy: Iterable[int]) -> List[str]:
+        """Zwraca kategorie tras dla podanych indeksów wierszy (bez tworzenia obiektów Trasa)."""
+        return [self._teksty[int(i)][5] for i in indeksy]
+
+    def wybierz(self, indeksy: Iterable[int]) -> List[Trasa]:
+        """Zwraca obiekty Trasa dla podanych indeksów wierszy."""
+        return [self[int(i)] for i in indeksy]
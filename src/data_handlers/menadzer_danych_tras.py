@@ -1,47 +1,176 @@
 # -*- coding: utf-8 -*-
-import csv
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Optional, Sequence, Iterator, Tuple
+import numpy as np
 from src.models.trasy import Trasa
-from datetime import datetime
+from src.data_handlers.magazyn_tras import MagazynTras
+from src.data_handlers.indeks_tras import IndeksZakresowyTras
+from src.data_handlers.indeks_podobienstwa import IndeksPodobienstwaTras
+from src.data_handlers.wczytywanie_csv import (
+    czytaj_wiersze_partiami, parsuj_trase, partiami, wczytaj_plik_tras, ROZMIAR_PARTII
+)
+from src.data_handlers.wczytywanie_rownolegle import pliki_danych, mapuj_rownolegle
+from src.data_handlers.migawka import migawka_aktualna, wczytaj_migawke_tras, wczytaj_stan_sledzenia
+from src.data_handlers.sledzenie_plikow import SledzonyPlikCSV
 
 class MenadzerDanychTras:
     def __init__(self):
         """Inicjalizuje menedżera danych tras."""
-        self._trasy = []
+        self._trasy = MagazynTras()
+        self._indeks = IndeksZakresowyTras(self._trasy)
+        # budowany przy pierwszym wyszukiwaniu tras podobnych
+        self._indeks_podobienstwa: Optional[IndeksPodobienstwaTras] = None
+        # ścieżka bezwzględna -> stan śledzenia wczytanego pliku
+        self._sledzone: Dict[str, SledzonyPlikCSV] = {}
 
-    def wczytaj_trasy(self, sciezka: str) -> List[Trasa]:
+    @property
+    def magazyn(self) -> MagazynTras:
+        """Kolumnowy magazyn wczytanych tras."""
+        return self._trasy
+
+    def wczytaj_trasy(self, sciezka: str, uzyj_migawki: bool = True, procesy: Optional[int] = None) -> Sequence[Trasa]:
         """
-        Wczytuje trasy z pliku CSV.
+        Wczytuje trasy z pliku CSV albo z wielu plików (np. jeden plik na region).
+
+        Pliki parsowane są równolegle w puli procesów i dołączane do magazynu
+        w kolejności posortowanych ścieżek, więc kolejność tras nie zależy od
+        przebiegu wczytywania. Ponowne wczytanie tego samego pliku nie dubluje
+        tras - stosowane są jedynie zmiany (jak w przeladuj_trasy).
         
         Args:
-            sciezka: Ścieżka do pliku CSV z trasami
+            sciezka: Ścieżka do pliku CSV z trasami, katalogu z plikami CSV lub wzorzec glob
+            uzyj_migawki: Czy zmapować migawkę binarną (src.data_handlers.migawka),
+                jeśli jest nowsza niż plik CSV
+            procesy: Liczba procesów parsujących pliki (domyślnie liczba rdzeni)
             
         Returns:
-            Lista obiektów Trasa
+            Sekwencja obiektów Trasa (tworzonych przy pierwszym odwołaniu)
+
+        Raises:
+            ValueError: Gdy identyfikatory nowych tras powtarzają się (także z już wczytanymi)
         """
         try:
-            with open(sciezka, newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    trasa = Trasa(
-                        id=int(row['id']),
-                        nazwa=row['nazwa'],
-                        region=row['region'],
-                        dlugosc_km=float(row['dlugosc_km']),
-                        czas_przejscia=row['czas_przejscia'],
-                        trudnosc=float(row['trudnosc']),
-                        przewyzszenie_m=int(row['przewyzszenie_m']),
-                        punkt_startowy=row['punkt_startowy'],
-                        punkt_koncowy=row['punkt_koncowy'],
-                        opis=row['opis'],
-                        kategoria=row['kategoria']
-                    )
-                    self._trasy.append(trasa)
+            nowe_pliki = []
+            for plik in pliki_danych(sciezka):
+                if os.path.abspath(plik) in self._sledzone:
+                    self.przeladuj_trasy(plik)
+                else:
+                    nowe_pliki.append(plik)
+            if not nowe_pliki:
+                return self._trasy
+
+            z_migawki = {p for p in nowe_pliki if uzyj_migawki and migawka_aktualna(p)}
+            do_parsowania = [p for p in nowe_pliki if p not in z_migawki]
+            wczytane = dict(zip(do_parsowania, mapuj_rownolegle(wczytaj_plik_tras, do_parsowania, procesy)))
+            for plik in z_migawki:
+                wczytane[plik] = (wczytaj_migawke_tras(plik), SledzonyPlikCSV.ze_stanu(plik, wczytaj_stan_sledzenia(plik)))
+
+            self._sprawdz_duplikaty([wczytane[p][0].id for p in nowe_pliki])
+            baza = len(self._trasy)
+            for plik in nowe_pliki:
+                magazyn, sledzony = wczytane[plik]
+                sledzony.przesun_pozycje(len(self._trasy))
+                self._trasy.dolacz(magazyn)
+                self._sledzone[os.path.abspath(plik)] = sledzony
+            self._indeks = IndeksZakresowyTras(self._trasy)
+            if self._indeks_podobienstwa is not None:
+                self._indeks_podobienstwa.dodaj(np.arange(baza, len(self._trasy)))
             return self._trasy
         except Exception as e:
             print(f"Wystąpił błąd podczas wczytywania tras: {str(e)}")
             raise
 
+    def _sprawdz_duplikaty(self, nowe_id: List[np.ndarray], obecne_id: Optional[np.ndarray] = None) -> None:
+        """
+        Zgłasza ValueError, jeśli identyfikatory tras po dołączeniu nowych tras nie byłyby unikalne.
+
+        obecne_id zastępuje identyfikatory magazynu (np. po naniesieniu zmienionych wierszy).
+        """
+        if obecne_id is None:
+            obecne_id = self._trasy.id
+        wszystkie = np.concatenate([obecne_id, *nowe_id])
+        unikalne, liczby = np.unique(wszystkie, return_counts=True)
+        powtorzone = unikalne[liczby > 1]
+        if len(powtorzone):
+            przyklady = ', '.join(str(i) for i in powtorzone[:10].tolist())
+            raise ValueError(f"Zduplikowane identyfikatory tras ({len(powtorzone)}): {przyklady}")
+
+    def przeladuj_trasy(self, sciezka: str, pelne_sprawdzenie: bool = False) -> Tuple[int, int]:
+        """
+        Przyrostowo przeładowuje wcześniej wczytany plik z trasami.
+
+        Parsowane są tylko wiersze dopisane lub zmienione od ostatniego
+        odczytu; magazyn i indeks zakresowy aktualizowane są tylko o te wiersze.
+
+        Args:
+            sciezka: Ścieżka do pliku CSV przekazana wcześniej do wczytaj_trasy
+            pelne_sprawdzenie: Porównaj skróty wszystkich wierszy zamiast zakładać,
+                że plik był tylko dopisywany
+
+        Returns:
+            Krotka (liczba dodanych tras, liczba zmienionych tras)
+
+        Raises:
+            ValueError: Gdy plik nie był wczytany lub zmienione i dopisane
+                wiersze powtarzają identyfikator trasy
+        """
+        sledzony = self._sledzone.get(os.path.abspath(sciezka))
+        if sledzony is None:
+            raise ValueError(f"Plik {sciezka} nie został wcześniej wczytany")
+        try:
+            return self._zastosuj_zmiany(sledzony, pelne_sprawdzenie)
+        except Exception as e:
+            print(f"Wystąpił błąd podczas przeładowania tras: {str(e)}")
+            raise
+
+    def _zastosuj_zmiany(self, sledzony: SledzonyPlikCSV, pelne_sprawdzenie: bool = False) -> Tuple[int, int]:
+        """Przenosi do magazynu i indeksu zmiany odczytane ze śledzonego pliku."""
+        dodane = zmienione = 0
+        for partia in partiami(sledzony.czytaj_zmiany(pelne_sprawdzenie)):
+            znane = len(sledzony.pozycje)
+            stare = [(sledzony.pozycje[nr], row) for nr, row in partia if nr < znane]
+            nowe = [row for nr, row in partia if nr >= znane]
+            # Sprawdzenie przed zmianą magazynu, tak jak przy wczytywaniu plików
+            obecne_id = self._trasy.id.copy()
+            obecne_id[[p for p, _ in stare]] = [int(row['id']) for _, row in stare]
+            self._sprawdz_duplikaty([np.array([int(row['id']) for row in nowe], dtype=obecne_id.dtype)], obecne_id)
+            if stare:
+                pozycje = [p for p, _ in stare]
+                self._indeks.usun(pozycje)
+                if self._indeks_podobienstwa is not None:
+                    self._indeks_podobienstwa.usun(pozycje)
+                self._trasy.zastap_wiersze(pozycje, [row for _, row in stare])
+                self._indeks.dodaj(pozycje)
+                if self._indeks_podobienstwa is not None:
+                    self._indeks_podobienstwa.dodaj(pozycje)
+                zmienione += len(stare)
+            if nowe:
+                baza = len(self._trasy)
+                self._trasy.dodaj_wiersze(nowe)
+                sledzony.pozycje.extend(range(baza, len(self._trasy)))
+                self._indeks.dodaj(np.arange(baza, len(self._trasy)))
+                if self._indeks_podobienstwa is not None:
+                    self._indeks_podobienstwa.dodaj(np.arange(baza, len(self._trasy)))
+                dodane += len(nowe)
+        return dodane, zmienione
+
+    def wczytaj_trasy_partiami(self, sciezka: str, rozmiar_partii: int = ROZMIAR_PARTII) -> Iterator[List[Trasa]]:
+        """
+        Strumieniowo wczytuje trasy z pliku CSV, partia po partii.
+
+        Trasy nie są zapisywane w menedżerze - wywołujący może je
+        przetworzyć lub zagregować na bieżąco.
+
+        Args:
+            sciezka: Ścieżka do pliku CSV z trasami
+            rozmiar_partii: Maksymalna liczba tras w partii
+
+        Returns:
+            Iterator list obiektów Trasa
+        """
+        for partia in czytaj_wiersze_partiami(sciezka, rozmiar_partii):
+            yield [parsuj_trase(row) for row in partia]
+
     def wyszukaj_trasy(self, parametry: Dict[str, Any]) -> List[Trasa]:
         """
         Wyszukuje trasy na podstawie podanych parametrów.
@@ -52,31 +181,38 @@ class MenadzerDanychTras:
                 - max_length: Maksymalna długość trasy (km)
                 - min_difficulty: Minimalna trudność (1-5)
                 - max_difficulty: Maksymalna trudność (1-5)
+                - min_elevation: Minimalne przewyższenie (m)
+                - max_elevation: Maksymalne przewyższenie (m)
                 - region: Region (nazwa lub "wszystkie")
                 
         Returns:
             Lista znalezionych tras spełniających kryteria.
         """
-        wyniki = []
-        
-        for trasa in self._trasy:
-            # Sprawdź długość trasy
-            if 'min_length' in parametry and trasa.dlugosc_km < parametry['min_length']:
-                continue
-            if 'max_length' in parametry and trasa.dlugosc_km > parametry['max_length']:
-                continue
-                
-            # Sprawdź trudność
-            if 'min_difficulty' in parametry and trasa.trudnosc < parametry['min_difficulty']:
-                continue
-            if 'max_difficulty' in parametry and trasa.trudnosc > parametry['max_difficulty']:
-                continue
-                
-            # Sprawdź region
-            if 'region' in parametry and parametry['region'] != 'wszystkie':
-                if trasa.region != parametry['region']:
-                    continue
-            
-            wyniki.append(trasa)
-            
-        return wyniki
\ No newline at end of file
+        return self._trasy.wybierz(self._indeks.zapytanie(parametry))
+
+    def podobne_trasy(self, id_trasy: int, k: int = 5) -> List[Tuple[Trasa, float]]:
+        """
+        Wyszukuje trasy najbardziej podobne do podanej.
+
+        Podobieństwo liczone jest ze standaryzowanych cech: długości,
+        trudności, przewyższenia, średniej oceny, kategorii i regionu
+        (src.data_handlers.indeks_podobienstwa). Indeks budowany jest przy
+        pierwszym wywołaniu i aktualizowany przy przeładowaniu tras.
+
+        Args:
+            id_trasy: Identyfikator trasy wzorcowej
+            k: Maksymalna liczba zwracanych tras
+
+        Returns:
+            Lista krotek (trasa, odległość) od najbardziej podobnej
+
+        Raises:
+            ValueError: Gdy trasa o podanym identyfikatorze nie została wczytana
+        """
+        wiersze = np.flatnonzero(self._trasy.id == id_trasy)
+        if not len(wiersze):
+            raise ValueError(f"Nie znaleziono trasy o id {id_trasy}")
+        if self._indeks_podobienstwa is None:
+            self._indeks_podobienstwa = IndeksPodobienstwaTras(self._trasy)
+        podobne, odleglosci = self._indeks_podobienstwa.podobne(int(wiersze[0]), k)
+        return list(zip(self._trasy.wybierz(podobne), odleglosci.tolist()))
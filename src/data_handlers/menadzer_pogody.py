@@ -1,22 +1,146 @@
-import csv
-from datetime import datetime
-from src.models.dane_pogodowe import DanePogodowe
+import os
+from typing import Dict, Iterator, Optional, Tuple
+import numpy as np
+from src.data_handlers.magazyn_pogody import MagazynPogody
+from src.data_handlers.wczytywanie_csv import (
+    czytaj_pogode_partiami, zastosuj_zmiany_pogody, wczytaj_plik_pogody, ROZMIAR_PARTII
+)
+from src.data_handlers.wczytywanie_rownolegle import pliki_danych, mapuj_rownolegle
+from src.data_handlers.migawka import migawka_aktualna, wczytaj_migawke_pogody, wczytaj_stan_sledzenia
+from src.data_handlers.sledzenie_plikow import SledzonyPlikCSV
+from src.data_handlers.uzupelnianie_luk import MAKS_LUKA, uzupelnij_luki
 
 class MenadzerDanychPogodowych:
-    def wczytaj_dane(self, sciezka: str) -> list[DanePogodowe]:
-        dane = []
-        with open(sciezka, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                date_obj = datetime.strptime(row['date'], '%Y-%m-%d').date()
-                dane.append(DanePogodowe(
-                    data=date_obj,
-                    lokalizacja=row['location_id'],
-                    temp_srednia=float(row['avg_temp']),
-                    temp_min=float(row['min_temp']),
-                    temp_max=float(row['max_temp']),
-                    opady_mm=float(row['precipitation']),
-                    godziny_sloneczne=float(row['sunshine_hours']),
-                    zachmurzenie_pct=float(row['cloud_cover']),
-                ))
-        return dane
\ No newline at end of file
+    def __init__(self, uzupelnianie_luk: Optional[str] = 'liniowa', maks_luka: int = MAKS_LUKA):
+        """
+        Inicjalizuje menedżera danych pogodowych.
+
+        Args:
+            uzupelnianie_luk: Metoda uzupełniania krótkich luk po każdym wczytaniu
+                danych ('liniowa' lub 'sezonowa', src.data_handlers.uzupelnianie_luk);
+                None wyłącza uzupełnianie
+            maks_luka: Najdłuższa uzupełniana luka w dniach
+        """
+        self._dane = MagazynPogody()
+        self._uzupelnianie_luk = uzupelnianie_luk
+        self._maks_luka = maks_luka
+        # ścieżka bezwzględna -> stan śledzenia wczytanego pliku
+        self._sledzone: Dict[str, SledzonyPlikCSV] = {}
+
+    @property
+    def magazyn(self) -> MagazynPogody:
+        """Kolumnowy magazyn wczytanych danych pogodowych."""
+        return self._dane
+
+    def wczytaj_dane(self, sciezka: str, uzyj_migawki: bool = True, procesy: Optional[int] = None) -> MagazynPogody:
+        """
+        Wczytuje dane pogodowe z pliku CSV albo z wielu plików (np. jeden plik na region lub miesiąc).
+
+        Kolumny parsowane są wektorowo (daty jako datetime64[D], pomiary
+        jako float64), a wiele plików - równolegle w puli procesów; pliki
+        dołączane są w kolejności posortowanych ścieżek. Ponowne wczytanie
+        tego samego pliku stosuje jedynie zmiany (jak przeladuj_dane)
+        zamiast dublować rekordy.
+
+        Args:
+            sciezka: Ścieżka do pliku CSV, katalogu z plikami CSV lub wzorzec glob
+            uzyj_migawki: Czy zmapować migawkę binarną (src.data_handlers.migawka),
+                jeśli jest nowsza niż plik CSV
+            procesy: Liczba procesów parsujących pliki (domyślnie liczba rdzeni)
+
+        Returns:
+            Magazyn pogody - sekwencja obiektów DanePogodowe tworzonych przy pierwszym odwołaniu
+        """
+        try:
+            nowe_pliki = []
+            for plik in pliki_danych(sciezka):
+                if os.path.abspath(plik) in self._sledzone:
+                    self.przeladuj_dane(plik)
+                else:
+                    nowe_pliki.append(plik)
+
+            z_migawki = {p for p in nowe_pliki if uzyj_migawki and migawka_aktualna(p)}
+            do_parsowania = [p for p in nowe_pliki if p not in z_migawki]
+            wczytane = dict(zip(do_parsowania, mapuj_rownolegle(wczytaj_plik_pogody, do_parsowania, procesy)))
+            for plik in z_migawki:
+                wczytane[plik] = (wczytaj_migawke_pogody(plik), SledzonyPlikCSV.ze_stanu(plik, wczytaj_stan_sledzenia(plik)))
+
+            for plik in nowe_pliki:
+                magazyn, sledzony = wczytane[plik]
+                baza = len(self._dane)
+                sledzony.przenumeruj_pozycje(self._dane.dolacz(magazyn))
+                self._sledzone[os.path.abspath(plik)] = sledzony
+                self._zglos_powtorzenia(plik, baza)
+            self.uzupelnij_luki()
+            return self._dane
+        except Exception as e:
+            print(f"Wystąpił błąd podczas wczytywania danych pogodowych: {str(e)}")
+            raise
+
+    def uzupelnij_luki(self) -> Tuple[int, int]:
+        """
+        Uzupełnia krótkie luki w danych metodą wybraną w konstruktorze
+        (wywoływane po każdym wczytaniu i przeładowaniu).
+
+        Returns:
+            Krotka (liczba dodanych wierszy, liczba zmienionych wierszy)
+        """
+        if self._uzupelnianie_luk is None:
+            return 0, 0
+        return uzupelnij_luki(self._dane, self._maks_luka, self._uzupelnianie_luk, self._przenumeruj)
+
+    def _przenumeruj(self, numery: np.ndarray) -> None:
+        """Przenumerowuje rekordy śledzonych plików po usunięciu wierszy magazynu."""
+        for sledzony in self._sledzone.values():
+            sledzony.przenumeruj_pozycje(numery)
+
+    def _zglos_powtorzenia(self, plik: str, baza: int) -> None:
+        """Ostrzega, gdy dołączony plik powtarza pary (lokalizacja, data) z wcześniej wczytanych plików."""
+        if not baza:
+            return
+        klucze = self._dane.klucze()
+        powtorzone = np.isin(klucze[baza:], klucze[:baza]).sum()
+        if powtorzone:
+            print(f"Uwaga: {powtorzone} rekordów z pliku {plik} powtarza lokalizację i datę z wcześniej "
+                  f"wczytanych danych - obowiązują rekordy wczytane wcześniej")
+
+    def przeladuj_dane(self, sciezka: str, pelne_sprawdzenie: bool = False) -> Tuple[int, int]:
+        """
+        Przyrostowo przeładowuje wcześniej wczytany plik z danymi pogodowymi.
+
+        Parsowane są tylko wiersze dopisane lub zmienione od ostatniego
+        odczytu (np. godzinowa aktualizacja).
+
+        Args:
+            sciezka: Ścieżka do pliku CSV przekazana wcześniej do wczytaj_dane
+            pelne_sprawdzenie: Porównaj skróty wszystkich wierszy zamiast zakładać,
+                że plik był tylko dopisywany
+
+        Returns:
+            Krotka (liczba dodanych rekordów, liczba zmienionych rekordów)
+        """
+        sledzony = self._sledzone.get(os.path.abspath(sciezka))
+        if sledzony is None:
+            raise ValueError(f"Plik {sciezka} nie został wcześniej wczytany")
+        try:
+            zmiany = zastosuj_zmiany_pogody(self._dane, sledzony, pelne_sprawdzenie)
+            self.uzupelnij_luki()
+            return zmiany
+        except Exception as e:
+            print(f"Wystąpił błąd podczas przeładowania danych pogodowych: {str(e)}")
+            raise
+
+    def wczytaj_dane_partiami(self, sciezka: str, rozmiar_partii: int = ROZMIAR_PARTII) -> Iterator[MagazynPogody]:
+        """
+        Strumieniowo wczytuje dane pogodowe z pliku CSV.
+
+        Partie nie są zapisywane w menedżerze.
+
+        Args:
+            sciezka: Ścieżka do pliku CSV z danymi pogodowymi
+            rozmiar_partii: Maksymalna liczba rekordów w partii
+
+        Returns:
+            Iterator partii - sekwencji obiektów DanePogodowe tworzonych na żądanie
+        """
+        return czytaj_pogode_partiami(sciezka, rozmiar_partii)
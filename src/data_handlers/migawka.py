@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Binarne migawki danych tras i pogody.
+
+Migawka to katalog obok pliku CSV (np. data/trasy/trasy.migawka/) z jednym
+plikiem .npy na kolumnę, tablicą napisów w JSON oraz plikiem meta.json
+zapisywanym na końcu. Loadery korzystają z migawki tylko wtedy, gdy jest
+ona nowsza niż plik CSV. Migawka zawiera też stan SledzonyPlikCSV
+(skróty wierszy i przesunięcie), dzięki czemu po jej wczytaniu można
+przyrostowo przeładowywać plik CSV.
+
+Kompilacja migawek:
+    python -m src.data_handlers.migawka [plik_tras.csv] [plik_pogody.csv]
+"""
+import json
+import os
+import sys
+from typing import Any, Dict
+import numpy as np
+from src.data_handlers.magazyn_tras import MagazynTras
+from src.data_handlers.magazyn_pogody import MagazynPogody
+from src.data_handlers.wczytywanie_csv import wczytaj_plik_tras, wczytaj_plik_pogody
+from src.data_handlers.sledzenie_plikow import SledzonyPlikCSV
+
+# Migawki w innej wersji są pomijane (jak nieaktualne) i budowane od nowa z CSV
+WERSJA_FORMATU = 3
+
+def sciezka_migawki(sciezka_csv: str) -> str:
+    """Zwraca ścieżkę katalogu migawki dla pliku CSV."""
+    return os.path.splitext(sciezka_csv)[0] + '.migawka'
+
+def migawka_aktualna(sciezka_csv: str) -> bool:
+    """Sprawdza, czy dla pliku CSV istnieje kompletna migawka nowsza niż ten plik."""
+    meta = os.path.join(sciezka_migawki(sciezka_csv), 'meta.json')
+    if not os.path.exists(meta):
+        return False
+    with open(meta, encoding='utf-8') as f:
+        if json.load(f).get('wersja') != WERSJA_FORMATU:
+            return False
+    return os.path.getmtime(meta) >= os.path.getmtime(sciezka_csv)
+
+def _zapisz_meta(katalog: str, typ: str, liczba_wierszy: int, sledzony: SledzonyPlikCSV) -> None:
+    stan = sledzony.stan()
+    np.save(os.path.join(katalog, 'hashe.npy'), stan.pop('hashe'))
+    with open(os.path.join(katalog, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({'wersja': WERSJA_FORMATU, 'typ': typ, 'liczba_wierszy': liczba_wierszy, 'sledzenie': stan}, f)
+
+def wczytaj_stan_sledzenia(sciezka_csv: str) -> Dict[str, Any]:
+    """Zwraca stan SledzonyPlikCSV zapisany w migawce (do SledzonyPlikCSV.ze_stanu)."""
+    katalog = sciezka_migawki(sciezka_csv)
+    with open(os.path.join(katalog, 'meta.json'), encoding='utf-8') as f:
+        stan = json.load(f)['sledzenie']
+    stan['hashe'] = np.load(os.path.join(katalog, 'hashe.npy'))
+    return stan
+
+def kompiluj_trasy(sciezka_csv: str) -> str:
+    """
+    Kompiluje plik CSV z trasami do migawki.
+
+    Args:
+        sciezka_csv: Ścieżka do pliku CSV z trasami
+
+    Returns:
+        Ścieżka katalogu migawki
+    """
+    magazyn, sledzony = wczytaj_plik_tras(sciezka_csv)
+    katalog = sciezka_migawki(sciezka_csv)
+    magazyn.zapisz_migawke(katalog)
+    _zapisz_meta(katalog, 'trasy', len(magazyn), sledzony)
+    return katalog
+
+def wczytaj_migawke_tras(sciezka_csv: str, mmap: bool = True) -> MagazynTras:
+    """Wczytuje migawkę tras skompilowaną z podanego pliku CSV."""
+    return MagazynTras.wczytaj_migawke(sciezka_migawki(sciezka_csv), mmap=mmap)
+
+def kompiluj_pogode(sciezka_csv: str) -> str:
+    """
+    Kompiluje plik CSV z danymi pogodowymi do migawki.
+
+    Args:
+        sciezka_csv: Ścieżka do pliku CSV z danymi pogodowymi
+
+    Returns:
+        Ścieżka katalogu migawki
+    """
+    magazyn, sledzony = wczytaj_plik_pogody(sciezka_csv)
+    katalog = sciezka_migawki(sciezka_csv)
+    magazyn.zapisz_migawke(katalog)
+    _zapisz_meta(katalog, 'pogoda', len(magazyn), sledzony)
+    return katalog
+
+def wczytaj_migawke_pogody(sciezka_csv: str, mmap: bool = True) -> MagazynPogody:
+    """Wczytuje migawkę pogody skompilowaną z podanego pliku CSV."""
+    return MagazynPogody.wczytaj_migawke(sciezka_migawki(sciezka_csv), mmap=mmap)
+
+if __name__ == '__main__':
+    sciezka_trasy = sys.argv[1] if len(sys.argv) > 1 else os.path.join('data', 'trasy', 'trasy.csv')
+    sciezka_pogoda = sys.argv[2] if len(sys.argv) > 2 else os.path.join('data', 'pogoda', 'pogoda.csv')
+    print(f"Zapisano migawkę tras: {kompiluj_trasy(sciezka_trasy)}")
+    print(f"Zapisano migawkę pogody: {kompiluj_pogode(sciezka_pogoda)}")
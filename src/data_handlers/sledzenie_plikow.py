@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+import csv
+import os
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+class SledzonyPlikCSV:
+    """
+    Śledzi stan pliku CSV między kolejnymi odczytami.
+
+    Zapamiętuje przesunięcie (w bajtach) za ostatnim przetworzonym pełnym
+    wierszem oraz skrót każdego wiersza. Kolejny odczyt zaczyna od
+    zapamiętanego przesunięcia, jeśli plik był tylko dopisywany (ostatni
+    przeczytany wiersz jest nienaruszony); w przeciwnym razie - lub na
+    żądanie - przegląda plik od początku i porównuje skróty. W obu trybach
+    parsowane są wyłącznie wiersze nowe lub zmienione.
+
+    Plik czytany jest blokami, a skróty wierszy liczone są wektorowo
+    (pandas.util.hash_array), bez pętli po wierszach w Pythonie. Wiersz
+    (rekord CSV) kończy znak nowej linii poza polem w cudzysłowie, więc
+    pola z wieloma liniami tekstu nie rozbijają rekordu.
+    """
+
+    ROZMIAR_BLOKU = 8 * 1024 * 1024
+
+    def __init__(self, sciezka: str):
+        """
+        Args:
+            sciezka: Ścieżka do śledzonego pliku CSV
+        """
+        self.sciezka = sciezka
+        self._naglowek: Optional[List[str]] = None
+        self._offset = 0
+        # liczba wierszy danych zakończonych znakiem nowej linii przed self._offset
+        self._pelne = 0
+        # (początek, skrót) ostatniego przetworzonego wiersza - do wykrycia nadpisania pliku
+        self._ostatni: Tuple[int, int] = (0, 0)
+        self._hashe = np.empty(0, dtype=np.uint64)
+        # numer wiersza w pliku -> numer rekordu w magazynie danych
+        self.pozycje = array('q')
+
+    @property
+    def naglowek(self) -> Optional[List[str]]:
+        """Nazwy kolumn odczytane z pierwszego wiersza pliku."""
+        return self._naglowek
+
+    @staticmethod
+    def _skroty(linie: List[str]) -> np.ndarray:
+        return pd.util.hash_array(np.asarray(linie, dtype=object))
+
+    def stan(self) -> Dict[str, object]:
+        """Zwraca stan śledzenia w postaci nadającej się do zapisu (np. w migawce)."""
+        return {
+            'naglowek': self._naglowek,
+            'offset': self._offset,
+            'pelne': self._pelne,
+            'ostatni': list(self._ostatni),
+            'hashe': self._hashe,
+        }
+
+    @classmethod
+    def ze_stanu(cls, sciezka: str, stan: Dict[str, object], baza: int = 0) -> 'SledzonyPlikCSV':
+        """
+        Odtwarza śledzenie z zapisanego stanu.
+
+        Args:
+            sciezka: Ścieżka do pliku CSV
+            stan: Słownik zwrócony przez stan()
+            baza: Numer rekordu w magazynie odpowiadający pierwszemu wierszowi pliku
+        """
+        sledzony = cls(sciezka)
+        sledzony._naglowek = stan['naglowek']
+        sledzony._offset = stan['offset']
+        sledzony._pelne = stan['pelne']
+        sledzony._ostatni = tuple(stan['ostatni'])
+        sledzony._hashe = np.array(stan['hashe'], dtype=np.uint64)
+        sledzony.pozycje = array('q', range(baza, baza + len(sledzony._hashe)))
+        return sledzony
+
+    def przesun_pozycje(self, baza: int) -> None:
+        """Przesuwa numery rekordów o baza - po dołączeniu wczytanego osobno pliku do większego magazynu."""
+        if baza:
+            self.pozycje = array('q', (np.frombuffer(self.pozycje, dtype=np.int64) + baza).tobytes())
+
+    def przenumeruj_pozycje(self, numery: np.ndarray) -> None:
+        """Zamienia numery rekordów według tablicy stary numer -> nowy (np. wynik MagazynPogody.dolacz)."""
+        nowe = np.asarray(numery, dtype=np.int64)[np.frombuffer(self.pozycje, dtype=np.int64)]
+        self.pozycje = array('q', nowe.tobytes())
+
+    def _tylko_dopisywany(self, f) -> bool:
+        """Sprawdza, czy plik od ostatniego odczytu był co najwyżej dopisywany."""
+        if os.fstat(f.fileno()).st_size < self._offset:
+            return False
+        poczatek, skrot = self._ostatni
+        f.seek(poczatek)
+        linia = f.read(self._offset - poczatek).decode('utf-8').replace('\r\n', '\n').rstrip('\n')
+        return int(self._skroty([linia])[0]) == skrot
+
+    @staticmethod
+    def _konce_wierszy(dane: bytes) -> np.ndarray:
+        """
+        Zwraca pozycje znaków nowej linii kończących rekordy CSV.
+
+        Blok musi zaczynać się na początku rekordu. Nowa linia kończy rekord,
+        jeśli poprzedza ją parzysta liczba cudzysłowów (podwojony cudzysłów
+        w polu nie zmienia parzystości); bajty 0x0A i 0x22 nie występują
+        wewnątrz wielobajtowych znaków UTF-8.
+        """
+        bajty = np.frombuffer(dane, dtype=np.uint8)
+        nowe_linie = np.flatnonzero(bajty == 0x0A)
+        cudzyslowy = bajty == 0x22
+        if not cudzyslowy.any():
+            return nowe_linie
+        # Suma w uint8 przepełnia się co 256, co zachowuje parzystość
+        parzystosc = np.cumsum(cudzyslowy, dtype=np.uint8)[nowe_linie] & 1
+        return nowe_linie[parzystosc == 0]
+
+    def _bloki(self, f) -> Iterator[Tuple[int, bytes, np.ndarray, bool]]:
+        """
+        Zwraca kolejne bloki pliku: (przesunięcie, bajty, pozycje końców rekordów w bloku,
+        czy blok kończy się pełnym rekordem).
+        """
+        offset = f.tell()
+        reszta = b''
+        while True:
+            blok = f.read(self.ROZMIAR_BLOKU)
+            if not blok:
+                break
+            dane = reszta + blok
+            konce = self._konce_wierszy(dane)
+            if not len(konce):
+                reszta = dane
+                continue
+            koniec = int(konce[-1]) + 1
+            yield offset, dane[:koniec], konce, True
+            offset += koniec
+            reszta = dane[koniec:]
+        if reszta:
+            yield offset, reszta, np.empty(0, dtype=np.int64), False
+
+    @staticmethod
+    def _rekordy(dane: bytes, konce: np.ndarray, pelny: bool) -> List[str]:
+        """Dzieli blok na teksty rekordów (bez znaków końca linii) według pozycji ich końców."""
+        if not pelny:
+            return [dane.decode('utf-8').replace('\r\n', '\n')]
+        if len(konce) == dane.count(b'\n'):
+            # Brak nowych linii w polach - podział całego bloku naraz
+            rekordy = dane.decode('utf-8').replace('\r\n', '\n').split('\n')
+            rekordy.pop()
+            return rekordy
+        poczatki = np.concatenate([[0], konce[:-1] + 1]).tolist()
+        return [
+            dane[a:b].decode('utf-8').replace('\r\n', '\n').rstrip('\r')
+            for a, b in zip(poczatki, konce.tolist())
+        ]
+
+    def czytaj_zmienione_linie(self, pelne_sprawdzenie: bool = False) -> Iterator[Tuple[np.ndarray, List[str]]]:
+        """
+        Zwraca, blok po bloku, surowe linie dopisane lub zmienione od poprzedniego odczytu.
+
+        Stan śledzenia aktualizowany jest w trakcie iteracji, dlatego
+        generator należy przeczytać do końca. Ostatni wiersz bez znaku nowej
+        linii (być może jeszcze dopisywany) jest zwracany, ale kolejny odczyt
+        zacznie się od jego początku.
+
+        Args:
+            pelne_sprawdzenie: Porównaj skróty wszystkich wierszy, także gdy plik
+                wygląda na tylko dopisywany (wykrywa zmiany w środku pliku
+                nadpisanego w miejscu)
+
+        Returns:
+            Iterator par (numery wierszy w pliku, linie CSV bez znaków końca linii)
+
+        Raises:
+            ValueError: Gdy z pliku usunięto wiersze (wymagane pełne wczytanie)
+        """
+        with open(self.sciezka, 'rb') as f:
+            if not pelne_sprawdzenie and self._naglowek is not None and self._tylko_dopisywany(f):
+                naglowek = self._naglowek
+                nr = self._pelne
+                f.seek(self._offset)
+            else:
+                naglowek = None
+                nr = 0
+                f.seek(0)
+
+            for offset, dane, konce, pelny in self._bloki(f):
+                surowe = self._rekordy(dane, konce, pelny)
+                if pelny:
+                    poczatek = offset + (int(konce[-2]) + 1 if len(konce) > 1 else 0)
+                    self._ostatni = (poczatek, int(self._skroty(surowe[-1:])[0]))
+                    self._offset = offset + len(dane)
+                linie = [l for l in surowe if l.strip()]
+                if naglowek is None and linie:
+                    naglowek = next(csv.reader([linie.pop(0).lstrip('\ufeff')]))
+                    if naglowek != self._naglowek:
+                        # Zmieniony układ kolumn - wszystkie wiersze traktujemy jako zmienione
+                        self._hashe = np.zeros(len(self._hashe), dtype=np.uint64)
+                    self._naglowek = naglowek
+                if pelny:
+                    self._pelne = nr + len(linie)
+
+                # Porównaj ze skrótami z poprzedniego odczytu
+                skroty = self._skroty(linie)
+                wspolne = max(0, min(len(self._hashe) - nr, len(linie)))
+                zmienione = np.ones(len(linie), dtype=bool)
+                if wspolne:
+                    zmienione[:wspolne] = self._hashe[nr:nr + wspolne] != skroty[:wspolne]
+                    self._hashe[nr:nr + wspolne] = skroty[:wspolne]
+                self._hashe = np.concatenate([self._hashe, skroty[wspolne:]])
+
+                wybrane = np.flatnonzero(zmienione)
+                if len(wybrane):
+                    yield wybrane + nr, [linie[i] for i in wybrane]
+                nr += len(linie)
+
+        if nr < len(self._hashe):
+            liczba = len(self._hashe) - nr
+            self._hashe = self._hashe[:nr]
+            raise ValueError(f"Z pliku {self.sciezka} usunięto {liczba} wierszy - wymagane pełne wczytanie danych")
+
+    def czytaj_zmiany(self, pelne_sprawdzenie: bool = False) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        Zwraca wiersze dopisane lub zmienione od poprzedniego odczytu jako słowniki.
+
+        Args:
+            pelne_sprawdzenie: Jak w czytaj_zmienione_linie
+
+        Returns:
+            Iterator par (numer wiersza w pliku, wiersz jako słownik)
+        """
+        for numery, linie in self.czytaj_zmienione_linie(pelne_sprawdzenie):
+            for nr, wartosci in zip(numery.tolist(), csv.reader(linie)):
+                yield nr, dict(zip(self._naglowek, wartosci))
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Uzupełnianie krótkich luk w dziennych danych pogodowych.
+
+Brak rekordu (lokalizacja, dzień) wyklucza z rekomendacji wszystkie trasy
+regionu, dlatego dni brakujące między dwoma pomiarami tej samej
+lokalizacji (najwyżej MAKS_LUKA dni z rzędu) dopisywane są do magazynu
+jako wiersze oznaczone w MagazynPogody.uzupelnione. Luki na początku
+i końcu danych lokalizacji nie są uzupełniane.
+
+Metody:
+    'liniowa' - interpolacja liniowa między sąsiednimi pomiarami
+    'sezonowa' - średnia lokalizacji w danym miesiącu kalendarzowym plus
+        liniowo interpolowane odchylenie sąsiednich pomiarów od ich
+        średnich miesięcznych
+"""
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
+from src.data_handlers.magazyn_pogody import MagazynPogody, KOLUMNY_POGODY
+
+MAKS_LUKA = 3
+METODY = ('liniowa', 'sezonowa')
+
+def _miesiace(dni: np.ndarray) -> np.ndarray:
+    """Numery miesięcy (0-11) dla numerów dni od 1970-01-01."""
+    return dni.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) % 12
+
+def _srednie_miesieczne(wartosci: np.ndarray, komorki: np.ndarray, liczba_komorek: int) -> np.ndarray:
+    """Średnie wartości w komórkach (lokalizacja, miesiąc) z pominięciem NaN; NaN dla pustych komórek."""
+    znane = ~np.isnan(wartosci)
+    suma = np.bincount(komorki[znane], wartosci[znane], minlength=liczba_komorek)
+    liczba = np.bincount(komorki[znane], minlength=liczba_komorek)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return suma / liczba
+
+def _znajdz(posortowane: np.ndarray, szukane: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Zwraca maskę szukanych kluczy obecnych w posortowanej tablicy i ich pozycje."""
+    if not len(posortowane):
+        return np.zeros(len(szukane), dtype=bool), np.zeros(len(szukane), dtype=np.int64)
+    pozycje = np.minimum(np.searchsorted(posortowane, szukane), len(posortowane) - 1)
+    return posortowane[pozycje] == szukane, pozycje
+
+def _interpoluj(magazyn: MagazynPogody, pomiary: np.ndarray, lewe: np.ndarray, udzial: np.ndarray,
+                komorki_nowych: np.ndarray, metoda: str) -> Dict[str, np.ndarray]:
+    """Wylicza kolumny dni z luk na podstawie pomiarów pomiary[lewe] i pomiary[lewe + 1]."""
+    a, b = pomiary[lewe], pomiary[lewe + 1]
+    if metoda == 'sezonowa':
+        kody = magazyn.lokalizacja_kod[pomiary].astype(np.int64)
+        komorki = kody * 12 + _miesiace(magazyn.data[pomiary].astype(np.int64))
+        liczba_komorek = 12 * len(magazyn.lokalizacje)
+    kolumny = {}
+    for k in KOLUMNY_POGODY:
+        wartosci = magazyn.kolumna(k)
+        liniowa = wartosci[a] + (wartosci[b] - wartosci[a]) * udzial
+        if metoda == 'liniowa':
+            kolumny[k] = liniowa
+            continue
+        srednie = _srednie_miesieczne(wartosci[pomiary], komorki, liczba_komorek)
+        odchylenie_a = wartosci[a] - srednie[komorki[lewe]]
+        odchylenie_b = wartosci[b] - srednie[komorki[lewe + 1]]
+        sezonowa = srednie[komorki_nowych] + odchylenie_a + (odchylenie_b - odchylenie_a) * udzial
+        # Miesiąc bez żadnego pomiaru - zostaje interpolacja liniowa
+        kolumny[k] = np.where(np.isnan(srednie[komorki_nowych]), liniowa, sezonowa)
+    return kolumny
+
+def nieaktualne_uzupelnienia(magazyn: MagazynPogody) -> np.ndarray:
+    """Zwraca wiersze uzupełnione, dla których klucza (lokalizacja, dzień) magazyn ma już pomiar."""
+    klucze = magazyn.klucze()
+    uzupelnione = np.flatnonzero(magazyn.uzupelnione)
+    return uzupelnione[np.isin(klucze[uzupelnione], klucze[~magazyn.uzupelnione])]
+
+def uzupelnij_luki(magazyn: MagazynPogody, maks_luka: int = MAKS_LUKA, metoda: str = 'liniowa',
+                   przenumeruj: Optional[Callable[[np.ndarray], None]] = None) -> Tuple[int, int]:
+    """
+    Uzupełnia krótkie luki w danych wszystkich lokalizacji magazynu.
+
+    Wywołanie jest idempotentne: wiersze uzupełnione wcześniej są
+    przeliczane, gdy zmieniły się sąsiednie pomiary. Pomiar dnia
+    uzupełnionego zastępuje wiersz uzupełniony już przy dopisaniu
+    (MagazynPogody.dodaj_kolumny); wiersze uzupełnione, których dzień
+    otrzymał pomiar inną drogą (np. poprawiony rekord przeniesiony
+    w MagazynPogody.zastap_kolumny na dzień luki), są usuwane przed
+    ponownym uzupełnieniem.
+
+    Args:
+        magazyn: Magazyn pogody
+        maks_luka: Najdłuższa uzupełniana luka (liczba kolejnych brakujących dni)
+        metoda: 'liniowa' lub 'sezonowa'
+        przenumeruj: Wywoływana z tablicą stary numer wiersza -> nowy, gdy usunięto
+            wiersze (MagazynPogody.usun_wiersze), np. do przenumerowania śledzonych plików
+
+    Returns:
+        Krotka (liczba dodanych wierszy, liczba zmienionych wierszy)
+
+    Raises:
+        ValueError: Gdy metoda nie należy do METODY
+    """
+    if metoda not in METODY:
+        raise ValueError(f"Nieznana metoda uzupełniania luk: {metoda}")
+    nieaktualne = nieaktualne_uzupelnienia(magazyn)
+    if len(nieaktualne):
+        numery = magazyn.usun_wiersze(nieaktualne)
+        if przenumeruj is not None:
+            przenumeruj(numery)
+    klucze = magazyn.klucze()
+    uzupelnione = np.flatnonzero(magazyn.uzupelnione)
+    # Pierwszy pomiar każdego klucza; unikalne klucze są posortowane po (lokalizacja, dzień)
+    pomiary = np.flatnonzero(~magazyn.uzupelnione)
+    _, pierwsze = np.unique(klucze[pomiary], return_index=True)
+    pomiary = pomiary[pierwsze]
+    kolumny_magazynu = {k: magazyn.kolumna(k) for k in KOLUMNY_POGODY}
+    nazwy_lokalizacji = np.asarray(magazyn.lokalizacje, dtype=object)
+    zmienione = 0
+
+    # Luki: kolejne pomiary tej samej lokalizacji oddalone o 2..maks_luka + 1 dni
+    kody = magazyn.lokalizacja_kod[pomiary].astype(np.int64)
+    dni = magazyn.data[pomiary].astype(np.int64)
+    odstep = np.diff(dni)
+    luki = np.flatnonzero((kody[1:] == kody[:-1]) & (odstep > 1) & (odstep <= maks_luka + 1))
+    dlugosci = odstep[luki] - 1
+    if not len(luki):
+        return 0, zmienione
+    lewe = np.repeat(luki, dlugosci)
+    krok = np.arange(len(lewe)) - np.repeat(np.cumsum(dlugosci) - dlugosci, dlugosci) + 1
+    nowe_dni = dni[lewe] + krok
+    nowe_kody = kody[lewe]
+    kolumny = _interpoluj(magazyn, pomiary, lewe, krok / odstep[lewe], nowe_kody * 12 + _miesiace(nowe_dni), metoda)
+    nowe_klucze = MagazynPogody.klucz(nowe_kody, nowe_dni)
+    daty = nowe_dni.astype('datetime64[D]')
+    nazwy = nazwy_lokalizacji[nowe_kody]
+
+    # Dni uzupełnione wcześniej - przeliczane tylko przy zmianie wartości
+    klucze_uzupelnionych, pierwsze = np.unique(klucze[uzupelnione], return_index=True)
+    wiersze_uzupelnionych = uzupelnione[pierwsze]
+    istniejace, pozycje = _znajdz(klucze_uzupelnionych, nowe_klucze)
+    wiersze = wiersze_uzupelnionych[pozycje[istniejace]]
+    inne = np.zeros(len(wiersze), dtype=bool)
+    for k in KOLUMNY_POGODY:
+        stare, nowe = kolumny_magazynu[k][wiersze], kolumny[k][istniejace]
+        inne |= ~((stare == nowe) | (np.isnan(stare) & np.isnan(nowe)))
+    if inne.any():
+        wybrane = np.flatnonzero(istniejace)[inne]
+        magazyn.zastap_kolumny(
+            wiersze[inne], daty[wybrane], nazwy[wybrane], {k: v[wybrane] for k, v in kolumny.items()}, uzupelnione=True
+        )
+        zmienione += int(inne.sum())
+
+    dodawane = ~istniejace
+    if dodawane.any():
+        magazyn.dodaj_kolumny(
+            daty[dodawane], nazwy[dodawane], {k: v[dodawane] for k, v in kolumny.items()}, uzupelnione=True
+        )
+    return int(dodawane.sum()), zmienione
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+import csv
+import io
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple, TypeVar
+import numpy as np
+import pandas as pd
+from src.models.dane_pogodowe import DanePogodowe
+from src.models.trasy import Trasa
+from src.data_handlers.magazyn_pogody import MagazynPogody, KOLUMNY_POGODY
+from src.data_handlers.magazyn_tras import MagazynTras
+from src.data_handlers.sledzenie_plikow import SledzonyPlikCSV
+
+ROZMIAR_PARTII = 10_000
+
+T = TypeVar('T')
+
+def partiami(elementy: Iterable[T], rozmiar_partii: int = ROZMIAR_PARTII) -> Iterator[List[T]]:
+    """Dzieli dowolny strumień elementów na listy o długości co najwyżej rozmiar_partii."""
+    if rozmiar_partii < 1:
+        raise ValueError("Rozmiar partii musi być dodatni")
+    iterator = iter(elementy)
+    while True:
+        partia = list(islice(iterator, rozmiar_partii))
+        if not partia:
+            return
+        yield partia
+
+def czytaj_wiersze_partiami(sciezka: str, rozmiar_partii: int = ROZMIAR_PARTII) -> Iterator[List[Dict[str, str]]]:
+    """
+    Czyta plik CSV i zwraca kolejne partie wierszy.
+
+    W pamięci znajduje się naraz co najwyżej jedna partia.
+
+    Args:
+        sciezka: Ścieżka do pliku CSV
+        rozmiar_partii: Maksymalna liczba wierszy w partii
+
+    Returns:
+        Iterator list słowników (jak z csv.DictReader)
+    """
+    with open(sciezka, newline='', encoding='utf-8') as f:
+        yield from partiami(csv.DictReader(f), rozmiar_partii)
+
+def parsuj_trase(row: Dict[str, str]) -> Trasa:
+    """Tworzy obiekt Trasa z wiersza pliku z trasami."""
+    return Trasa(
+        id=int(row['id']),
+        nazwa=row['nazwa'],
+        region=row['region'],
+        dlugosc_km=float(row['dlugosc_km']),
+        czas_przejscia=row['czas_przejscia'],
+        trudnosc=float(row['trudnosc']),
+        przewyzszenie_m=int(row['przewyzszenie_m']),
+        punkt_startowy=row['punkt_startowy'],
+        punkt_koncowy=row['punkt_koncowy'],
+        opis=row['opis'],
+        kategoria=row['kategoria']
+    )
+
+def parsuj_dane_pogodowe(row: Dict[str, str]) -> DanePogodowe:
+    """Tworzy obiekt DanePogodowe z wiersza pliku z danymi pogodowymi."""
+    return DanePogodowe(
+        data=datetime.strptime(row['date'], '%Y-%m-%d').date(),
+        lokalizacja=row['location_id'],
+        temp_srednia=float(row['avg_temp']),
+        temp_min=float(row['min_temp']),
+        temp_max=float(row['max_temp']),
+        opady_mm=float(row['precipitation']),
+        godziny_sloneczne=float(row['sunshine_hours']),
+        zachmurzenie_pct=float(row['cloud_cover'])
+    )
+
+# Wartości liczbowe parsowane dokładnie jak float() - bez utraty ostatniej cyfry
+_OPCJE_CSV_POGODY = {
+    'dtype': {'date': str, 'location_id': str},
+    'float_precision': 'round_trip',
+    'keep_default_na': False,
+}
+
+def kolumny_pogody(ramka: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Zamienia ramkę wczytaną z pliku pogody na kolumny magazynu.
+
+    Returns:
+        Krotka (daty datetime64[D], nazwy lokalizacji, słownik kolumn float64)
+    """
+    daty = ramka['date'].to_numpy(dtype=object).astype('datetime64[D]')
+    kolumny = {k: ramka[pole].to_numpy(dtype=np.float64) for k, pole in KOLUMNY_POGODY.items()}
+    return daty, ramka['location_id'].to_numpy(dtype=object), kolumny
+
+def czytaj_pogode_partiami(sciezka: str, rozmiar_partii: int = ROZMIAR_PARTII) -> Iterator[MagazynPogody]:
+    """
+    Wektorowo czyta plik z danymi pogodowymi i zwraca kolejne partie.
+
+    Args:
+        sciezka: Ścieżka do pliku CSV z danymi pogodowymi
+        rozmiar_partii: Maksymalna liczba rekordów w partii
+
+    Returns:
+        Iterator magazynów pogody (sekwencji obiektów DanePogodowe tworzonych na żądanie)
+    """
+    if rozmiar_partii < 1:
+        raise ValueError("Rozmiar partii musi być dodatni")
+    with pd.read_csv(sciezka, chunksize=rozmiar_partii, encoding='utf-8-sig', **_OPCJE_CSV_POGODY) as czytnik:
+        for ramka in czytnik:
+            partia = MagazynPogody()
+            partia.dodaj_kolumny(*kolumny_pogody(ramka))
+            yield partia
+
+def zastosuj_zmiany_pogody(magazyn: MagazynPogody, sledzony: SledzonyPlikCSV,
+                           pelne_sprawdzenie: bool = False) -> Tuple[int, int]:
+    """
+    Przenosi do magazynu wiersze dopisane lub zmienione w śledzonym pliku pogody.
+
+    Zmienione linie parsowane są blokami jednym wywołaniem pandas.read_csv.
+
+    Args:
+        magazyn: Magazyn, do którego wczytywany jest plik
+        sledzony: Stan śledzenia pliku (pozycje wierszy w magazynie)
+        pelne_sprawdzenie: Jak w SledzonyPlikCSV.czytaj_zmienione_linie
+
+    Returns:
+        Krotka (liczba dodanych rekordów, liczba zmienionych rekordów)
+    """
+    dodane = zmienione = 0
+    for numery, linie in sledzony.czytaj_zmienione_linie(pelne_sprawdzenie):
+        ramka = pd.read_csv(io.StringIO('\n'.join(linie)), header=None, names=sledzony.naglowek,
+                            **_OPCJE_CSV_POGODY)
+        daty, lokalizacje, kolumny = kolumny_pogody(ramka)
+        stare = numery < len(sledzony.pozycje)
+        if stare.any():
+            pozycje = np.frombuffer(sledzony.pozycje, dtype=np.int64)[numery[stare]]
+            magazyn.zastap_kolumny(pozycje, daty[stare], lokalizacje[stare],
+                                   {k: v[stare] for k, v in kolumny.items()})
+            zmienione += int(stare.sum())
+        nowe = ~stare
+        if nowe.any():
+            sledzony.pozycje.extend(magazyn.dodaj_kolumny(
+                daty[nowe], lokalizacje[nowe], {k: v[nowe] for k, v in kolumny.items()}
+            ).tolist())
+            dodane += int(nowe.sum())
+    return dodane, zmienione
+
+def wczytaj_plik_tras(sciezka: str) -> Tuple[MagazynTras, SledzonyPlikCSV]:
+    """
+    Wczytuje jeden plik z trasami do osobnego magazynu.
+
+    Funkcja nadaje się do wywołania w innym procesie (mapuj_rownolegle).
+
+    Returns:
+        Krotka (magazyn tras, stan śledzenia pliku z pozycjami od 0)
+    """
+    magazyn = MagazynTras()
+    sledzony = SledzonyPlikCSV(sciezka)
+    for partia in partiami(sledzony.czytaj_zmiany()):
+        baza = len(magazyn)
+        magazyn.dodaj_wiersze(row for _, row in partia)
+        sledzony.pozycje.extend(range(baza, len(magazyn)))
+    return magazyn, sledzony
+
+def wczytaj_plik_pogody(sciezka: str) -> Tuple[MagazynPogody, SledzonyPlikCSV]:
+    """
+    Wczytuje jeden plik z danymi pogodowymi do osobnego magazynu.
+
+    Funkcja nadaje się do wywołania w innym procesie (mapuj_rownolegle).
+
+    Returns:
+        Krotka (magazyn pogody, stan śledzenia pliku z pozycjami od 0)
+    """
+    magazyn = MagazynPogody()
+    sledzony = SledzonyPlikCSV(sciezka)
+    zastosuj_zmiany_pogody(magazyn, sledzony)
+    return magazyn, sledzony
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Wczytywanie danych podzielonych na wiele plików CSV (np. jeden plik na
+region lub miesiąc). Pliki parsowane są równolegle w puli procesów, a
+wyniki zwracane w stałej, posortowanej kolejności ścieżek - niezależnie
+od tego, który proces skończy pierwszy.
+"""
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+def pliki_danych(sciezka: str) -> List[str]:
+    """
+    Rozwija ścieżkę do listy plików CSV.
+
+    Args:
+        sciezka: Plik CSV, katalog (wszystkie pliki *.csv) lub wzorzec glob
+
+    Returns:
+        Posortowana lista ścieżek plików
+
+    Raises:
+        FileNotFoundError: Gdy katalog lub wzorzec nie wskazuje żadnego pliku
+    """
+    if os.path.isdir(sciezka):
+        pliki = sorted(glob.glob(os.path.join(sciezka, '*.csv')))
+    elif glob.has_magic(sciezka):
+        pliki = sorted(p for p in glob.glob(sciezka) if os.path.isfile(p))
+    else:
+        return [sciezka]
+    if not pliki:
+        raise FileNotFoundError(f"Brak plików CSV dla ścieżki {sciezka}")
+    return pliki
+
+def mapuj_rownolegle(funkcja: Callable[[str], T], pliki: List[str], procesy: Optional[int] = None) -> List[T]:
+    """
+    Wywołuje funkcję dla każdego pliku w puli procesów.
+
+    Args:
+        funkcja: Funkcja modułu (musi dać się przekazać do innego procesu)
+        pliki: Ścieżki plików
+        procesy: Liczba procesów (domyślnie tyle, ile rdzeni, nie więcej niż plików);
+            1 - wczytywanie w bieżącym procesie
+
+    Returns:
+        Wyniki w kolejności listy pliki
+    """
+    procesy = min(procesy or os.cpu_count() or 1, len(pliki))
+    if procesy <= 1:
+        return [funkcja(p) for p in pliki]
+    with ProcessPoolExecutor(max_workers=procesy) as pula:
+        return list(pula.map(funkcja, pliki))
@@ -6,11 +6,20 @@ from src.analyzers.analiza_pogody import AnalizatorPogodowy
 from src.data_handlers.menadzer_danych_tras import MenadzerDanychTras
 from src.data_handlers.route_data_generator import RouteDataGenerator
 from src.reports.chart_generator import ChartGenerator
+from src.recommenders.pamiec_wynikow import PamiecWynikow
 
 class InterfejsUzytkownika:
-    def __init__(self, menadzer_tras: MenadzerDanychTras, analizator_pogodowy: AnalizatorPogodowy):
+    def __init__(self, menadzer_tras: MenadzerDanychTras, analizator_pogodowy: AnalizatorPogodowy,
+                 pamiec: Optional[PamiecWynikow] = None):
         self._menadzer_tras = menadzer_tras
         self._analizator_pogodowy = analizator_pogodowy
+        # Wyniki wyszukiwań unieważniane automatycznie po przeładowaniu tras lub pogody
+        self._pamiec = pamiec if pamiec is not None else PamiecWynikow()
+
+    @property
+    def pamiec(self) -> PamiecWynikow:
+        """Pamięć podręczna wyników wyszukiwania."""
+        return self._pamiec
         
     def generuj_raport(self, trasy: List[Trasa], parametry_wyszukiwania: Dict[str, Any]) -> None:
         """Generuje raport PDF z rekomendacjami tras."""
@@ -82,21 +91,30 @@ class InterfejsUzytkownika:
             print(f"\nWystąpił błąd podczas generowania raportu: {str(e)}")
             raise 
 
+    def _znajdz_trasy(self, parametry: Dict[str, Any]) -> List[Trasa]:
+        """Zwraca trasy spełniające kryteria wyszukiwania, w tym zakres aktualnej temperatury."""
+        # Wyszukaj trasy spełniające kryteria
+        znalezione_trasy = self._menadzer_tras.wyszukaj_trasy(parametry)
+        
+        # Filtruj trasy na podstawie temperatury
+        if 'min_temp' in parametry and 'max_temp' in parametry:
+            aktualne_trasy = []
+            for trasa in znalezione_trasy:
+                dane_pogodowe = self._analizator_pogodowy.pobierz_dane_dla_lokacji(trasa.region)
+                if dane_pogodowe:
+                    if (parametry['min_temp'] <= dane_pogodowe.temp_srednia <= parametry['max_temp']):
+                        aktualne_trasy.append(trasa)
+            znalezione_trasy = aktualne_trasy
+        return znalezione_trasy
+
     def wyszukaj_trasy(self, parametry: Dict[str, Any]) -> List[Trasa]:
-        """Wyszukuje trasy na podstawie podanych parametrów."""
+        """Wyszukuje trasy na podstawie podanych parametrów (wyniki zapamiętywane w pamięci podręcznej)."""
         try:
-            # Wyszukaj trasy spełniające kryteria
-            znalezione_trasy = self._menadzer_tras.wyszukaj_trasy(parametry)
-            
-            # Filtruj trasy na podstawie temperatury
-            if 'min_temp' in parametry and 'max_temp' in parametry:
-                aktualne_trasy = []
-                for trasa in znalezione_trasy:
-                    dane_pogodowe = self._analizator_pogodowy.pobierz_dane_dla_lokacji(trasa.region)
-                    if dane_pogodowe:
-                        if (parametry['min_temp'] <= dane_pogodowe.temp_srednia <= parametry['max_temp']):
-                            aktualne_trasy.append(trasa)
-                znalezione_trasy = aktualne_trasy
+            klucz = ('wyszukaj_trasy', tuple(sorted(parametry.items())))
+            wersja = (self._menadzer_tras.magazyn.wersja, self._analizator_pogodowy.magazyn.wersja)
+            znalezione_trasy = list(self._pamiec.pobierz_lub_oblicz(
+                klucz, wersja, lambda: self._znajdz_trasy(parametry)
+            ))
             
             if not znalezione_trasy:
                 print("\nNie znaleziono tras spełniających podane kryteria.")
@@ -0,0 +1,420 @@
+# -*- coding: utf-8 -*-
+"""
+Serwer HTTP/JSON rekomendacji tras (asyncio, bez zależności zewnętrznych).
+
+Dane tras i pogody wczytywane są raz, przy starcie. Ocena tras wykonywana
+jest w puli wątków roboczych (operacje NumPy zwalniają GIL), dzięki czemu
+pętla zdarzeń obsługuje kolejne połączenia. Identyczne zapytania
+obsługiwane w tym samym czasie są scalane - wynik liczony jest raz.
+
+Punkty końcowe:
+    GET  /zdrowie        - stan serwera i liczba wczytanych danych
+    GET  /statystyki     - liczniki zapytań, scaleń i pamięci wyników
+    POST /wyszukaj       - parametry jak MenadzerDanychTras.wyszukaj_trasy
+                           (opcjonalnie min_temp/max_temp)
+    POST /rekomendacje   - {"data": "RRRR-MM-DD", "preferencje": {...}, "top_k": 10}
+
+Uruchomienie z katalogu projektu:
+    python -m src.interface.serwer_rekomendacji --port 8080
+"""
+import argparse
+import asyncio
+import json
+import os
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from src.analyzers.analiza_pogody import AnalizatorPogodowy
+from src.data_handlers.menadzer_danych_tras import MenadzerDanychTras
+from src.models.dane_pogodowe import DanePogodowe
+from src.models.preferencje import PreferencjeUzytkownika
+from src.models.trasy import Trasa
+from src.recommenders.pamiec_wynikow import PamiecWynikow
+from src.recommenders.rekomendator_tras import RekomendatorTras
+
+# Maksymalny rozmiar treści zapytania (bajty)
+MAKS_ROZMIAR_TRESCI = 1_000_000
+
+# Liczbowe parametry /wyszukaj (granice zakresów)
+_GRANICE_WYSZUKIWANIA = ('min_length', 'max_length', 'min_difficulty', 'max_difficulty',
+                         'min_elevation', 'max_elevation', 'min_temp', 'max_temp')
+
+_STATUSY = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+async def _zamknij(writer: asyncio.StreamWriter) -> None:
+    """Zamyka połączenie i czeka na jego zamknięcie (zerwane przez drugą stronę jest pomijane)."""
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except ConnectionError:
+        pass
+
+class BladZapytania(Exception):
+    """Błąd zapytania klienta zwracany jako odpowiedź JSON z danym statusem HTTP."""
+
+    def __init__(self, status: int, komunikat: str):
+        super().__init__(komunikat)
+        self.status = status
+
+def trasa_json(trasa: Trasa) -> Dict[str, Any]:
+    """Zamienia trasę na słownik JSON."""
+    return {
+        'id': trasa.id,
+        'nazwa': trasa.nazwa,
+        'region': trasa.region,
+        'dlugosc_km': trasa.dlugosc_km,
+        'trudnosc': trasa.trudnosc,
+        'przewyzszenie_m': trasa.przewyzszenie_m,
+        'kategoria': trasa.kategoria,
+    }
+
+def pogoda_json(dane: DanePogodowe) -> Dict[str, Any]:
+    """Zamienia rekord pogodowy na słownik JSON."""
+    return {
+        'data': dane.data.isoformat(),
+        'lokalizacja': dane.lokalizacja,
+        'temp_srednia': dane.temp_srednia,
+        'opady_mm': dane.opady_mm,
+        'zachmurzenie_pct': dane.zachmurzenie_pct,
+        'indeks_komfortu': dane.oblicz_indeks_komfortu(),
+    }
+
+def preferencje_z_json(dane: Dict[str, Any]) -> PreferencjeUzytkownika:
+    """
+    Tworzy preferencje użytkownika ze słownika JSON.
+
+    Raises:
+        BladZapytania: Gdy brakuje wymaganego pola lub ma ono zły typ
+    """
+    try:
+        return PreferencjeUzytkownika(
+            temp_pref=tuple(float(t) for t in dane.get('temp_pref', (10, 25))),
+            max_opady_mm=float(dane['max_opady_mm']),
+            max_trudnosc=int(dane['max_trudnosc']),
+            max_dlugosc_km=float(dane['max_dlugosc_km']),
+            wagi={k: float(v) for k, v in dane['wagi'].items()} if dane.get('wagi') else None,
+        )
+    except KeyError as e:
+        raise BladZapytania(400, f"Brak pola preferencji: {e.args[0]}")
+    except (TypeError, ValueError, AttributeError) as e:
+        raise BladZapytania(400, f"Niepoprawne preferencje: {str(e)}")
+
+def parametry_wyszukiwania_z_json(dane: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Sprawdza parametry wyszukiwania tras ze słownika JSON i zamienia granice zakresów na liczby.
+
+    Raises:
+        BladZapytania: Gdy granica zakresu nie jest liczbą, region nie jest napisem
+            lub parametr nie jest wartością prostą
+    """
+    parametry = dict(dane)
+    for klucz in _GRANICE_WYSZUKIWANIA:
+        if klucz not in parametry:
+            continue
+        wartosc = parametry[klucz]
+        try:
+            if isinstance(wartosc, bool):
+                raise TypeError
+            parametry[klucz] = float(wartosc)
+        except (TypeError, ValueError):
+            raise BladZapytania(400, f"Parametr {klucz} musi być liczbą")
+    if not isinstance(parametry.get('region', 'wszystkie'), str):
+        raise BladZapytania(400, "Parametr region musi być napisem")
+    return parametry
+
+class SerwerRekomendacji:
+    def __init__(self, menadzer_tras: MenadzerDanychTras, analizator_pogodowy: AnalizatorPogodowy,
+                 pamiec: Optional[PamiecWynikow] = None, watki: Optional[int] = None):
+        """
+        Inicjalizuje serwer nad wczytanymi danymi.
+
+        Args:
+            menadzer_tras: Menedżer z wczytanymi trasami
+            analizator_pogodowy: Analizator z wczytanymi danymi pogodowymi
+            pamiec: Pamięć wyników (domyślnie nowa PamiecWynikow)
+            watki: Liczba wątków oceniających zapytania (domyślnie jak ThreadPoolExecutor)
+        """
+        self._menadzer_tras = menadzer_tras
+        self._analizator_pogodowy = analizator_pogodowy
+        self._pamiec = pamiec if pamiec is not None else PamiecWynikow()
+        self._pula = ThreadPoolExecutor(max_workers=watki, thread_name_prefix='ocena')
+        # klucz zapytania -> zadanie liczące odpowiedź (scalanie identycznych zapytań w toku)
+        self._w_toku: Dict[Hashable, asyncio.Future] = {}
+        self._zapytania = 0
+        self._obliczenia = 0
+        self._scalone = 0
+
+    @classmethod
+    def z_plikow(cls, sciezka_trasy: str, sciezka_pogoda: str, **kwargs) -> 'SerwerRekomendacji':
+        """Wczytuje trasy i dane pogodowe (pliki, katalogi lub wzorce glob) i tworzy serwer."""
+        menadzer_tras = MenadzerDanychTras()
+        menadzer_tras.wczytaj_trasy(sciezka_trasy)
+        analizator = AnalizatorPogodowy()
+        analizator.wczytaj_dane(sciezka_pogoda)
+        return cls(menadzer_tras, analizator, **kwargs)
+
+    async def uruchom(self, host: str = '127.0.0.1', port: int = 8080) -> asyncio.AbstractServer:
+        """
+        Zaczyna nasłuchiwać połączeń.
+
+        Args:
+            host: Adres nasłuchu
+            port: Port (0 - dowolny wolny port)
+
+        Returns:
+            Serwer asyncio (adres: serwer.sockets[0].getsockname())
+        """
+        return await asyncio.start_server(self._obsluz_polaczenie, host, port)
+
+    def zamknij(self) -> None:
+        """Zamyka pulę wątków roboczych."""
+        self._pula.shutdown(wait=False)
+
+    def statystyki(self) -> Dict[str, Any]:
+        """Zwraca liczniki zapytań, obliczeń, scalonych zapytań i pamięci wyników."""
+        return {
+            'zapytania': self._zapytania,
+            'obliczenia': self._obliczenia,
+            'scalone': self._scalone,
+            'w_toku': len(self._w_toku),
+            'pamiec': self._pamiec.statystyki(),
+        }
+
+    async def _obsluz_polaczenie(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Obsługuje kolejne zapytania HTTP/1.1 jednego połączenia."""
+        try:
+            while True:
+                zapytanie = await self._czytaj_zapytanie(reader)
+                if zapytanie is None:
+                    break
+                metoda, sciezka, naglowki, tresc = zapytanie
+                status, odpowiedz = await self._odpowiedz(metoda, sciezka, tresc)
+                zamknij = naglowki.get('connection', '').lower() == 'close'
+                writer.write(
+                    f"HTTP/1.1 {status} {_STATUSY[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(odpowiedz)}\r\n"
+                    f"Connection: {'close' if zamknij else 'keep-alive'}\r\n\r\n".encode('ascii') + odpowiedz
+                )
+                await writer.drain()
+                if zamknij:
+                    break
+        except BladZapytania as e:
+            odpowiedz = json.dumps({'blad': str(e)}, ensure_ascii=False).encode('utf-8')
+            writer.write(
+                f"HTTP/1.1 {e.status} {_STATUSY[e.status]}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(odpowiedz)}\r\nConnection: close\r\n\r\n".encode('ascii') + odpowiedz
+            )
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            await _zamknij(writer)
+
+    @staticmethod
+    async def _czytaj_zapytanie(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        """Czyta jedno zapytanie HTTP; None, gdy klient zamknął połączenie."""
+        linia = await reader.readline()
+        if not linia.strip():
+            return None
+        try:
+            metoda, sciezka, _ = linia.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise BladZapytania(400, "Niepoprawny wiersz zapytania HTTP")
+        naglowki = {}
+        while True:
+            linia = await reader.readline()
+            if linia in (b'\r\n', b'\n', b''):
+                break
+            nazwa, _, wartosc = linia.decode('latin-1').partition(':')
+            naglowki[nazwa.strip().lower()] = wartosc.strip()
+        try:
+            dlugosc = int(naglowki.get('content-length', 0))
+        except ValueError:
+            raise BladZapytania(400, "Niepoprawny nagłówek Content-Length")
+        if dlugosc < 0:
+            raise BladZapytania(400, "Niepoprawny nagłówek Content-Length")
+        if dlugosc > MAKS_ROZMIAR_TRESCI:
+            raise BladZapytania(413, "Zbyt duża treść zapytania")
+        tresc = await reader.readexactly(dlugosc) if dlugosc else b''
+        return metoda.upper(), sciezka.split('?', 1)[0], naglowki, tresc
+
+    async def _odpowiedz(self, metoda: str, sciezka: str, tresc: bytes) -> Tuple[int, bytes]:
+        """Wybiera obsługę zapytania i zwraca (status HTTP, treść JSON)."""
+        self._zapytania += 1
+        obslugi = {
+            '/zdrowie': ('GET', None),
+            '/statystyki': ('GET', None),
+            '/wyszukaj': ('POST', self._wyszukaj),
+            '/rekomendacje': ('POST', self._rekomendacje),
+        }
+        try:
+            if sciezka not in obslugi:
+                raise BladZapytania(404, f"Nieznany adres: {sciezka}")
+            oczekiwana, obsluga = obslugi[sciezka]
+            if metoda != oczekiwana:
+                raise BladZapytania(405, f"Adres {sciezka} obsługuje tylko {oczekiwana}")
+            if obsluga is None:
+                return 200, self._json(self._zdrowie() if sciezka == '/zdrowie' else self.statystyki())
+            try:
+                dane = json.loads(tresc or b'{}')
+            except ValueError:
+                raise BladZapytania(400, "Treść zapytania nie jest poprawnym JSON")
+            if not isinstance(dane, dict):
+                raise BladZapytania(400, "Treść zapytania musi być obiektem JSON")
+            klucz, funkcja = obsluga(dane)
+            return 200, await self._wspolnie(klucz, funkcja)
+        except BladZapytania as e:
+            return e.status, self._json({'blad': str(e)})
+        except Exception as e:
+            print(f"Wystąpił błąd podczas obsługi zapytania {sciezka}: {str(e)}")
+            return 500, self._json({'blad': 'Wewnętrzny błąd serwera'})
+
+    async def _wspolnie(self, klucz: Hashable, funkcja: Callable[[], bytes]) -> bytes:
+        """
+        Liczy odpowiedź w puli wątków; identyczne zapytania w toku czekają na to samo zadanie.
+
+        Odłączenie się jednego klienta (anulowanie) nie przerywa obliczenia pozostałym.
+        """
+        zadanie = self._w_toku.get(klucz)
+        if zadanie is None:
+            self._obliczenia += 1
+            zadanie = asyncio.get_running_loop().run_in_executor(self._pula, funkcja)
+            self._w_toku[klucz] = zadanie
+            zadanie.add_done_callback(lambda _: self._w_toku.pop(klucz, None))
+        else:
+            self._scalone += 1
+        return await asyncio.shield(zadanie)
+
+    def _zdrowie(self) -> Dict[str, Any]:
+        return {
+            'status': 'ok',
+            'trasy': len(self._menadzer_tras.magazyn),
+            'rekordy_pogody': len(self._analizator_pogodowy.magazyn),
+        }
+
+    def _wersja_danych(self) -> Tuple[int, int]:
+        """Wersja (tras, pogody) wczytanych danych - część kluczy scalania i pamięci wyników."""
+        return self._menadzer_tras.magazyn.wersja, self._analizator_pogodowy.magazyn.wersja
+
+    def _wyszukaj(self, parametry: Dict[str, Any]) -> Tuple[Hashable, Callable[[], bytes]]:
+        """Zwraca klucz i funkcję liczącą odpowiedź wyszukiwania tras."""
+        parametry = parametry_wyszukiwania_z_json(parametry)
+        try:
+            klucz = ('wyszukaj', tuple(sorted(parametry.items())))
+            hash(klucz)
+        except TypeError:
+            raise BladZapytania(400, "Parametry wyszukiwania muszą być wartościami prostymi")
+
+        def oblicz() -> bytes:
+            trasy = self._pamiec.pobierz_lub_oblicz(klucz, self._wersja_danych(), lambda: self._znajdz_trasy(parametry))
+            return self._json({'trasy': [trasa_json(t) for t in trasy]})
+
+        # Zapytanie po przeładowaniu danych nie dołącza do obliczenia na starych danych
+        return klucz + (self._wersja_danych(),), oblicz
+
+    def _znajdz_trasy(self, parametry: Dict[str, Any]) -> List[Trasa]:
+        """Wyszukuje trasy jak InterfejsUzytkownika.wyszukaj_trasy (bez wydruku i raportu)."""
+        trasy = self._menadzer_tras.wyszukaj_trasy(parametry)
+        if 'min_temp' in parametry and 'max_temp' in parametry:
+            aktualne_trasy = []
+            for trasa in trasy:
+                dane_pogodowe = self._analizator_pogodowy.pobierz_dane_dla_lokacji(trasa.region)
+                if dane_pogodowe and parametry['min_temp'] <= dane_pogodowe.temp_srednia <= parametry['max_temp']:
+                    aktualne_trasy.append(trasa)
+            trasy = aktualne_trasy
+        return trasy
+
+    def _rekomendacje(self, dane: Dict[str, Any]) -> Tuple[Hashable, Callable[[], bytes]]:
+        """Zwraca klucz i funkcję liczącą odpowiedź z rekomendacjami."""
+        if 'data' not in dane:
+            raise BladZapytania(400, "Brak pola: data")
+        pref = preferencje_z_json(dane.get('preferencje') or {})
+        top_k = dane.get('top_k')
+        if top_k is not None and (not isinstance(top_k, int) or isinstance(top_k, bool) or top_k < 1):
+            raise BladZapytania(400, "top_k musi być dodatnią liczbą całkowitą")
+        data = str(dane['data'])
+        try:
+            datetime.strptime(data, '%Y-%m-%d')
+        except ValueError:
+            raise BladZapytania(400, f"Niepoprawna data: {data} (oczekiwano RRRR-MM-DD)")
+
+        def oblicz() -> bytes:
+            rekomendator = RekomendatorTras(
+                self._menadzer_tras.magazyn, self._analizator_pogodowy.magazyn, pref,
+                self._analizator_pogodowy.indeks, pamiec=self._pamiec,
+                lokalizacja_pogody=self._analizator_pogodowy.lokalizacja_pogody
+            )
+            rekomendacje = rekomendator.generuj_rekomendacje(data, top_k)
+            return self._json({'rekomendacje': [
+                {'trasa': trasa_json(r['trasa']), 'pogoda': pogoda_json(r['dane_pogodowe']), 'score': r['score']}
+                for r in rekomendacje
+            ]})
+
+        return ('rekomendacje', pref.klucz(), data, top_k, self._wersja_danych()), oblicz
+
+    @staticmethod
+    def _json(dane: Any) -> bytes:
+        return json.dumps(dane, ensure_ascii=False).encode('utf-8')
+
+async def zapytanie(host: str, port: int, metoda: str, sciezka: str,
+                    dane: Optional[Dict[str, Any]] = None) -> Tuple[int, Any]:
+    """
+    Lokalny klient: wysyła jedno zapytanie JSON do serwera i zwraca (status, odpowiedź).
+
+    Args:
+        host: Adres serwera
+        port: Port serwera
+        metoda: 'GET' lub 'POST'
+        sciezka: Adres punktu końcowego (np. '/rekomendacje')
+        dane: Treść zapytania (słownik JSON)
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        tresc = json.dumps(dane).encode('utf-8') if dane is not None else b''
+        writer.write(
+            f"{metoda} {sciezka} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(tresc)}\r\nConnection: close\r\n\r\n".encode('ascii') + tresc
+        )
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        dlugosc = 0
+        while True:
+            linia = await reader.readline()
+            if linia in (b'\r\n', b''):
+                break
+            nazwa, _, wartosc = linia.decode('latin-1').partition(':')
+            if nazwa.strip().lower() == 'content-length':
+                dlugosc = int(wartosc)
+        return status, json.loads(await reader.readexactly(dlugosc))
+    finally:
+        await _zamknij(writer)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Wczytuje dane i uruchamia serwer do przerwania (Ctrl+C)."""
+    projekt_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser = argparse.ArgumentParser(description='Serwer HTTP/JSON rekomendacji tras')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--trasy', default=os.path.join(projekt_dir, 'data', 'trasy', 'trasy.csv'))
+    parser.add_argument('--pogoda', default=os.path.join(projekt_dir, 'data', 'pogoda', 'pogoda.csv'))
+    parser.add_argument('--watki', type=int, default=None, help='liczba wątków oceniających zapytania')
+    args = parser.parse_args(argv)
+
+    serwer = SerwerRekomendacji.z_plikow(args.trasy, args.pogoda, watki=args.watki)
+
+    async def uruchom():
+        nasluch = await serwer.uruchom(args.host, args.port)
+        print(f"Serwer rekomendacji nasłuchuje na http://{args.host}:{nasluch.sockets[0].getsockname()[1]}")
+        async with nasluch:
+            await nasluch.serve_forever()
+
+    try:
+        asyncio.run(uruchom())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        serwer.zamknij()
+
+if __name__ == '__main__':
+    main()
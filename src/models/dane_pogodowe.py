@@ -1,6 +1,55 @@
 from datetime import date
+from typing import Dict, Optional
+import sys
+import numpy as np
+
+# Wagi składowych indeksu komfortu: temp 60%, opady 30%, chmury 10%
+WAGI_KOMFORTU: Dict[str, float] = {'temp': 0.6, 'opady': 0.3, 'zachmurzenie': 0.1}
+
+def indeks_komfortu(temp_srednia, opady_mm, zachmurzenie_pct, wagi: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Wektorowo oblicza indeks komfortu (0-100) dla tablic pomiarów.
+
+    Przy domyślnych wagach wynik jest identyczny co do bitu z
+    DanePogodowe.oblicz_indeks_komfortu - operacje wykonywane są w tej samej
+    kolejności, a max/min Pythona odwzorowane przez np.where.
+
+    Args:
+        temp_srednia: Średnie temperatury (°C)
+        opady_mm: Opady (mm)
+        zachmurzenie_pct: Zachmurzenie (%)
+        wagi: Wagi składowych 'temp', 'opady' i 'zachmurzenie' (domyślnie WAGI_KOMFORTU)
+
+    Returns:
+        Tablica float64 indeksów komfortu
+    """
+    wagi = WAGI_KOMFORTU if wagi is None else wagi
+    temp_srednia, opady_mm, zachmurzenie_pct = (
+        np.asarray(temp_srednia, dtype=np.float64), np.asarray(opady_mm, dtype=np.float64),
+        np.asarray(zachmurzenie_pct, dtype=np.float64)
+    )
+    temp_score = 100 - np.abs(temp_srednia - 20) * 3
+    temp_score = np.where(temp_score > 0, temp_score, 0)
+    rain_penalty = opady_mm * 2
+    rain_score = 100 - np.where(rain_penalty > 100, 100, rain_penalty)
+    cloud_score = 100 - zachmurzenie_pct
+    indeks = temp_score * wagi['temp'] + rain_score * wagi['opady'] + cloud_score * wagi['zachmurzenie']
+    indeks = np.where(indeks < 100, indeks, 100)
+    return np.where(indeks > 0, indeks, 0).astype(np.float64)
 
 class DanePogodowe:
+    """
+    Dzienny rekord pogodowy lokalizacji.
+
+    Pola są tylko do odczytu - indeks komfortu liczony jest raz, przy
+    tworzeniu rekordu, i nie może rozejść się z pomiarami.
+    """
+
+    __slots__ = (
+        '_data', '_lokalizacja', '_temp_srednia', '_temp_min', '_temp_max',
+        '_opady_mm', '_godziny_sloneczne', '_zachmurzenie_pct', '_indeks_komfortu',
+    )
+
     def __init__(
         self,
         data: date,
@@ -11,15 +60,52 @@ class DanePogodowe:
         opady_mm: float,
         godziny_sloneczne: float,
         zachmurzenie_pct: float,
+        indeks_komfortu: Optional[float] = None,
     ):
-        self.data = data
-        self.lokalizacja = lokalizacja
-        self.temp_srednia = temp_srednia
-        self.temp_min = temp_min
-        self.temp_max = temp_max
-        self.opady_mm = opady_mm
-        self.godziny_sloneczne = godziny_sloneczne
-        self.zachmurzenie_pct = zachmurzenie_pct
+        self._data = data
+        self._lokalizacja = sys.intern(str(lokalizacja))
+        self._temp_srednia = temp_srednia
+        self._temp_min = temp_min
+        self._temp_max = temp_max
+        self._opady_mm = opady_mm
+        self._godziny_sloneczne = godziny_sloneczne
+        self._zachmurzenie_pct = zachmurzenie_pct
+        # Indeks liczony raz - z kolumny magazynu pogody albo przy tworzeniu rekordu
+        self._indeks_komfortu = float(
+            indeks_komfortu if indeks_komfortu is not None else self._oblicz_komfort()
+        )
+
+    @property
+    def data(self) -> date:
+        return self._data
+
+    @property
+    def lokalizacja(self) -> str:
+        return self._lokalizacja
+
+    @property
+    def temp_srednia(self) -> float:
+        return self._temp_srednia
+
+    @property
+    def temp_min(self) -> float:
+        return self._temp_min
+
+    @property
+    def temp_max(self) -> float:
+        return self._temp_max
+
+    @property
+    def opady_mm(self) -> float:
+        return self._opady_mm
+
+    @property
+    def godziny_sloneczne(self) -> float:
+        return self._godziny_sloneczne
+
+    @property
+    def zachmurzenie_pct(self) -> float:
+        return self._zachmurzenie_pct
 
     def czy_sloneczny(self) -> bool:
         return self.godziny_sloneczne > (24 - self.zachmurzenie_pct/100*24)
@@ -28,6 +114,10 @@ class DanePogodowe:
         return self.opady_mm > 0
 
     def oblicz_indeks_komfortu(self) -> float:
+        """Zwraca indeks komfortu (0-100) wyliczony przy wczytaniu rekordu."""
+        return self._indeks_komfortu
+
+    def _oblicz_komfort(self) -> float:
         # Temperatury: optymalne 20°C, spadek 3 punkty za 1°C odchylenia
         temp_score = max(0, 100 - abs(self.temp_srednia - 20) * 3)
         # Opady: kara 2 punkty za każdy mm (maksymalnie 100)
@@ -35,6 +125,6 @@ class DanePogodowe:
         rain_score = 100 - rain_penalty
         # Zachmurzenie: odwrotny udział zachmurzenia
         cloud_score = 100 - self.zachmurzenie_pct
-        # Wagi: temp 60%, opady 30%, chmury 10%
-        indeks = temp_score * 0.6 + rain_score * 0.3 + cloud_score * 0.1
+        indeks = (temp_score * WAGI_KOMFORTU['temp'] + rain_score * WAGI_KOMFORTU['opady']
+                  + cloud_score * WAGI_KOMFORTU['zachmurzenie'])
         return max(0, min(100, indeks))
\ No newline at end of file
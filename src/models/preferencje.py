@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Hashable, Tuple
 from src.models.dane_pogodowe import DanePogodowe
 
 class PreferencjeUzytkownika:
@@ -17,6 +17,22 @@ class PreferencjeUzytkownika:
         # wagi: {"pogoda":..., "trudnosc":...}
         self.wagi = wagi or {"pogoda": 0.6, "trudnosc": 0.4}
 
+    def klucz(self) -> Hashable:
+        """
+        Znormalizowany klucz preferencji (np. dla pamięci podręcznej wyników).
+
+        Preferencje dające te same oceny mają ten sam klucz - brakujące wagi
+        zastępowane są wartościami domyślnymi, a liczby sprowadzane do float.
+        """
+        return (
+            tuple(float(t) for t in self.temp_pref),
+            float(self.max_opady_mm),
+            float(self.max_trudnosc),
+            float(self.max_dlugosc_km),
+            float(self.wagi.get("pogoda", 0.5)),
+            float(self.wagi.get("trudnosc", 0.5)),
+        )
+
     def zgodnosc_z_trasa(self, trasa) -> float:
         # Ocena trudności i długości (0-1)
         diff_score = max(0, 1 - (trasa.trudnosc / self.max_trudnosc))
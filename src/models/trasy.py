@@ -1,9 +1,29 @@
 from typing import List, Optional, Dict, Any
 from datetime import timedelta
 import re
+import sys
 from src.data_handlers.route_rating_manager import RouteRatingManager
 
+# Znacznik pola jeszcze niesparsowanego (None to poprawny wynik parsowania)
+_NIESPARSOWANE = object()
+
 class Trasa:
+    """
+    Trasa turystyczna.
+
+    Czas przejścia przechowywany jest w postaci tekstowej z pliku CSV i
+    parsowany dopiero przy pierwszym odwołaniu; podobnie dane wyliczane
+    z opisu trasy. Trasy odrzucone przez filtry nie ponoszą tego kosztu.
+    """
+
+    __slots__ = (
+        '_id', '_nazwa', '_region', '_dlugosc_km', '_czas_przejscia_tekst', '_czas_przejscia', '_trudnosc',
+        '_przewyzszenie_m', '_punkt_startowy', '_punkt_koncowy', '_opis', '_kategoria', '_widokowa',
+    )
+
+    # Jeden menedżer ocen współdzielony przez wszystkie trasy
+    _rating_manager = RouteRatingManager()
+
     def __init__(
         self,
         id: int,
@@ -20,16 +40,17 @@ class Trasa:
     ):
         self._id = id
         self._nazwa = nazwa
-        self._region = region
+        self._region = sys.intern(str(region))
         self._dlugosc_km = dlugosc_km
-        self._czas_przejscia = self._parsuj_czas(czas_przejscia)
+        self._czas_przejscia_tekst = czas_przejscia
+        self._czas_przejscia = _NIESPARSOWANE
         self._trudnosc = trudnosc
         self._przewyzszenie_m = przewyzszenie_m
         self._punkt_startowy = punkt_startowy
         self._punkt_koncowy = punkt_koncowy
         self._opis = opis
-        self._kategoria = kategoria
-        self._rating_manager = RouteRatingManager()
+        self._kategoria = sys.intern(str(kategoria))
+        self._widokowa = None
 
     def _parsuj_czas(self, czas_str: str) -> Optional[timedelta]:
         """Parsuje string z czasem przejścia na obiekt timedelta."""
@@ -64,8 +85,18 @@ class Trasa:
 
     @property
     def czas_przejscia(self) -> Optional[timedelta]:
+        if self._czas_przejscia is _NIESPARSOWANE:
+            self._czas_przejscia = self._parsuj_czas(self._czas_przejscia_tekst)
         return self._czas_przejscia
 
+    @property
+    def widokowa(self) -> bool:
+        """Czy opis trasy wskazuje na walory widokowe (wyliczane przy pierwszym odwołaniu)."""
+        if self._widokowa is None:
+            opis = self._opis.lower()
+            self._widokowa = any(slowo in opis for slowo in ["widok", "panoram", "jezior"])
+        return self._widokowa
+
     @property
     def trudnosc(self) -> float:
         return self._trudnosc
@@ -100,8 +131,8 @@ class Trasa:
         return self._rating_manager.get_route_reviews(self._id)
 
     def szacuj_czas_przejscia(self, predkosci_terenowe: dict) -> float:
-        if self._czas_przejscia:
-            return self._czas_przejscia.total_seconds() / 3600  # Konwersja na godziny
+        if self.czas_przejscia:
+            return self.czas_przejscia.total_seconds() / 3600  # Konwersja na godziny
             
         # Jeśli brak zdefiniowanego czasu, oblicz szacunkowo
         predkosc = predkosci_terenowe.get(self._kategoria, 4.0)  # km/h domyślnie 4 km/h
@@ -120,7 +151,7 @@ class Trasa:
             kategorie.append("Rodzinne")
             
         # Widokowe: jeśli w opisie są odpowiednie słowa kluczowe
-        if any(slowo in self._opis.lower() for slowo in ["widok", "panoram", "jezior"]):
+        if self.widokowa:
             kategorie.append("Widokowe")
             
         # Sportowe: trudność >=3 lub długość >=20km
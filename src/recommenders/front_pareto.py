@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Front Pareto (skyline) zbioru punktów metodą sort-filter-skyline.
+
+Punkt a dominuje punkt b, gdy w żadnym kryterium nie jest gorszy, a w
+co najmniej jednym jest lepszy (wszystkie kryteria są minimalizowane).
+Punkty sortowane są według sumy znormalizowanych kryteriów, więc punkt
+nie może być zdominowany przez punkt późniejszy - wystarczy porównywać
+punkty kolejno przyjmowane do frontu z punktami, które po nich
+pozostały. Koszt jest rzędu (liczba punktów) x (rozmiar frontu), a front
+jest zwykle o rzędy wielkości mniejszy niż liczba punktów.
+"""
+import numpy as np
+
+# Liczba punktów przyjmowanych naraz do frontu
+ROZMIAR_BLOKU = 1024
+# Maksymalna liczba par (punkt, punkt frontu) porównywanych naraz
+ROZMIAR_POROWNANIA = 1 << 20
+
+def _zdominowane(punkty: np.ndarray, front: np.ndarray) -> np.ndarray:
+    """Zwraca maskę punktów zdominowanych przez którykolwiek punkt frontu."""
+    wynik = np.zeros(len(punkty), dtype=bool)
+    if not len(front):
+        return wynik
+    krok = max(1, ROZMIAR_POROWNANIA // len(front))
+    for od in range(0, len(punkty), krok):
+        czesc = punkty[od:od + krok]
+        # Macierze (punkty, front) budowane kryterium po kryterium - redukcja po
+        # krótkiej osi kryteriów tablicy trójwymiarowej jest w NumPy wolna
+        nie_gorsze = front[:, 0] <= czesc[:, 0, None]
+        rowne = front[:, 0] == czesc[:, 0, None]
+        for j in range(1, punkty.shape[1]):
+            nie_gorsze &= front[:, j] <= czesc[:, j, None]
+            rowne &= front[:, j] == czesc[:, j, None]
+        wynik[od:od + krok] = (nie_gorsze & ~rowne).any(axis=1)
+    return wynik
+
+def front_pareto(kryteria: np.ndarray) -> np.ndarray:
+    """
+    Wyznacza punkty niezdominowane.
+
+    Args:
+        kryteria: Macierz (liczba punktów, liczba kryteriów); mniejsze wartości
+            są lepsze. Wartości NaN nie są dozwolone.
+
+    Returns:
+        Rosnąco posortowane indeksy punktów należących do frontu Pareto
+        (punkty o identycznych kryteriach nie dominują się nawzajem)
+
+    Raises:
+        ValueError: Gdy macierz zawiera wartości NaN
+    """
+    kryteria = np.asarray(kryteria, dtype=np.float64)
+    if kryteria.ndim != 2:
+        raise ValueError("Kryteria muszą być macierzą (punkty, kryteria)")
+    if np.isnan(kryteria).any():
+        raise ValueError("Kryteria nie mogą zawierać wartości NaN")
+    if not len(kryteria):
+        return np.empty(0, dtype=np.int64)
+
+    # Suma znormalizowanych kryteriów jest monotoniczna względem dominacji
+    # (także po zaokrągleniach), remisy rozstrzyga porządek leksykograficzny
+    najmniejsze = kryteria.min(axis=0)
+    zakres = kryteria.max(axis=0) - najmniejsze
+    suma = ((kryteria - najmniejsze) / np.where(zakres > 0, zakres, 1)).sum(axis=1)
+    kolejnosc = np.lexsort((*kryteria.T[::-1], suma))
+
+    indeksy = []
+    pozostale = kolejnosc
+    while len(pozostale):
+        blok, pozostale = pozostale[:ROZMIAR_BLOKU], pozostale[ROZMIAR_BLOKU:]
+        punkty = kryteria[blok]
+        # Punkty bloku nie są zdominowane przez wcześniejsze bloki (odsiane niżej),
+        # a wewnątrz bloku punkt może zdominować tylko punkt późniejszy
+        niezdominowane = ~_zdominowane(punkty, punkty)
+        blok, punkty = blok[niezdominowane], punkty[niezdominowane]
+        indeksy.append(blok)
+        # Nowe punkty frontu od razu odsiewają wszystkie pozostałe punkty
+        pozostale = pozostale[~_zdominowane(kryteria[pozostale], punkty)]
+    return np.sort(np.concatenate(indeksy))
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Wektorowe odpowiedniki wzorów oceny z PreferencjeUzytkownika i Trasa.
+
+Indeks komfortu pogody liczony jest przy wczytaniu danych
+(src.models.dane_pogodowe.indeks_komfortu, kolumna MagazynPogody).
+
+Każda funkcja wykonuje te same operacje zmiennoprzecinkowe w tej samej
+kolejności co wersja skalarna, więc wyniki są identyczne co do bitu.
+Wbudowane max/min Pythona odwzorowane są przez np.where, bo inaczej niż
+np.maximum/np.minimum nie propagują wartości NaN.
+"""
+from typing import Sequence
+import numpy as np
+from src.models.preferencje import PreferencjeUzytkownika
+
+class PreferencjeWsadowe:
+    """
+    Preferencje wielu użytkowników zebrane w kolumny o kształcie (liczba użytkowników, 1).
+
+    Ma te same atrybuty co PreferencjeUzytkownika, więc można ją przekazać
+    do funkcji tego modułu - wyniki rozgłaszane są wtedy na macierz
+    użytkownicy x trasy (lub użytkownicy x regiony).
+    """
+
+    def __init__(self, preferencje: Sequence[PreferencjeUzytkownika]):
+        def kolumna(wartosci):
+            return np.array(list(wartosci), dtype=np.float64).reshape(-1, 1)
+
+        self.max_opady_mm = kolumna(p.max_opady_mm for p in preferencje)
+        self.max_trudnosc = kolumna(p.max_trudnosc for p in preferencje)
+        self.max_dlugosc_km = kolumna(p.max_dlugosc_km for p in preferencje)
+        self.wagi = {
+            'pogoda': kolumna(p.wagi.get('pogoda', 0.5) for p in preferencje),
+            'trudnosc': kolumna(p.wagi.get('trudnosc', 0.5) for p in preferencje),
+        }
+
+def _max(a, b):
+    # max(a, b) z Pythona: b tylko wtedy, gdy b > a
+    return np.where(b > a, b, a)
+
+def _min(a, b):
+    # min(a, b) z Pythona: b tylko wtedy, gdy b < a
+    return np.where(b < a, b, a)
+
+def zgodnosc_z_pogoda(pref: PreferencjeUzytkownika, opady_mm: np.ndarray, komfort: np.ndarray) -> np.ndarray:
+    """Wektorowa wersja PreferencjeUzytkownika.zgodnosc_z_pogoda dla gotowego indeksu komfortu."""
+    return np.where(opady_mm > pref.max_opady_mm, 0.0, komfort / 100.0)
+
+def zgodnosc_z_trasa(pref: PreferencjeUzytkownika, trudnosc: np.ndarray, dlugosc_km: np.ndarray) -> np.ndarray:
+    """Wektorowa wersja PreferencjeUzytkownika.zgodnosc_z_trasa."""
+    diff_score = _max(0, 1 - (trudnosc / pref.max_trudnosc))
+    length_score = _max(0, 1 - (dlugosc_km / pref.max_dlugosc_km))
+    w = pref.wagi.get("trudnosc", 0.5)
+    return diff_score * w + length_score * (1 - w)
+
+def wynik_laczny(pref: PreferencjeUzytkownika, pogoda_score: np.ndarray, trasa_score: np.ndarray) -> np.ndarray:
+    """Ważona suma ocen pogody i trasy jak w RekomendatorTras."""
+    return pogoda_score * pref.wagi.get('pogoda', 0.5) + trasa_score * pref.wagi.get('trudnosc', 0.5)
+
+def dopasowane_do_preferencji(pref: PreferencjeUzytkownika, trudnosc: np.ndarray, dlugosc_km: np.ndarray) -> np.ndarray:
+    """Wektorowa wersja Trasa.dopasowana_do_preferencji."""
+    return (trudnosc <= pref.max_trudnosc) & (dlugosc_km <= pref.max_dlugosc_km)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+from src.config import RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL_S
+
+T = TypeVar('T')
+
+class PamiecWynikow:
+    """
+    Pamięć podręczna wyników wyszukiwania i rekomendacji (LRU z czasem ważności).
+
+    Każdy wpis pamięta wersję danych, z których go wyliczono (np. wersje
+    magazynów tras i pogody). Wpis z inną wersją niż bieżąca jest
+    unieważniany przy odczycie, więc przeładowanie danych nie wymaga
+    jawnego czyszczenia pamięci.
+    """
+
+    def __init__(self, max_wpisow: int = RESULT_CACHE_MAX_ENTRIES,
+                 czas_waznosci_s: Optional[float] = RESULT_CACHE_TTL_S,
+                 zegar: Callable[[], float] = time.monotonic):
+        """
+        Inicjalizuje pustą pamięć.
+
+        Args:
+            max_wpisow: Maksymalna liczba wpisów; najdawniej używane są usuwane
+            czas_waznosci_s: Czas ważności wpisu w sekundach (None - bez limitu)
+            zegar: Źródło czasu (sekundy)
+        """
+        if max_wpisow < 1:
+            raise ValueError("max_wpisow musi być dodatnie")
+        self._max_wpisow = max_wpisow
+        self._czas_waznosci_s = czas_waznosci_s
+        self._zegar = zegar
+        # klucz -> (wersja danych, czas zapisu, wynik)
+        self._wpisy: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._blokada = threading.Lock()
+        self._trafienia = 0
+        self._chybienia = 0
+        self._uniewaznione = 0
+
+    def pobierz_lub_oblicz(self, klucz: Hashable, wersja: Hashable, oblicz: Callable[[], T]) -> T:
+        """
+        Zwraca zapamiętany wynik albo oblicza go i zapamiętuje.
+
+        Args:
+            klucz: Znormalizowany klucz zapytania
+            wersja: Wersja danych, na których opiera się wynik
+            oblicz: Funkcja wyliczająca wynik przy braku ważnego wpisu
+
+        Returns:
+            Wynik zapytania (ten sam obiekt przy kolejnych trafieniach)
+        """
+        with self._blokada:
+            wpis = self._wpisy.get(klucz)
+            if wpis is not None:
+                wersja_wpisu, czas, wynik = wpis
+                if wersja_wpisu == wersja and not self._przeterminowany(czas):
+                    self._wpisy.move_to_end(klucz)
+                    self._trafienia += 1
+                    return wynik
+                del self._wpisy[klucz]
+                self._uniewaznione += 1
+            self._chybienia += 1
+
+        # Obliczenie poza blokadą - równoległe chybienia tego samego klucza liczą wynik niezależnie
+        wynik = oblicz()
+        with self._blokada:
+            self._wpisy[klucz] = (wersja, self._zegar(), wynik)
+            self._wpisy.move_to_end(klucz)
+            while len(self._wpisy) > self._max_wpisow:
+                self._wpisy.popitem(last=False)
+        return wynik
+
+    def _przeterminowany(self, czas: float) -> bool:
+        return self._czas_waznosci_s is not None and self._zegar() - czas > self._czas_waznosci_s
+
+    def wyczysc(self) -> None:
+        """Usuwa wszystkie wpisy (liczniki pozostają)."""
+        with self._blokada:
+            self._uniewaznione += len(self._wpisy)
+            self._wpisy.clear()
+
+    @property
+    def trafienia(self) -> int:
+        """Liczba zapytań obsłużonych z pamięci."""
+        return self._trafienia
+
+    @property
+    def chybienia(self) -> int:
+        """Liczba zapytań, dla których wynik trzeba było obliczyć."""
+        return self._chybienia
+
+    def statystyki(self) -> Dict[str, Any]:
+        """Zwraca liczniki trafień, chybień i unieważnień oraz liczbę wpisów."""
+        with self._blokada:
+            zapytania = self._trafienia + self._chybienia
+            return {
+                'trafienia': self._trafienia,
+                'chybienia': self._chybienia,
+                'uniewaznione': self._uniewaznione,
+                'wpisy': len(self._wpisy),
+                'skutecznosc': self._trafienia / zapytania if zapytania else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._wpisy)
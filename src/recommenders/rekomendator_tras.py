@@ -1,42 +1,523 @@
-from datetime import datetime
+from collections import OrderedDict
+from datetime import date, datetime
+import heapq
+import itertools
+import threading
+from src.config import REGION_COORDINATES
 from src.models.preferencje import PreferencjeUzytkownika
 from src.models.trasy import Trasa
 from src.models.dane_pogodowe import DanePogodowe
+from src.data_handlers.indeks_pogody import IndeksPogody
+from src.data_handlers.indeks_stacji import StacjeMagazynu
+from src.data_handlers.magazyn_tras import MagazynTras
+from src.data_handlers.magazyn_pogody import KOLUMNA_KOMFORTU
+from src.recommenders import ocena_wektorowa
+from src.recommenders.front_pareto import front_pareto
+from src.recommenders.pamiec_wynikow import PamiecWynikow
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+class _StanTopK:
+    """
+    Ranking tras w regionach dla jednego klucza preferencji i wersji tras
+    wraz z partycjami wyników (region, dzień) - patrz RekomendatorTras._stan_top_k.
+    """
+    __slots__ = ('ranking', 'partycje', 'blokada')
+
+    def __init__(self, ranking: Tuple[List[str], List[Tuple[np.ndarray, np.ndarray]]]):
+        self.ranking = ranking
+        # dzień -> partycje wyników (region, dzień) i scalone listy k najlepszych - patrz _najlepsze_k
+        self.partycje: 'OrderedDict[date, Dict[str, Dict]]' = OrderedDict()
+        # Stan może być współdzielony przez rekomendatory w różnych wątkach
+        self.blokada = threading.Lock()
 
 class RekomendatorTras:
+    # Maksymalna liczba elementów macierzy użytkownicy x trasy liczonej naraz (mieści się w pamięci podręcznej)
+    ROZMIAR_MACIERZY_WSADOWEJ = 1_000_000
+    # Liczba ostatnio ocenianych dni, dla których pamiętane są partycje wyników (region, dzień)
+    PARTYCJE_DNI = 32
+
     def __init__(
         self,
         trasy: list[Trasa],
         pogoda: list[DanePogodowe],
         pref: PreferencjeUzytkownika,
+        indeks_pogody: Optional[IndeksPogody] = None,
+        pamiec: Optional[PamiecWynikow] = None,
+        lokalizacja_pogody: Optional[Callable[[str], Optional[str]]] = None,
     ):
         self._trasy = trasy
         self._pogoda = pogoda
         self._pref = pref
+        # Wspólny indeks (np. AnalizatorPogodowy.indeks) albo zbudowany z listy rekordów
+        self._indeks_pogody = indeks_pogody if indeks_pogody is not None else IndeksPogody(pogoda)
+        # (klucz preferencji i wersji tras, ranking i partycje wyników) bez pamięci wyników - patrz _stan_top_k
+        self._stan: Optional[Tuple[Hashable, _StanTopK]] = None
+        # Pamięć wyników współdzielona między rekomendatorami (np. kolejnych zapytań)
+        self._pamiec = pamiec
+        # Region trasy -> lokalizacja w danych pogodowych (np. AnalizatorPogodowy.lokalizacja_pogody);
+        # domyślnie najbliższa stacja z danymi według config.REGION_COORDINATES
+        self._lokalizacja_pogody = lokalizacja_pogody if lokalizacja_pogody is not None else \
+            StacjeMagazynu(self._indeks_pogody.magazyn, REGION_COORDINATES)
+
+    def _kolumny_tras(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+        """Zwraca (trudność, długość, kod regionu, nazwy regionów) ocenianych tras."""
+        if isinstance(self._trasy, MagazynTras):
+            return self._trasy.trudnosc, self._trasy.dlugosc_km, self._trasy.region_kod, self._trasy.regiony
+        trudnosc = np.array([t.trudnosc for t in self._trasy], dtype=np.float64)
+        dlugosc = np.array([t.dlugosc_km for t in self._trasy], dtype=np.float64)
+        kody, regiony = pd.factorize(np.array([t.region for t in self._trasy], dtype=object))
+        return trudnosc, dlugosc, kody, list(regiony)
+
+    def _przewyzszenie_tras(self) -> np.ndarray:
+        """Zwraca przewyższenie (m) ocenianych tras."""
+        if isinstance(self._trasy, MagazynTras):
+            return self._trasy.przewyzszenie_m
+        return np.array([t.przewyzszenie_m for t in self._trasy], dtype=np.int64)
+
+    def _pogoda_regionow(self, regiony: List[str], dni: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Pobiera pogodę i indeks komfortu dla każdej pary (region, dzień) - niezależne od preferencji.
+
+        Returns:
+            Krotka (wiersze magazynu pogody lub -1, opady, indeks komfortu) o kształcie
+            (liczba regionów, liczba dni)
+        """
+        magazyn = self._indeks_pogody.magazyn
+        regiony = [self._lokalizacja_pogody(r) or r for r in regiony]
+        wiersze_regionow = self._indeks_pogody.pozycje(regiony, dni)
+        wiersze = np.where(wiersze_regionow >= 0, wiersze_regionow, 0)
+        opady = magazyn.kolumna('opady_mm')[wiersze]
+        komfort = magazyn.kolumna(KOLUMNA_KOMFORTU)[wiersze]
+        return wiersze_regionow, opady, komfort
+
+    def _ocen_pogode(self, regiony: List[str], dni: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ocenia pogodę raz dla każdej pary (region, dzień).
+
+        Returns:
+            Krotka (wiersze magazynu pogody, ocena pogody) o kształcie (liczba regionów,
+            liczba dni); wiersz -1 oznacza brak danych lub zerową ocenę pogody
+        """
+        wiersze_regionow, opady, komfort = self._pogoda_regionow(regiony, dni)
+        pogoda_score = ocena_wektorowa.zgodnosc_z_pogoda(self._pref, opady, komfort)
+        # Trasy z zerową oceną pogody są pomijane
+        return np.where(pogoda_score != 0, wiersze_regionow, -1), pogoda_score
+
+    def _stan_top_k(self) -> _StanTopK:
+        """
+        Zwraca ranking tras (_zbuduj_ranking) i partycje wyników dla bieżących preferencji i wersji tras.
+
+        Ranking nie zależy od daty, więc jest zapamiętywany do zmiany preferencji lub
+        wersji magazynu tras; dla tras podanych listą (bez wersji) nie jest zapamiętywany.
+
+        Z pamięcią wyników stan przechowywany jest w niej pod kluczem części
+        preferencji, od których zależy ranking, i wersją magazynu tras - kolejne
+        rekomendatory (np. jeden na zapytanie serwera) korzystają z tych samych
+        partycji. Pogoda nie należy do wersji: partycje same wykrywają zmianę
+        pogody regionu.
+        """
+        if not isinstance(self._trasy, MagazynTras):
+            # Zmian listy tras nie da się wykryć - stan liczony od nowa przy każdym zapytaniu
+            return _StanTopK(self._zbuduj_ranking())
+        klucz = ('ranking_tras', self._pref.max_trudnosc, self._pref.max_dlugosc_km,
+                 tuple(sorted(self._pref.wagi.items())))
+        if self._pamiec is not None:
+            return self._pamiec.pobierz_lub_oblicz(klucz, self._trasy.wersja, lambda: _StanTopK(self._zbuduj_ranking()))
+        if self._stan is None or self._stan[0] != (klucz, self._trasy.wersja):
+            self._stan = ((klucz, self._trasy.wersja), _StanTopK(self._zbuduj_ranking()))
+        return self._stan[1]
+
+    def _zbuduj_ranking(self) -> Tuple[List[str], List[Tuple[np.ndarray, np.ndarray]]]:
+        """
+        Grupuje trasy spełniające preferencje po regionie i porządkuje je
+        malejąco według wkładu trasy do wyniku (zgodnosc_z_trasa * waga).
+
+        Returns:
+            Krotka (nazwy regionów, lista par (numery tras, wkłady) indeksowana kodem regionu)
+        """
+        trudnosc, dlugosc, region_kod, regiony = self._kolumny_tras()
+        trasy = np.flatnonzero(ocena_wektorowa.dopasowane_do_preferencji(self._pref, trudnosc, dlugosc))
+        wklad = ocena_wektorowa.zgodnosc_z_trasa(self._pref, trudnosc[trasy], dlugosc[trasy]) * \
+            self._pref.wagi.get('trudnosc', 0.5)
+        kody = region_kod[trasy]
+        # Region, potem malejący wkład, przy remisie kolejność tras
+        kolejnosc = np.lexsort((trasy, -wklad, kody))
+        granice = np.searchsorted(kody[kolejnosc], np.arange(len(regiony) + 1))
+        grupy = [
+            (trasy[kolejnosc[od:do]], wklad[kolejnosc[od:do]])
+            for od, do in zip(granice[:-1], granice[1:])
+        ]
+        return list(regiony), grupy
+
+    def _partycje_dnia(self, wszystkie: 'OrderedDict[date, Dict[str, Dict]]', dzien: date) -> Dict[str, Dict]:
+        """Zwraca partycje wyników danego dnia; pamiętane są partycje najwyżej PARTYCJE_DNI ostatnich dni."""
+        partycje = wszystkie.get(dzien)
+        if partycje is None:
+            # 'regiony': kod regionu -> partycja, 'najlepsze': k -> (stan pogody regionów, wynik)
+            partycje = wszystkie[dzien] = {'regiony': {}, 'najlepsze': {}}
+            while len(wszystkie) > self.PARTYCJE_DNI:
+                wszystkie.popitem(last=False)
+        else:
+            wszystkie.move_to_end(dzien)
+        return partycje
+
+    @staticmethod
+    def _partycja(partycje: Dict[int, tuple], grupa: Tuple[np.ndarray, np.ndarray], kod: int,
+                  stan: Tuple[int, float], k: int, w_pogoda: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Zwraca k najlepszych tras regionu i ich wyniki (malejąco, remisy według numeru trasy).
+
+        Partycja (region, dzień) liczona jest ponownie tylko wtedy, gdy zmienił
+        się stan pogody regionu w tym dniu (wiersz magazynu lub ocena pogody)
+        albo potrzeba więcej niż k zapamiętanych tras. Wynik trasy to ocena
+        pogody * waga + wkład trasy, więc w rankingu regionu wyniki nie rosną
+        i wystarczy ocenić jego początek (z remisami na granicy k).
+        """
+        trasy, wklad = grupa
+        czesc = partycje.get(kod)
+        if czesc is not None and czesc[0] == stan and (len(czesc[1]) >= k or len(czesc[1]) == len(trasy)):
+            return czesc[1][:k], czesc[2][:k]
+
+        pogoda = stan[1]
+        koniec = min(k, len(trasy))
+        wyniki = pogoda * w_pogoda + wklad[:koniec]
+        # Trasy za granicą z wynikiem równym k-temu mogą wyprzedzić je numerem
+        while koniec < len(trasy):
+            dalej = pogoda * w_pogoda + wklad[koniec:koniec + k]
+            remisy = int(np.count_nonzero(dalej >= wyniki[-1]))
+            wyniki = np.concatenate([wyniki, dalej[:remisy]])
+            koniec += remisy
+            if remisy < len(dalej):
+                break
+        kolejnosc = np.lexsort((trasy[:koniec], -wyniki))[:k]
+        partycje[kod] = (stan, trasy[:koniec][kolejnosc], wyniki[kolejnosc])
+        return partycje[kod][1], partycje[kod][2]
+
+    def _najlepsze_k(self, target_date: date, k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Wybiera k najlepszych tras, scalając k najlepszych tras każdego regionu.
+
+        Po zmianie pogody jednego regionu w danym dniu ponownie oceniane są
+        tylko trasy tego regionu; zapamiętane listy pozostałych regionów
+        scalane są kopcem w czasie O(k log k). Bez zmian pogody zwracany jest
+        zapamiętany wynik.
+
+        Wynik pierwszej trasy w rankingu regionu jest górnym ograniczeniem
+        wyników regionu. Regiony przeglądane są od najwyższego ograniczenia;
+        regiony z ograniczeniem poniżej k-tego dotąd wyniku są pomijane bez
+        liczenia partycji (istotne przy pierwszym zapytaniu dnia i wielu regionach).
+        """
+        stan_top_k = self._stan_top_k()
+        regiony, grupy = stan_top_k.ranking
+        wiersze_regionow, pogoda_score = self._ocen_pogode(regiony, np.array([target_date], dtype='datetime64[D]'))
+        stany = [
+            (kod, (wiersz, pogoda))
+            for kod, (wiersz, pogoda) in enumerate(zip(wiersze_regionow[:, 0].tolist(), pogoda_score[:, 0].tolist()))
+            if wiersz >= 0 and len(grupy[kod][0])
+        ]
+        w_pogoda = self._pref.wagi.get('pogoda', 0.5)
+        ograniczenia = sorted(
+            ((pogoda * w_pogoda + float(grupy[kod][1][0]), kod, (wiersz, pogoda)) for kod, (wiersz, pogoda) in stany),
+            key=lambda o: o[0], reverse=True
+        )
+        with stan_top_k.blokada:
+            partycje = self._partycje_dnia(stan_top_k.partycje, target_date)
+            zapamietane = partycje['najlepsze'].get(k)
+            if zapamietane is not None and zapamietane[0] == stany:
+                return zapamietane[1]
+
+            # Kopiec minimalny k najlepszych dotąd wyników: na szczycie k-ty wynik
+            kopiec: List[float] = []
+            strumienie = []
+            for ograniczenie, kod, stan in ograniczenia:
+                if len(kopiec) == k and ograniczenie < kopiec[0]:
+                    break
+                trasy, wyniki = self._partycja(partycje['regiony'], grupy[kod], kod, stan, k, w_pogoda)
+                for w in wyniki.tolist():
+                    if len(kopiec) < k:
+                        heapq.heappush(kopiec, w)
+                    elif w > kopiec[0]:
+                        heapq.heapreplace(kopiec, w)
+                    else:
+                        break
+                strumienie.append(zip((-wyniki).tolist(), trasy.tolist(), itertools.repeat(stan[0])))
+            najlepsze = list(itertools.islice(heapq.merge(*strumienie), k))
+            wynik = (
+                np.array([i for _, i, _ in najlepsze], dtype=np.int64),
+                np.array([w for _, _, w in najlepsze], dtype=np.int64),
+                np.array([-s for s, _, _ in najlepsze], dtype=np.float64),
+            )
+            partycje['najlepsze'][k] = (stany, wynik)
+            return wynik
+
+    def _ocen_dni(self, dni: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Ocenia trasy spełniające preferencje na każdy z podanych dni w jednym przebiegu.
+
+        Ocena pogody liczona jest raz dla każdej pary (region, dzień) i
+        rozgłaszana na trasy regionu. Wynik jest identyczny co do bitu z oceną
+        trasa po trasie (PreferencjeUzytkownika.zgodnosc_z_trasa, zgodnosc_z_pogoda).
+
+        Args:
+            dni: Tablica dni (datetime64[D])
+
+        Returns:
+            Krotka (numery tras, wiersze magazynu pogody, wyniki); dwie ostatnie
+            o kształcie (liczba tras, liczba dni). Brak danych pogodowych lub zerowa
+            ocena pogody oznaczane są wierszem -1 i wynikiem NaN.
+        """
+        trudnosc, dlugosc, region_kod, regiony = self._kolumny_tras()
+        wiersze_regionow, pogoda_score = self._ocen_pogode(regiony, dni)
+
+        trasy = np.flatnonzero(ocena_wektorowa.dopasowane_do_preferencji(self._pref, trudnosc, dlugosc))
+        kody = region_kod[trasy]
+        trasa_score = ocena_wektorowa.zgodnosc_z_trasa(self._pref, trudnosc[trasy], dlugosc[trasy])
+        wiersze_pogody = wiersze_regionow[kody]
+        wyniki = ocena_wektorowa.wynik_laczny(self._pref, pogoda_score[kody], trasa_score[:, None])
+        wyniki[wiersze_pogody < 0] = np.nan
+        return trasy, wiersze_pogody, wyniki
+
+    def ocen(self, target_date: date, top_k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Ocenia wszystkie trasy na dany dzień w jednym przebiegu tablicowym.
+
+        Args:
+            target_date: Dzień wycieczki
+            top_k: Zwróć tylko k najlepszych tras (scalanie zapamiętanych list
+                k najlepszych tras regionów, patrz _najlepsze_k)
+
+        Returns:
+            Krotka (numery tras, numery wierszy magazynu pogody, wyniki) dla tras
+            spełniających preferencje, posortowana malejąco po wyniku
+            (przy remisie - w kolejności tras)
+        """
+        if top_k is not None:
+            if top_k < 1:
+                raise ValueError("top_k musi być dodatnie")
+            return self._najlepsze_k(target_date, top_k)
+        trasy, wiersze_pogody, wyniki = self._ocen_dni(np.array([target_date], dtype='datetime64[D]'))
+        ocenione = wiersze_pogody[:, 0] >= 0
+        trasy, wiersze_pogody, wyniki = trasy[ocenione], wiersze_pogody[ocenione, 0], wyniki[ocenione, 0]
+        kolejnosc = np.argsort(-wyniki, kind='stable')
+        return trasy[kolejnosc], wiersze_pogody[kolejnosc], wyniki[kolejnosc]
+
+    def rekomendacje_dla_zakresu(self, data_od: str, data_do: str) -> Dict[str, Any]:
+        """
+        Wybiera dla każdej trasy najlepszy dzień z zakresu dat.
 
-    def generuj_rekomendacje(self, data: str) -> list[dict]:
+        Args:
+            data_od: Pierwszy dzień zakresu (RRRR-MM-DD)
+            data_do: Ostatni dzień zakresu, włącznie (RRRR-MM-DD)
+
+        Returns:
+            Słownik:
+                - 'daty': lista dni zakresu
+                - 'macierz': tablica wyników o kształcie (liczba tras, liczba dni),
+                  NaN gdy trasa nie jest rekomendowana danego dnia
+                - 'najlepsze': lista słowników {'trasa', 'data', 'dane_pogodowe', 'score'}
+                  dla tras z co najmniej jednym ocenionym dniem, posortowana malejąco
+                  po wyniku (przy remisie wybierany jest wcześniejszy dzień)
+        """
+        od = datetime.strptime(data_od, '%Y-%m-%d').date()
+        do = datetime.strptime(data_do, '%Y-%m-%d').date()
+        if do < od:
+            raise ValueError(f"Koniec zakresu {data_do} jest wcześniejszy niż początek {data_od}")
+        dni = np.arange(np.datetime64(od, 'D'), np.datetime64(do, 'D') + 1)
+        trasy, wiersze_pogody, wyniki = self._ocen_dni(dni)
+
+        macierz = np.full((len(self._trasy), len(dni)), np.nan)
+        macierz[trasy] = wyniki
+
+        ocenione = (wiersze_pogody >= 0).any(axis=1)
+        trasy, wiersze_pogody, wyniki = trasy[ocenione], wiersze_pogody[ocenione], wyniki[ocenione]
+        najlepszy_dzien = np.where(np.isnan(wyniki), -np.inf, wyniki).argmax(axis=1)
+        wiersz = np.arange(len(trasy))
+        najlepsze = wyniki[wiersz, najlepszy_dzien]
+        kolejnosc = np.argsort(-najlepsze, kind='stable')
+
+        magazyn = self._indeks_pogody.magazyn
+        daty = dni.tolist()
+        return {
+            'daty': daty,
+            'macierz': macierz,
+            'najlepsze': [
+                {
+                    'trasa': self._trasy[i],
+                    'data': daty[d],
+                    'dane_pogodowe': magazyn[p],
+                    'score': score,
+                }
+                for i, d, p, score in zip(
+                    trasy[kolejnosc].tolist(),
+                    najlepszy_dzien[kolejnosc].tolist(),
+                    wiersze_pogody[kolejnosc, najlepszy_dzien[kolejnosc]].tolist(),
+                    najlepsze[kolejnosc].tolist(),
+                )
+            ],
+        }
+
+    def ocen_wsadowo(self, preferencje: Sequence[PreferencjeUzytkownika],
+                     target_date: date) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ocenia wszystkie trasy dla wielu zestawów preferencji naraz.
+
+        Pogoda i indeks komfortu regionów pobierane są raz dla całej partii;
+        wyniki są identyczne co do bitu z ocen() dla każdego zestawu osobno.
+
+        Args:
+            preferencje: Preferencje kolejnych użytkowników
+            target_date: Dzień wycieczki
+
+        Returns:
+            Krotka (macierz wyników użytkownicy x trasy z NaN dla tras nierekomendowanych,
+            wiersz magazynu pogody każdej trasy lub -1)
+        """
+        trudnosc, dlugosc, region_kod, regiony = self._kolumny_tras()
+        wiersze_regionow, opady, komfort = self._pogoda_regionow(regiony, np.array([target_date], dtype='datetime64[D]'))
+        wiersze_regionow, opady, komfort = wiersze_regionow[:, 0], opady[:, 0], komfort[:, 0]
+
+        pref = ocena_wektorowa.PreferencjeWsadowe(preferencje)
+        pogoda_score = ocena_wektorowa.zgodnosc_z_pogoda(pref, opady, komfort)[:, region_kod]
+        trasa_score = ocena_wektorowa.zgodnosc_z_trasa(pref, trudnosc, dlugosc)
+        wyniki = ocena_wektorowa.wynik_laczny(pref, pogoda_score, trasa_score)
+
+        wiersze_pogody = wiersze_regionow[region_kod]
+        ocenione = ocena_wektorowa.dopasowane_do_preferencji(pref, trudnosc, dlugosc) & \
+            (wiersze_pogody >= 0) & (pogoda_score != 0)
+        wyniki[~ocenione] = np.nan
+        return wyniki, wiersze_pogody
+
+    def generuj_rekomendacje_wsadowo(self, preferencje: Sequence[PreferencjeUzytkownika], data: str,
+                                     top_k: Optional[int] = None) -> List[list[dict]]:
+        """
+        Generuje rekomendacje na jeden dzień dla wielu użytkowników naraz (ocen_wsadowo).
+
+        Ocenia wszystkie trasy każdego użytkownika; gdy potrzeba tylko kilku
+        najlepszych tras, generuj_rekomendacje(top_k=...) z odcinaniem regionów
+        bywa szybsze.
+
+        Args:
+            preferencje: Preferencje kolejnych użytkowników
+            data: Dzień wycieczki (RRRR-MM-DD)
+            top_k: Liczba rekomendacji na użytkownika (domyślnie wszystkie)
+
+        Returns:
+            Lista rekomendacji (jak z generuj_rekomendacje) w kolejności preferencji
+        """
+        if top_k is not None and top_k < 1:
+            raise ValueError("top_k musi być dodatnie")
+        target_date = datetime.strptime(data, '%Y-%m-%d').date()
+        magazyn = self._indeks_pogody.magazyn
+        # Macierz wyników liczona dla grup użytkowników, by ograniczyć zużycie pamięci
+        grupa = max(1, self.ROZMIAR_MACIERZY_WSADOWEJ // max(len(self._trasy), 1))
+        wyniki_uzytkownikow = []
+        for od in range(0, len(preferencje), grupa):
+            wyniki, wiersze_pogody = self.ocen_wsadowo(preferencje[od:od + grupa], target_date)
+            for wiersz in wyniki:
+                trasy = np.flatnonzero(~np.isnan(wiersz))
+                wyniki_tras = wiersz[trasy]
+                if top_k is not None and top_k < len(trasy):
+                    # Kandydaci z wynikiem co najmniej k-tym; remisy rozstrzyga kolejność tras
+                    prog = np.partition(-wyniki_tras, top_k - 1)[top_k - 1]
+                    kandydaci = np.flatnonzero(-wyniki_tras <= prog)
+                    trasy, wyniki_tras = trasy[kandydaci], wyniki_tras[kandydaci]
+                kolejnosc = np.argsort(-wyniki_tras, kind='stable')[:top_k]
+                wyniki_uzytkownikow.append([
+                    {'trasa': self._trasy[i], 'dane_pogodowe': magazyn[p], 'score': score}
+                    for i, p, score in zip(
+                        trasy[kolejnosc].tolist(), wiersze_pogody[trasy[kolejnosc]].tolist(),
+                        wyniki_tras[kolejnosc].tolist()
+                    )
+                ])
+        return wyniki_uzytkownikow
+
+    def _wersja_danych(self) -> Optional[Tuple[int, int]]:
+        """Wersja (tras, pogody) ocenianych danych; None, gdy trasy podano listą (zmian nie da się wykryć)."""
+        if not isinstance(self._trasy, MagazynTras):
+            return None
+        return self._trasy.wersja, self._indeks_pogody.magazyn.wersja
+
+    def generuj_rekomendacje(self, data: str, top_k: Optional[int] = None) -> list[dict]:
+        """
+        Generuje rekomendacje tras na podany dzień, od najlepiej ocenionej.
+
+        Jeśli rekomendator ma pamięć wyników, powtórzone zapytanie (te same
+        preferencje, dzień i top_k) na niezmienionych danych zwraca kopie
+        zapamiętanych słowników, więc zmiany wyniku nie psują pamięci.
+
+        Args:
+            data: Dzień wycieczki (RRRR-MM-DD)
+            top_k: Liczba najlepszych rekomendacji (domyślnie wszystkie)
+
+        Returns:
+            Lista słowników {'trasa', 'dane_pogodowe', 'score'}
+        """
         target_date = datetime.strptime(data, '%Y-%m-%d').date()
-        wyniki = []
-        for trasa in self._trasy:
-            # dopasowanie trasowe
-            if not trasa.dopasowana_do_preferencji(self._pref):
-                continue
-            # znajdź dane pogodowe
-            dane = next((d for d in self._pogoda if d.lokalizacja == trasa._region and d.data == target_date), None)
-            if not dane:
-                continue
-            pogoda_score = self._pref.zgodnosc_z_pogoda(dane)
-            if pogoda_score == 0:
-                continue
-            trasa_score = self._pref.zgodnosc_z_trasa(trasa)
-            # łączny wynik
-            w_pogoda = self._pref.wagi.get('pogoda', 0.5)
-            w_trasa = self._pref.wagi.get('trudnosc', 0.5)
-            score = pogoda_score * w_pogoda + trasa_score * w_trasa
-            wyniki.append({
-                'trasa': trasa,
-                'dane_pogodowe': dane,
-                'score': score
-            })
-        wyniki.sort(key=lambda x: x['score'], reverse=True)
-        return wyniki
\ No newline at end of file
+        wersja = self._wersja_danych() if self._pamiec is not None else None
+        if wersja is None:
+            return self._generuj_rekomendacje(target_date, top_k)
+        klucz = ('generuj_rekomendacje', self._pref.klucz(), target_date, top_k)
+        return [dict(r) for r in self._pamiec.pobierz_lub_oblicz(
+            klucz, wersja, lambda: self._generuj_rekomendacje(target_date, top_k)
+        )]
+
+    def ocen_pareto(self, target_date: date) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Wybiera trasy z frontu Pareto (skyline) zamiast sortowania po ważonej sumie.
+
+        Spośród tras spełniających preferencje (jak w ocen) zostają te, dla
+        których żadna inna nie jest jednocześnie nie dłuższa, nie trudniejsza,
+        nie wyższa (przewyższenie) i nie gorsza pod względem komfortu pogody,
+        a w którymś z tych kryteriów lepsza.
+
+        Args:
+            target_date: Dzień wycieczki
+
+        Returns:
+            Krotka (numery tras, numery wierszy magazynu pogody, wyniki) jak w ocen,
+            posortowana malejąco po wyniku ważonym
+        """
+        trasy, wiersze_pogody, wyniki = self.ocen(target_date)
+        trudnosc, dlugosc, _, _ = self._kolumny_tras()
+        komfort = self._indeks_pogody.magazyn.kolumna(KOLUMNA_KOMFORTU)[wiersze_pogody]
+        kryteria = np.column_stack([
+            dlugosc[trasy], trudnosc[trasy], self._przewyzszenie_tras()[trasy], -komfort
+        ])
+        # Brak indeksu komfortu (NaN) traktowany jest jak najgorszy komfort
+        kryteria[np.isnan(kryteria)] = np.inf
+        front = front_pareto(kryteria)
+        return trasy[front], wiersze_pogody[front], wyniki[front]
+
+    def generuj_front_pareto(self, data: str) -> list[dict]:
+        """
+        Generuje rekomendacje w trybie Pareto: trasy, których nie da się poprawić
+        w jednym kryterium (długość, trudność, przewyższenie, komfort pogody)
+        bez pogorszenia innego.
+
+        Args:
+            data: Dzień wycieczki (RRRR-MM-DD)
+
+        Returns:
+            Lista słowników {'trasa', 'dane_pogodowe', 'score'} od najlepiej ocenionej
+        """
+        target_date = datetime.strptime(data, '%Y-%m-%d').date()
+        wersja = self._wersja_danych() if self._pamiec is not None else None
+        if wersja is None:
+            return self._jako_rekomendacje(*self.ocen_pareto(target_date))
+        klucz = ('generuj_front_pareto', self._pref.klucz(), target_date)
+        return [dict(r) for r in self._pamiec.pobierz_lub_oblicz(
+            klucz, wersja, lambda: self._jako_rekomendacje(*self.ocen_pareto(target_date))
+        )]
+
+    def _generuj_rekomendacje(self, target_date: date, top_k: Optional[int]) -> list[dict]:
+        return self._jako_rekomendacje(*self.ocen(target_date, top_k))
+
+    def _jako_rekomendacje(self, trasy: np.ndarray, wiersze_pogody: np.ndarray, wyniki: np.ndarray) -> list[dict]:
+        magazyn = self._indeks_pogody.magazyn
+        # Obiekty Trasa i DanePogodowe powstają tylko dla zwracanych wyników
+        return [
+            {'trasa': self._trasy[i], 'dane_pogodowe': magazyn[p], 'score': score}
+            for i, p, score in zip(trasy.tolist(), wiersze_pogody.tolist(), wyniki.tolist())
+        ]
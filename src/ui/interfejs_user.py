@@ -67,14 +67,16 @@ class InterfejsUzytkownika:
         pogoda = self._menadzer_pogody.wczytaj_dane(sciezka_pogoda)
         rekom = RekomendatorTras(trasy, pogoda, pref).generuj_rekomendacje(data)
         # wyniki
+        komforty = []
         print(f"\nRekomendowane trasy na dzień {data}:\n")
         for idx, e in enumerate(rekom, start=1):
             t = e['trasa']
-            d = e['dane_pogodowe']
             czas = t.szacuj_czas_przejscia(self._predkosci_terenowe)
             godz = int(czas)
             minuty = int((czas - godz) * 60)
-            indeks = d.oblicz_indeks_komfortu()
+            # Indeks komfortu wyliczony przy wczytaniu danych - używany też w zapisie JSON
+            indeks = e['dane_pogodowe'].oblicz_indeks_komfortu()
+            komforty.append(indeks)
             kat = ", ".join(t.kategoryzuj()) or 'Brak'
             print(f"{idx}. {t.nazwa} ({t._region})")
             print(f"   Długość: {t.dlugosc_km} km")
@@ -91,10 +93,10 @@ class InterfejsUzytkownika:
                     'nazwa': e['trasa'].nazwa,
                     'region': e['trasa']._region,
                     'czas_h': round(e['trasa'].szacuj_czas_przejscia(self._predkosci_terenowe), 2),
-                    'komfort': round(e['dane_pogodowe'].oblicz_indeks_komfortu(), 1),
+                    'komfort': round(indeks, 1),
                     'kategorie': e['trasa'].kategoryzuj()
                 }
-                for e in rekom
+                for e, indeks in zip(rekom, komforty)
             ]
             with open('rekomendacje.json', 'w', encoding='utf-8') as f:
                 json.dump(out, f, ensure_ascii=False, indent=2)
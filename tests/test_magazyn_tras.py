@@ -0,0 +1,194 @@
+from src.data_handlers.menadzer_danych_tras import MenadzerDanychTras
+
+SCIEZKA_TRAS = 'data/trasy/trasy.csv'
+
+def test_wyszukiwanie_maska_zgodne_ze_skanem():
+    menadzer = MenadzerDanychTras()
+    trasy = list(menadzer.wczytaj_trasy(SCIEZKA_TRAS))
+    parametry = {'min_length': 5, 'max_length': 15, 'max_difficulty': 4, 'region': 'Tatry'}
+
+    oczekiwane = [
+        t.id for t in trasy
+        if 5 <= t.dlugosc_km <= 15 and t.trudnosc <= 4 and t.region == 'Tatry'
+    ]
+    assert [t.id for t in menadzer.wyszukaj_trasy(parametry)] == oczekiwane
+
+def test_nieznany_region_zwraca_pusta_liste():
+    menadzer = MenadzerDanychTras()
+    menadzer.wczytaj_trasy(SCIEZKA_TRAS)
+    assert menadzer.wyszukaj_trasy({'region': 'Alpy'}) == []
+
+def test_obiekty_trasa_tworzone_raz():
+    menadzer = MenadzerDanychTras()
+    trasy = menadzer.wczytaj_trasy(SCIEZKA_TRAS)
+    assert trasy[0] is trasy[0]
+    assert trasy[-1].id == len(trasy)
+
+def test_indeks_zakresowy_zgodny_z_maska():
+    menadzer = MenadzerDanychTras()
+    menadzer.wczytaj_trasy(SCIEZKA_TRAS)
+    zapytania = [
+        {},
+        {'region': 'wszystkie', 'max_difficulty': 3},
+        {'min_length': 8, 'max_length': 10, 'min_difficulty': 3, 'max_difficulty': 4, 'region': 'Tatry'},
+        {'min_elevation': 500, 'max_length': 20},
+        {'min_length': 10, 'max_length': 5},
+    ]
+    for parametry in zapytania:
+        oczekiwane = menadzer.magazyn.maska(parametry).nonzero()[0]
+        assert [t.id for t in menadzer.wyszukaj_trasy(parametry)] == [int(menadzer.magazyn.id[i]) for i in oczekiwane]
+
+def test_migawka_odtwarza_trasy(tmp_path):
+    import shutil
+    from src.data_handlers.migawka import kompiluj_trasy, migawka_aktualna
+
+    sciezka = str(tmp_path / 'trasy.csv')
+    shutil.copy(SCIEZKA_TRAS, sciezka)
+    assert not migawka_aktualna(sciezka)
+    kompiluj_trasy(sciezka)
+    assert migawka_aktualna(sciezka)
+
+    z_migawki = MenadzerDanychTras()
+    z_migawki.wczytaj_trasy(sciezka)
+    z_csv = MenadzerDanychTras()
+    z_csv.wczytaj_trasy(sciezka, uzyj_migawki=False)
+    for a, b in zip(z_migawki.magazyn, z_csv.magazyn):
+        assert (a.id, a.nazwa, a.region, a.dlugosc_km, a.czas_przejscia, a.przewyzszenie_m) == \
+               (b.id, b.nazwa, b.region, b.dlugosc_km, b.czas_przejscia, b.przewyzszenie_m)
+    assert len(z_migawki.magazyn) == len(z_csv.magazyn)
+
+    # Migawka w starszej wersji formatu jest pomijana
+    import json
+    from src.data_handlers.migawka import WERSJA_FORMATU, sciezka_migawki
+    meta = tmp_path / 'trasy.migawka' / 'meta.json'
+    assert str(meta.parent) == sciezka_migawki(sciezka)
+    dane = json.loads(meta.read_text(encoding='utf-8'))
+    meta.write_text(json.dumps({**dane, 'wersja': WERSJA_FORMATU - 1}), encoding='utf-8')
+    assert not migawka_aktualna(sciezka)
+
+def test_przeladowanie_stosuje_tylko_zmiany(tmp_path):
+    import shutil
+
+    sciezka = str(tmp_path / 'trasy.csv')
+    shutil.copy(SCIEZKA_TRAS, sciezka)
+    menadzer = MenadzerDanychTras()
+    menadzer.wczytaj_trasy(sciezka)
+    menadzer.wczytaj_trasy(sciezka)
+    assert len(menadzer.magazyn) == 15
+
+    with open(sciezka, 'a', encoding='utf-8') as f:
+        f.write('16,Nowa trasa,Tatry,9.0,3h00min,3.5,500,Start,Meta,Opis,Górska\n')
+    assert menadzer.przeladuj_trasy(sciezka) == (1, 0)
+
+    with open(sciezka, encoding='utf-8') as f:
+        tekst = f.read().replace('2,Szlak na Giewont,Tatry,7.2', '2,Szlak na Giewont,Pieniny,9.5')
+    with open(sciezka, 'w', encoding='utf-8') as f:
+        f.write(tekst)
+    assert menadzer.przeladuj_trasy(sciezka, pelne_sprawdzenie=True) == (0, 1)
+
+    assert [t.id for t in menadzer.wyszukaj_trasy({'region': 'Tatry', 'min_length': 7, 'max_length': 10})] == [3, 16]
+    assert 2 in [t.id for t in menadzer.wyszukaj_trasy({'region': 'Pieniny'})]
+    assert menadzer.magazyn[1].dlugosc_km == 9.5
+
+def test_przeladowanie_pola_z_nowa_linia_i_duplikaty(tmp_path):
+    import shutil
+    import pytest
+
+    sciezka = str(tmp_path / 'trasy.csv')
+    shutil.copy(SCIEZKA_TRAS, sciezka)
+    menadzer = MenadzerDanychTras()
+    menadzer.wczytaj_trasy(sciezka, uzyj_migawki=False)
+
+    with open(sciezka, 'a', encoding='utf-8') as f:
+        f.write('16,Nowa trasa,Tatry,9.0,3h00min,3.5,500,Start,Meta,"Opis ""A""\nciąg dalszy",Górska\n')
+        f.write('17,Druga trasa,Tatry,8.0,2h00min,2.0,300,Start,Meta,Opis,Górska\n')
+    assert menadzer.przeladuj_trasy(sciezka) == (2, 0)
+    assert menadzer.magazyn[15].opis == 'Opis "A"\nciąg dalszy'
+
+    # Numery wierszy po polu wieloliniowym nie przesuwają się
+    with open(sciezka, encoding='utf-8') as f:
+        tekst = f.read().replace('17,Druga trasa,Tatry,8.0', '17,Druga trasa,Pieniny,8.0')
+    with open(sciezka, 'w', encoding='utf-8') as f:
+        f.write(tekst)
+    assert menadzer.przeladuj_trasy(sciezka, pelne_sprawdzenie=True) == (0, 1)
+    assert len(menadzer.magazyn) == 17
+    assert menadzer.magazyn[16].region == 'Pieniny'
+
+    with open(sciezka, 'a', encoding='utf-8') as f:
+        f.write('3,Duplikat,Tatry,1.0,1h00min,1.0,100,Start,Meta,Opis,Górska\n')
+    with pytest.raises(ValueError, match='Zduplikowane'):
+        menadzer.przeladuj_trasy(sciezka)
+    assert len(menadzer.magazyn) == 17
+
+def test_trasy_wspoldziela_menadzer_ocen_i_napisy():
+    trasy = list(MenadzerDanychTras().wczytaj_trasy(SCIEZKA_TRAS, uzyj_migawki=False))
+    assert not hasattr(trasy[0], '__dict__')
+    assert trasy[0]._rating_manager is trasy[1]._rating_manager
+    tatry = [t for t in trasy if t.region == 'Tatry']
+    assert all(t.region is tatry[0].region for t in tatry)
+
+def podziel_csv(sciezka, katalog, kolumna) -> None:
+    """Zapisuje wiersze pliku CSV do osobnych plików według wartości kolumny."""
+    import csv
+    with open(sciezka, newline='', encoding='utf-8') as f:
+        czytnik = csv.DictReader(f)
+        wiersze = list(czytnik)
+    for wartosc in {w[kolumna] for w in wiersze}:
+        with open(katalog / f'{wartosc}.csv', 'w', newline='', encoding='utf-8') as f:
+            pisarz = csv.DictWriter(f, czytnik.fieldnames)
+            pisarz.writeheader()
+            pisarz.writerows(w for w in wiersze if w[kolumna] == wartosc)
+
+def test_wczytywanie_plikow_regionow_rownolegle(tmp_path):
+    podziel_csv(SCIEZKA_TRAS, tmp_path, 'region')
+    menadzer = MenadzerDanychTras()
+    trasy = menadzer.wczytaj_trasy(str(tmp_path), procesy=2)
+
+    oczekiwane = []
+    for plik in sorted(tmp_path.glob('*.csv')):
+        oczekiwane += [t.id for t in MenadzerDanychTras().wczytaj_trasy(str(plik))]
+    assert [t.id for t in trasy] == oczekiwane
+    assert sorted(oczekiwane) == sorted(t.id for t in MenadzerDanychTras().wczytaj_trasy(SCIEZKA_TRAS))
+    assert [t.id for t in menadzer.wyszukaj_trasy({'region': 'Tatry'})] == \
+        [t.id for t in trasy if t.region == 'Tatry']
+
+    # Ponowne wczytanie wzorca glob nie dubluje tras
+    assert len(menadzer.wczytaj_trasy(str(tmp_path / '*.csv'))) == len(oczekiwane)
+
+def test_zduplikowane_identyfikatory_plikow(tmp_path):
+    import shutil
+    import pytest
+    shutil.copy(SCIEZKA_TRAS, tmp_path / 'a.csv')
+    shutil.copy(SCIEZKA_TRAS, tmp_path / 'b.csv')
+    menadzer = MenadzerDanychTras()
+    with pytest.raises(ValueError, match='Zduplikowane'):
+        menadzer.wczytaj_trasy(str(tmp_path))
+    assert len(menadzer.magazyn) == 0
+
+def test_podobne_trasy_zgodne_z_pelnym_porownaniem(tmp_path):
+    import shutil
+    import numpy as np
+
+    sciezka = str(tmp_path / 'trasy.csv')
+    shutil.copy(SCIEZKA_TRAS, sciezka)
+    menadzer = MenadzerDanychTras()
+    menadzer.wczytaj_trasy(sciezka)
+
+    def oczekiwane(id_trasy, k):
+        indeks = menadzer._indeks_podobienstwa
+        cechy = np.array([indeks.cechy(i) for i in range(len(menadzer.magazyn))])
+        wiersz = int(np.flatnonzero(menadzer.magazyn.id == id_trasy)[0])
+        odleglosci = np.sqrt(((cechy - cechy[wiersz]) ** 2).sum(axis=1))
+        kolejnosc = [i for i in np.lexsort((np.arange(len(cechy)), odleglosci)) if i != wiersz][:k]
+        return [int(menadzer.magazyn.id[i]) for i in kolejnosc]
+
+    menadzer.podobne_trasy(1)
+    for id_trasy in (1, 7, 15):
+        assert [t.id for t, _ in menadzer.podobne_trasy(id_trasy, k=4)] == oczekiwane(id_trasy, 4)
+
+    with open(sciezka, 'a', encoding='utf-8') as f:
+        f.write('16,Nowa trasa,Tatry,7.5,2h30min,3.0,650,Start,Meta,Opis,Górska\n')
+    menadzer.przeladuj_trasy(sciezka)
+    wyniki = menadzer.podobne_trasy(16, k=3)
+    assert [t.id for t, _ in wyniki] == oczekiwane(16, 3)
+    assert [d for _, d in wyniki] == sorted(d for _, d in wyniki)
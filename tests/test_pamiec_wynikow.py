@@ -0,0 +1,60 @@
+import shutil
+from src.analyzers.analiza_pogody import AnalizatorPogodowy
+from src.data_handlers.menadzer_danych_tras import MenadzerDanychTras
+from src.models.preferencje import PreferencjeUzytkownika
+from src.recommenders.pamiec_wynikow import PamiecWynikow
+from src.recommenders.rekomendator_tras import RekomendatorTras
+
+SCIEZKA_TRAS = 'data/trasy/trasy.csv'
+SCIEZKA_POGODY = 'data/pogoda/pogoda.csv'
+
+def test_lru_i_czas_waznosci():
+    czas = [0.0]
+    pamiec = PamiecWynikow(max_wpisow=2, czas_waznosci_s=10, zegar=lambda: czas[0])
+    assert pamiec.pobierz_lub_oblicz('a', 1, lambda: 'A') == 'A'
+    assert pamiec.pobierz_lub_oblicz('b', 1, lambda: 'B') == 'B'
+    assert pamiec.pobierz_lub_oblicz('a', 1, lambda: 'nowe') == 'A'
+    pamiec.pobierz_lub_oblicz('c', 1, lambda: 'C')  # usuwa najdawniej używane 'b'
+    assert pamiec.pobierz_lub_oblicz('b', 1, lambda: 'B2') == 'B2'
+    czas[0] = 11
+    assert pamiec.pobierz_lub_oblicz('b', 1, lambda: 'B3') == 'B3'
+    assert pamiec.pobierz_lub_oblicz('b', 2, lambda: 'B4') == 'B4'
+    assert pamiec.statystyki() == {'trafienia': 1, 'chybienia': 6, 'uniewaznione': 2, 'wpisy': 2,
+                                   'skutecznosc': 1 / 7}
+
+def test_rekomendacje_z_pamieci_uniewazniane_po_przeladowaniu(tmp_path):
+    sciezka = str(tmp_path / 'trasy.csv')
+    shutil.copy(SCIEZKA_TRAS, sciezka)
+    menadzer = MenadzerDanychTras()
+    magazyn = menadzer.wczytaj_trasy(sciezka)
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(SCIEZKA_POGODY)
+    pamiec = PamiecWynikow()
+
+    def rekomendacje(pref):
+        return RekomendatorTras(magazyn, analizator.magazyn, pref, analizator.indeks, pamiec=pamiec) \
+            .generuj_rekomendacje('2023-07-05')
+
+    pref = PreferencjeUzytkownika(temp_pref=(10, 25), max_opady_mm=5, max_trudnosc=3, max_dlugosc_km=15)
+    pierwsze = rekomendacje(pref)
+    # Równoważne preferencje (inne typy liczb, jawne wagi domyślne) trafiają w ten sam wpis
+    ponowne = rekomendacje(PreferencjeUzytkownika(temp_pref=[10.0, 25.0], max_opady_mm=5.0, max_trudnosc=3,
+                                                  max_dlugosc_km=15, wagi={'pogoda': 0.6, 'trudnosc': 0.4}))
+    assert ponowne == pierwsze and ponowne is not pierwsze
+    assert (pamiec.trafienia, pamiec.chybienia) == (1, 1)
+    # Zmiana zwróconego słownika nie zmienia wyniku w pamięci
+    wyniki = [r['score'] for r in pierwsze]
+    ponowne[0]['score'] = -1.0
+    assert [r['score'] for r in rekomendacje(pref)] == wyniki
+    assert (pamiec.trafienia, pamiec.chybienia) == (2, 1)
+
+    with open(sciezka, 'a', encoding='utf-8') as f:
+        f.write('16,Nowa trasa,Tatry,2.0,1h00min,1.0,100,Start,Meta,Opis,Górska\n')
+    menadzer.przeladuj_trasy(sciezka)
+    po_przeladowaniu = rekomendacje(pref)
+    assert (pamiec.trafienia, pamiec.chybienia) == (2, 2)
+    assert 16 in [r['trasa'].id for r in po_przeladowaniu]
+
+    analizator.wczytaj_dane(SCIEZKA_POGODY)  # ponowne wczytanie - bez zmian, wersja pogody stała
+    rekomendacje(pref)
+    assert (pamiec.trafienia, pamiec.chybienia) == (3, 2)
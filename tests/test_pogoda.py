@@ -0,0 +1,386 @@
+from datetime import date
+from src.analyzers.analiza_pogody import AnalizatorPogodowy
+
+SCIEZKA_POGODY = 'data/pogoda/pogoda.csv'
+
+def wczytaj_analizator() -> AnalizatorPogodowy:
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(SCIEZKA_POGODY)
+    return analizator
+
+def test_indeks_zgodny_ze_skanem():
+    analizator = wczytaj_analizator()
+    dane = list(analizator._dane)
+    for lokalizacja in {d.lokalizacja for d in dane}:
+        rekordy = [d for d in dane if d.lokalizacja == lokalizacja]
+        assert analizator.pobierz_dane_dla_lokacji(lokalizacja) is max(rekordy, key=lambda d: d.data)
+        for d in rekordy:
+            pierwszy = next(r for r in rekordy if r.data == d.data)
+            assert analizator.indeks.pobierz(lokalizacja, d.data) is pierwszy
+    assert analizator.indeks.pobierz('Tatry', date(2000, 1, 1)) is None
+
+def test_najlepsze_okresy_ze_strumienia_partii():
+    from src.data_handlers.menadzer_pogody import MenadzerDanychPogodowych
+    analizator = wczytaj_analizator()
+    for region in ('Tatry', 'Gorce', 'wszystkie'):
+        partie = MenadzerDanychPogodowych().wczytaj_dane_partiami(SCIEZKA_POGODY, rozmiar_partii=10)
+        assert AnalizatorPogodowy().najlepsze_okresy(region, partie=partie) == analizator.najlepsze_okresy(region)
+
+def test_wczytywanie_wektorowe_zgodne_z_parsowaniem_wierszy():
+    from src.data_handlers.menadzer_pogody import MenadzerDanychPogodowych
+    from src.data_handlers.wczytywanie_csv import czytaj_wiersze_partiami, parsuj_dane_pogodowe
+    magazyn = MenadzerDanychPogodowych().wczytaj_dane(SCIEZKA_POGODY, uzyj_migawki=False)
+    wiersze = [row for partia in czytaj_wiersze_partiami(SCIEZKA_POGODY) for row in partia]
+    assert magazyn.data.dtype == 'datetime64[D]'
+    pola = lambda d: [getattr(d, p) for p in type(d).__slots__]
+    assert [pola(d) for d in magazyn] == [pola(parsuj_dane_pogodowe(row)) for row in wiersze]
+
+def test_wczytywanie_plikow_lokalizacji_rownolegle(tmp_path):
+    with open(SCIEZKA_POGODY, encoding='utf-8') as f:
+        naglowek, *wiersze = [w for w in f.read().splitlines() if w.strip()]
+    for lokalizacja in {w.split(',')[1] for w in wiersze}:
+        linie = [w for w in wiersze if w.split(',')[1] == lokalizacja]
+        (tmp_path / f'{lokalizacja}.csv').write_text('\n'.join([naglowek, *linie]) + '\n', encoding='utf-8')
+    z_plikow = AnalizatorPogodowy()
+    z_plikow.wczytaj_dane(str(tmp_path), procesy=2)
+    analizator = wczytaj_analizator()
+    assert len(z_plikow._dane) == len(analizator._dane)
+    for d in analizator._dane:
+        assert z_plikow.indeks.pobierz(d.lokalizacja, d.data).temp_srednia == \
+            analizator.indeks.pobierz(d.lokalizacja, d.data).temp_srednia
+
+def test_kolumna_komfortu_zgodna_ze_wzorem_skalarnym():
+    import numpy as np
+    from src.analyzers.agregaty_pogodowe import SrednieMiesieczneKomfortu
+    from src.data_handlers.magazyn_pogody import KOLUMNA_KOMFORTU
+    from src.data_handlers.wczytywanie_csv import czytaj_wiersze_partiami, parsuj_dane_pogodowe
+    analizator = wczytaj_analizator()
+    magazyn = analizator.magazyn
+    rekordy = [parsuj_dane_pogodowe(row) for partia in czytaj_wiersze_partiami(SCIEZKA_POGODY) for row in partia]
+    assert magazyn.kolumna(KOLUMNA_KOMFORTU).tolist() == [d._oblicz_komfort() for d in rekordy]
+    assert [d.oblicz_indeks_komfortu() for d in magazyn] == [d.oblicz_indeks_komfortu() for d in rekordy]
+    # Pola rekordu są tylko do odczytu, więc zapamiętany indeks nie może się zdezaktualizować
+    import pytest
+    with pytest.raises(AttributeError):
+        rekordy[0].temp_srednia = 40.0
+
+    wagi = {'temp': 0.2, 'opady': 0.5, 'zachmurzenie': 0.3}
+    oczekiwane = [
+        max(0, min(100, max(0, 100 - abs(d.temp_srednia - 20) * 3) * 0.2
+                   + (100 - min(d.opady_mm * 2, 100)) * 0.5 + (100 - d.zachmurzenie_pct) * 0.3))
+        for d in rekordy
+    ]
+    assert np.allclose(magazyn.indeks_komfortu(wagi), oczekiwane)
+
+    z_kolumn, z_obiektow = SrednieMiesieczneKomfortu(), SrednieMiesieczneKomfortu()
+    z_kolumn.dodaj(magazyn)
+    z_obiektow.dodaj(list(magazyn))
+    assert z_kolumn._sumy == z_obiektow._sumy
+
+def test_kostka_agregatow_zgodna_ze_skanem_takze_po_przeladowaniu(tmp_path):
+    from datetime import date as dzien
+    from benchmarks.dane_syntetyczne import generuj_pogode_csv
+    from src.analyzers.agregaty_pogodowe import SrednieMiesieczneKomfortu
+    sciezka = str(tmp_path / 'pogoda.csv')
+    generuj_pogode_csv(sciezka, 90, start=dzien(2023, 1, 10))
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(sciezka)
+
+    def sprawdz():
+        # Wiersze uzupełnionych luk nie wchodzą do agregatów
+        dane = [d for d, u in zip(analizator.magazyn, analizator.magazyn.uzupelnione) if not u]
+        for region in ('Tatry', 'Gorce', 'Sudety', 'wszystkie'):
+            lokalizacja = analizator.lokalizacja_pogody(region)
+            agregat = SrednieMiesieczneKomfortu(lokalizacja)
+            agregat.dodaj(dane)
+            assert analizator.najlepsze_okresy(region, top_n=12) == agregat.najlepsze_miesiace(lokalizacja, 12)
+        for miesiac in range(1, 13):
+            rekordy = [d for d in dane if d.lokalizacja == 'Sudety' and d.data.month == miesiac]
+            statystyki = analizator.statystyki_sezonowe('Sudety', miesiac)
+            if not rekordy:
+                assert statystyki is None
+                continue
+            opady = [d.opady_mm for d in rekordy]
+            assert statystyki['opady_mm'] == {
+                'srednia': sum(opady) / len(opady), 'min': min(opady), 'max': max(opady), 'liczba': len(opady)
+            }
+            assert statystyki['indeks_komfortu']['max'] == max(d.oblicz_indeks_komfortu() for d in rekordy)
+
+    sprawdz()
+    with open(sciezka, encoding='utf-8') as f:
+        linie = f.read().splitlines()
+    # Zmiana rekordu (także jego miesiąca) i dopisanie nowych miesięcy
+    nr = next(i for i, l in enumerate(linie) if l.startswith('2023-02-01,Sudety,'))
+    linie[nr] = '2023-01-09,Sudety,35.0,30.0,40.0,99.0,1.0,100'
+    linie.append('2023-06-01,Sudety,18.0,12.0,24.0,0.0,12.0,10')
+    with open(sciezka, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(linie) + '\n')
+    assert analizator.przeladuj_dane(sciezka, pelne_sprawdzenie=True) == (1, 1)
+    assert analizator.statystyki_sezonowe('Sudety', 1)['opady_mm']['max'] == 99.0
+    sprawdz()
+
+def test_kostka_dolicza_tylko_nowe_i_zmienione_wiersze():
+    import numpy as np
+    from src.analyzers.agregaty_pogodowe import KostkaPogodowa
+    from src.data_handlers.magazyn_pogody import KOLUMNY_POGODY
+    analizator = wczytaj_analizator()
+    magazyn = analizator.magazyn
+    kostka = KostkaPogodowa(magazyn)
+    doliczone = []
+    dolicz = kostka._dolicz
+    kostka._dolicz = lambda wiersze, komorki: (doliczone.append(wiersze), dolicz(wiersze, komorki))
+
+    def zgodna_z_nowa():
+        nowa = KostkaPogodowa(magazyn)
+        for nazwa in ('_suma', '_min', '_max', '_liczba'):
+            assert np.array_equal(getattr(kostka, nazwa), getattr(nowa, nazwa), equal_nan=True)
+
+    n = len(magazyn)
+    magazyn.dodaj_kolumny(np.array(['2024-05-01'], dtype='datetime64[D]'), ['Tatry'],
+                          {nazwa: np.array([1.0]) for nazwa in KOLUMNY_POGODY})
+    kostka.aktualizuj()
+    assert [list(w) for w in doliczone] == [[n]]
+    zgodna_z_nowa()
+
+    # Zmiana wiersza przelicza tylko wiersze jego komórki
+    doliczone.clear()
+    magazyn.zastap_kolumny(np.array([0]), magazyn.data[:1], [magazyn.lokalizacje[magazyn.lokalizacja_kod[0]]],
+                           {nazwa: np.array([2.0]) for nazwa in KOLUMNY_POGODY})
+    assert list(magazyn.zastapione_od(kostka._wersja)) == [0]
+    assert magazyn.zastapione_od(-1) is None
+    kostka.aktualizuj()
+    assert 0 in doliczone[0] and len(doliczone[0]) < n and not len(doliczone[1])
+    zgodna_z_nowa()
+
+def test_trendy_kroczace_zgodne_z_petla(tmp_path):
+    import numpy as np
+    from datetime import date as dzien, timedelta
+    from benchmarks.dane_syntetyczne import generuj_pogode_csv
+    sciezka = str(tmp_path / 'pogoda.csv')
+    generuj_pogode_csv(sciezka, 120, regiony=['Tatry', 'Pieniny'])
+    with open(sciezka, encoding='utf-8') as f:
+        linie = f.read().splitlines()
+    # Luki w danych: brakujące dni nie wchodzą do okien
+    with open(sciezka, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(l for i, l in enumerate(linie) if i % 9 != 5) + '\n')
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(sciezka)
+
+    trendy = analizator.trendy('Tatry')
+    dane = {d.data: d for d, u in zip(analizator.magazyn, analizator.magazyn.uzupelnione)
+            if d.lokalizacja == 'Tatry' and not u}
+    for i, dzien_okna in enumerate(trendy['daty'].tolist()):
+        for okno in (7, 30):
+            punkty = [(k, dane[dzien_okna - timedelta(days=k)].opady_mm) for k in range(okno)
+                      if dzien_okna - timedelta(days=k) in dane]
+            wynik = trendy['opady_mm'][okno]
+            assert np.isclose(wynik['srednia'][i], np.mean([y for _, y in punkty]))
+            if len(punkty) >= 2:
+                nachylenie = np.polyfit([-k for k, _ in punkty], [y for _, y in punkty], 1)[0]
+                assert np.isclose(wynik['trend'][i], nachylenie, atol=1e-9)
+
+    ocena = analizator.poprawa_warunkow('Tatry')
+    assert ocena['data'] == max(dane)
+    assert ocena['opady_mm']['srednia_7'] == trendy['opady_mm'][7]['srednia'][-1]
+    assert ocena['poprawa'] == (ocena['indeks_komfortu']['trend_7'] > 0 and
+                                ocena['indeks_komfortu']['srednia_7'] > ocena['indeks_komfortu']['srednia_30'])
+
+def test_najblizsza_stacja_i_interpolacja():
+    import math
+    import numpy as np
+    from src.data_handlers.indeks_stacji import IndeksStacji
+
+    rng = np.random.default_rng(0)
+    stacje = {f'S{i}': (float(s), float(d)) for i, (s, d) in enumerate(zip(rng.uniform(49, 55, 3000), rng.uniform(14, 24, 3000)))}
+    indeks = IndeksStacji(stacje)
+
+    def haversine(a, b):
+        (s1, d1), (s2, d2) = np.radians(a), np.radians(b)
+        h = math.sin((s2 - s1) / 2) ** 2 + math.cos(s1) * math.cos(s2) * math.sin((d2 - d1) / 2) ** 2
+        return 2 * 6371.0 * math.asin(math.sqrt(h))
+
+    for punkt in [(50.06, 19.94), (52.23, 21.01), (54.35, 18.65)]:
+        oczekiwane = sorted(stacje, key=lambda n: haversine(punkt, stacje[n]))[:4]
+        wynik = indeks.najblizsze(punkt, 4)
+        assert [n for n, _ in wynik] == oczekiwane
+        assert np.allclose([km for _, km in wynik], [haversine(punkt, stacje[n]) for n in oczekiwane])
+        wagi = indeks.wagi(punkt, 4)
+        assert math.isclose(sum(w for _, w in wagi), 1.0) and wagi[0][1] >= wagi[-1][1]
+
+    analizator = wczytaj_analizator()
+    # Gorce nie mają własnych danych - najbliższa stacja z danymi wg config.REGION_COORDINATES
+    assert analizator.lokalizacja_pogody('Gorce') == 'Pieniny'
+    assert analizator.lokalizacja_pogody('Tatry') == 'Tatry'
+    assert analizator.lokalizacja_pogody('Alpy') is None
+    gorce = analizator.dane_dla_regionu('Gorce', date(2023, 7, 3))
+    assert gorce is analizator.indeks.pobierz('Pieniny', date(2023, 7, 3))
+
+    mieszane = analizator.dane_dla_regionu('Gorce', date(2023, 7, 3), k=2)
+    tatry = analizator.indeks.pobierz('Tatry', date(2023, 7, 3))
+    (_, w_pieniny), (_, w_tatry) = analizator._stacje.indeks.wagi((49.55, 20.11), 2)
+    assert mieszane.lokalizacja == 'Gorce'
+    assert math.isclose(mieszane.temp_srednia, w_pieniny * gorce.temp_srednia + w_tatry * tatry.temp_srednia)
+
+def test_archiwum_odtwarza_dane_i_czyta_tylko_potrzebne_bloki(tmp_path):
+    import numpy as np
+    from benchmarks.dane_syntetyczne import generuj_pogode_csv
+    from src.data_handlers.archiwum_pogody import ArchiwumPogody, zapisz_archiwum
+    from src.data_handlers.magazyn_pogody import KOLUMNA_KOMFORTU, KOLUMNY_POGODY
+    sciezka = str(tmp_path / 'pogoda.csv')
+    generuj_pogode_csv(sciezka, 1000, regiony=['Tatry', 'Pieniny'])
+    with open(sciezka, encoding='utf-8') as f:
+        linie = f.read().splitlines()
+    with open(sciezka, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(l for i, l in enumerate(linie) if i % 13 != 4) + '\n')
+    zrodlo = AnalizatorPogodowy(uzupelnianie_luk=None)
+    zrodlo.wczytaj_dane(sciezka)
+    magazyn = zrodlo.magazyn
+    kolumny = {k: magazyn.kolumna(k)[[3]] for k in KOLUMNY_POGODY}
+    magazyn.zastap_kolumny([3], magazyn.data[[3]], ['Tatry'], {**kolumny, 'opady_mm': np.array([np.nan])})
+    zrodlo.zapisz_archiwum(str(tmp_path / 'archiwum'))
+
+    analizator = AnalizatorPogodowy(uzupelnianie_luk=None)
+    assert analizator.wczytaj_archiwum(str(tmp_path / 'archiwum')) == len(zrodlo.magazyn)
+    wiersze = [zrodlo.indeks.pozycja(d.lokalizacja, d.data) for d in analizator.magazyn]
+    for k in (*KOLUMNY_POGODY, KOLUMNA_KOMFORTU):
+        assert np.array_equal(analizator.magazyn.kolumna(k), zrodlo.magazyn.kolumna(k)[wiersze], equal_nan=True)
+    assert analizator.najlepsze_okresy('Tatry') == zrodlo.najlepsze_okresy('Tatry')
+
+    archiwum = ArchiwumPogody(str(tmp_path / 'archiwum'))
+    daty, kolumny = archiwum.wczytaj('Tatry', date(2024, 3, 1), date(2024, 3, 31))
+    assert archiwum.rozpakowane_bloki == 1
+    assert [(d.data, d.temp_srednia) for d in zrodlo.magazyn
+            if d.lokalizacja == 'Tatry' and date(2024, 3, 1) <= d.data <= date(2024, 3, 31)] == \
+        list(zip(daty.tolist(), kolumny['temp_srednia'].tolist()))
+    assert archiwum.zakres('Pieniny')[1] == np.datetime64('2025-09-26')
+    assert len(archiwum.wczytaj('Alpy')[0]) == 0
+
+def test_uzupelnianie_krotkich_luk(tmp_path):
+    import numpy as np
+    import pytest
+    from datetime import date as dzien, timedelta
+    from benchmarks.dane_syntetyczne import generuj_pogode_csv
+    from src.data_handlers.menadzer_pogody import MenadzerDanychPogodowych
+    from src.data_handlers.uzupelnianie_luk import uzupelnij_luki
+    sciezka = str(tmp_path / 'pogoda.csv')
+    generuj_pogode_csv(sciezka, 90, regiony=['Tatry', 'Pieniny'])
+    with open(sciezka, encoding='utf-8') as f:
+        linie = f.read().splitlines()
+    start = dzien(2023, 1, 1)
+    brakujace = {start + timedelta(days=d) for d in (10, 20, 21, 22, 40, 41, 42, 43, 89)}
+    with open(sciezka, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(l for l in linie[:91] if not l.startswith(tuple(d.isoformat() for d in brakujace))))
+        f.write('\n' + '\n'.join(linie[91:]) + '\n')
+
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(sciezka)
+    pomiary = AnalizatorPogodowy(uzupelnianie_luk=None)
+    pomiary.wczytaj_dane(sciezka)
+    magazyn = analizator.magazyn
+    uzupelnione = {(d.lokalizacja, d.data) for d, u in zip(magazyn, magazyn.uzupelnione) if u}
+    # Luka 4 dni jest za długa, ostatni dzień nie ma następnego pomiaru
+    assert uzupelnione == {('Tatry', start + timedelta(days=d)) for d in (10, 20, 21, 22)}
+
+    dzien_luki = start + timedelta(days=21)
+    przed = pomiary.indeks.pobierz('Tatry', start + timedelta(days=19))
+    po = pomiary.indeks.pobierz('Tatry', start + timedelta(days=23))
+    wynik = analizator.indeks.pobierz('Tatry', dzien_luki)
+    assert np.isclose(wynik.opady_mm, (przed.opady_mm + po.opady_mm) / 2)
+    assert wynik.oblicz_indeks_komfortu() == magazyn.kolumna('indeks_komfortu')[analizator.indeks.pozycja('Tatry', dzien_luki)]
+    assert uzupelnij_luki(magazyn) == (0, 0)
+
+    sezonowa = AnalizatorPogodowy(uzupelnianie_luk='sezonowa')
+    sezonowa.wczytaj_dane(sciezka)
+    temp = {d.data: d.temp_srednia for d in pomiary.magazyn if d.lokalizacja == 'Tatry'}
+    sr = {m: np.mean([t for d, t in temp.items() if d.month == m]) for m in (1, 2)}
+    oczekiwana = sr[1] + (temp[start + timedelta(days=9)] - sr[1] + temp[start + timedelta(days=11)] - sr[1]) / 2
+    assert np.isclose(sezonowa.indeks.pobierz('Tatry', start + timedelta(days=10)).temp_srednia, oczekiwana)
+    with pytest.raises(ValueError):
+        MenadzerDanychPogodowych(uzupelnianie_luk='kubiczna').uzupelnij_luki()
+
+    # Rekomendacje na dzień luki nie pomijają regionu
+    from src.data_handlers.menadzer_danych_tras import MenadzerDanychTras
+    from src.models.preferencje import PreferencjeUzytkownika
+    from src.recommenders.rekomendator_tras import RekomendatorTras
+    trasy = MenadzerDanychTras().wczytaj_trasy('data/trasy/trasy.csv', uzyj_migawki=False)
+    pref = PreferencjeUzytkownika(temp_pref=(-10, 35), max_opady_mm=50, max_trudnosc=5, max_dlugosc_km=50)
+    def regiony(a):
+        rekomendator = RekomendatorTras(trasy, a.magazyn, pref, a.indeks)
+        return {r['trasa'].region for r in rekomendator.generuj_rekomendacje(dzien_luki.isoformat(), 100)}
+    assert 'Tatry' in regiony(analizator) and 'Tatry' not in regiony(pomiary)
+    # Menedżer danych (ścieżka interfejsu tekstowego) także uzupełnia luki
+    z_menadzera = MenadzerDanychPogodowych().wczytaj_dane(sciezka)
+    wyniki = RekomendatorTras(trasy, z_menadzera, pref).generuj_rekomendacje(dzien_luki.isoformat(), 100)
+    assert 'Tatry' in {r['trasa'].region for r in wyniki}
+
+    # Pomiar dopisany później zastępuje wartość uzupełnioną
+    with open(sciezka, 'a', encoding='utf-8') as f:
+        f.write(f'{dzien_luki.isoformat()},Tatry,12.5,7.5,18.5,0.3,6.0,40\n')
+    analizator.przeladuj_dane(sciezka)
+    wiersz = analizator.indeks.pozycja('Tatry', dzien_luki)
+    assert not magazyn.uzupelnione[wiersz] and analizator.indeks.pobierz('Tatry', dzien_luki).temp_srednia == 12.5
+    # Sąsiednie dni luki przeliczone względem nowego pomiaru
+    sasiedni = analizator.indeks.pobierz('Tatry', start + timedelta(days=20))
+    assert np.isclose(sasiedni.temp_srednia, (przed.temp_srednia + 12.5) / 2)
+
+def test_pomiar_dnia_uzupelnionego_zastepuje_wiersz(tmp_path):
+    naglowek = 'date,location_id,avg_temp,min_temp,max_temp,precipitation,sunshine_hours,cloud_cover\n'
+    sciezka = tmp_path / 'pogoda.csv'
+    sciezka.write_text(naglowek + '2023-07-01,Tatry,10.0,5.0,15.0,0.0,8.0,20\n'
+                       '2023-07-03,Tatry,20.0,15.0,25.0,0.0,8.0,20\n', encoding='utf-8')
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(str(sciezka))
+    assert len(analizator.magazyn) == 3 and analizator.magazyn.uzupelnione.sum() == 1
+    assert analizator.kostka.statystyki('Tatry', 7)['temp_srednia']['liczba'] == 2
+    trendy = analizator.trendy('Tatry', okna=(3,), kolumny=('temp_srednia',))
+    assert trendy['temp_srednia'][3]['srednia'][-1] == 15.0
+    trendy = analizator.trendy('Tatry', okna=(3,), kolumny=('temp_srednia',), z_uzupelnionymi=True)
+    assert trendy['temp_srednia'][3]['srednia'][-1] == 15.0 and trendy['temp_srednia'][3]['trend'][-1] == 5.0
+
+    with open(sciezka, 'a', encoding='utf-8') as f:
+        f.write('2023-07-02,Tatry,30.0,25.0,35.0,0.0,8.0,20\n')
+    analizator.przeladuj_dane(str(sciezka))
+    assert len(analizator.magazyn) == 3 and not analizator.magazyn.uzupelnione.any()
+    temperatura = analizator.kostka.statystyki('Tatry', 7)['temp_srednia']
+    assert (temperatura['liczba'], temperatura['srednia']) == (3, 20.0)
+
+    # Poprawka pomiaru trafia do tego samego wiersza
+    sciezka.write_text(sciezka.read_text(encoding='utf-8').replace('2023-07-02,Tatry,30.0', '2023-07-02,Tatry,31.0'),
+                       encoding='utf-8')
+    assert analizator.przeladuj_dane(str(sciezka), pelne_sprawdzenie=True) == (0, 1)
+    assert analizator.indeks.pobierz('Tatry', date(2023, 7, 2)).temp_srednia == 31.0
+    temperatura = analizator.kostka.statystyki('Tatry', 7)['temp_srednia']
+    assert (temperatura['liczba'], temperatura['max']) == (3, 31.0)
+    assert len(analizator.magazyn) == 3
+
+def test_pomiar_przeniesiony_na_dzien_luki_usuwa_wiersz_uzupelniony(tmp_path):
+    naglowek = 'date,location_id,avg_temp,min_temp,max_temp,precipitation,sunshine_hours,cloud_cover\n'
+    sciezka = tmp_path / 'pogoda.csv'
+    sciezka.write_text(naglowek + '2023-07-01,Tatry,10.0,5.0,15.0,0.0,8.0,20\n'
+                       '2023-07-03,Tatry,20.0,15.0,25.0,0.0,8.0,20\n'
+                       '2023-07-04,Tatry,25.0,20.0,30.0,0.0,8.0,20\n', encoding='utf-8')
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(str(sciezka))
+    with open(sciezka, 'a', encoding='utf-8') as f:
+        f.write('2023-07-10,Tatry,12.0,7.0,17.0,0.0,8.0,20\n')
+    analizator.przeladuj_dane(str(sciezka))
+    assert len(analizator.magazyn) == 5 and analizator.magazyn.uzupelnione[3]
+
+    # Poprawiony rekord trafia na dzień luki - zastępuje go pomiar, nie wartość uzupełniona
+    sciezka.write_text(sciezka.read_text(encoding='utf-8').replace('2023-07-04,Tatry,25.0', '2023-07-02,Tatry,30.0'),
+                       encoding='utf-8')
+    assert analizator.przeladuj_dane(str(sciezka), pelne_sprawdzenie=True) == (0, 1)
+    assert len(analizator.magazyn) == 4 and not analizator.magazyn.uzupelnione.any()
+    assert analizator.indeks.pobierz('Tatry', date(2023, 7, 2)).temp_srednia == 30.0
+    trendy = analizator.trendy('Tatry', okna=(3,), kolumny=('temp_srednia',), z_uzupelnionymi=True)
+    assert trendy['temp_srednia'][3]['srednia'][2] == 20.0
+    temperatura = analizator.kostka.statystyki('Tatry', 7)['temp_srednia']
+    assert (temperatura['liczba'], temperatura['max']) == (4, 30.0)
+
+    # Rekordy pliku po usuniętym wierszu wskazują przesunięte wiersze magazynu
+    sciezka.write_text(sciezka.read_text(encoding='utf-8').replace('2023-07-10,Tatry,12.0', '2023-07-10,Tatry,11.0'),
+                       encoding='utf-8')
+    assert analizator.przeladuj_dane(str(sciezka), pelne_sprawdzenie=True) == (0, 1)
+    assert len(analizator.magazyn) == 4
+    assert analizator.indeks.pobierz('Tatry', date(2023, 7, 10)).temp_srednia == 11.0
+    assert analizator.kostka.statystyki('Tatry', 7)['temp_srednia']['min'] == 10.0
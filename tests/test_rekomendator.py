@@ -0,0 +1,261 @@
+from src.analyzers.analiza_pogody import AnalizatorPogodowy
+from src.data_handlers.menadzer_danych_tras import MenadzerDanychTras
+from src.models.preferencje import PreferencjeUzytkownika
+from src.models.trasy import _NIESPARSOWANE
+from src.recommenders.rekomendator_tras import RekomendatorTras
+
+SCIEZKA_TRAS = 'data/trasy/trasy.csv'
+SCIEZKA_POGODY = 'data/pogoda/pogoda.csv'
+
+def preferencje() -> PreferencjeUzytkownika:
+    return PreferencjeUzytkownika(temp_pref=(10, 25), max_opady_mm=5, max_trudnosc=3, max_dlugosc_km=15)
+
+def wyniki(rekomendacje) -> list:
+    return [(r['trasa'].id, r['dane_pogodowe'].lokalizacja, r['score']) for r in rekomendacje]
+
+def test_rekomendacje_z_magazynu_tworza_tylko_pasujace_trasy():
+    magazyn = MenadzerDanychTras().wczytaj_trasy(SCIEZKA_TRAS, uzyj_migawki=False)
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(SCIEZKA_POGODY, uzyj_migawki=False)
+
+    z_magazynu = RekomendatorTras(magazyn, analizator._dane, preferencje()).generuj_rekomendacje('2023-07-05')
+    utworzone = [i for i in range(len(magazyn)) if magazyn._obiekty[i] is not None]
+    assert all(magazyn[i].trudnosc <= 3 and magazyn[i].dlugosc_km <= 15 for i in utworzone)
+    # Rekomendacja nie potrzebuje czasu przejścia ani danych z opisu
+    assert all(magazyn[i]._czas_przejscia is _NIESPARSOWANE and magazyn[i]._widokowa is None for i in utworzone)
+
+    z_listy = RekomendatorTras(list(magazyn), analizator._dane, preferencje()).generuj_rekomendacje('2023-07-05')
+    assert z_magazynu and wyniki(z_magazynu) == wyniki(z_listy)
+
+def rekomendacje_trasa_po_trasie(trasy, indeks, pref, target_date) -> list:
+    """Ocena w pętli po trasach - wzorzec dla oceny wektorowej."""
+    wyniki = []
+    for trasa in trasy:
+        if not trasa.dopasowana_do_preferencji(pref):
+            continue
+        dane = indeks.pobierz(trasa.region, target_date)
+        if not dane:
+            continue
+        pogoda_score = pref.zgodnosc_z_pogoda(dane)
+        if pogoda_score == 0:
+            continue
+        score = pogoda_score * pref.wagi.get('pogoda', 0.5) + pref.zgodnosc_z_trasa(trasa) * pref.wagi.get('trudnosc', 0.5)
+        wyniki.append({'trasa': trasa, 'dane_pogodowe': dane, 'score': score})
+    wyniki.sort(key=lambda x: x['score'], reverse=True)
+    return wyniki
+
+def test_ocena_wektorowa_identyczna_z_ocena_w_petli(tmp_path):
+    from datetime import date
+    from benchmarks.dane_syntetyczne import generuj_trasy_csv, generuj_pogode_csv
+    generuj_trasy_csv(str(tmp_path / 'trasy.csv'), 3000)
+    generuj_pogode_csv(str(tmp_path / 'pogoda.csv'), 30)
+    magazyn = MenadzerDanychTras().wczytaj_trasy(str(tmp_path / 'trasy.csv'))
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(str(tmp_path / 'pogoda.csv'))
+
+    for pref in (
+        preferencje(),
+        PreferencjeUzytkownika(temp_pref=(0, 30), max_opady_mm=2.5, max_trudnosc=5, max_dlugosc_km=30,
+                               wagi={'pogoda': 0.3, 'trudnosc': 0.7}),
+        PreferencjeUzytkownika(temp_pref=(0, 30), max_opady_mm=100, max_trudnosc=4, max_dlugosc_km=12.5, wagi={}),
+    ):
+        rekomendator = RekomendatorTras(magazyn, analizator._dane, pref, analizator.indeks)
+        for dzien in (date(2023, 1, 3), date(2023, 1, 17), date(2024, 1, 1)):
+            oczekiwane = rekomendacje_trasa_po_trasie(magazyn, analizator.indeks, pref, dzien)
+            otrzymane = rekomendator.generuj_rekomendacje(dzien.isoformat())
+            assert wyniki(otrzymane) == wyniki(oczekiwane)
+            assert all(type(r['score']) is float for r in otrzymane)
+
+def test_zakres_dat_zgodny_z_rekomendacjami_na_kazdy_dzien():
+    import math
+    magazyn = MenadzerDanychTras().wczytaj_trasy(SCIEZKA_TRAS)
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(SCIEZKA_POGODY)
+    rekomendator = RekomendatorTras(magazyn, analizator._dane, preferencje(), analizator.indeks)
+
+    zakres = rekomendator.rekomendacje_dla_zakresu('2023-06-30', '2023-07-08')
+    assert zakres['macierz'].shape == (len(magazyn), 9)
+    najlepsze = {}
+    for j, dzien in enumerate(zakres['daty']):
+        dnia = {r['trasa'].id: r['score'] for r in rekomendator.generuj_rekomendacje(dzien.isoformat())}
+        for i, trasa in enumerate(magazyn):
+            wynik = zakres['macierz'][i, j]
+            assert dnia.get(trasa.id) == wynik or (trasa.id not in dnia and math.isnan(wynik))
+            if trasa.id in dnia and (trasa.id not in najlepsze or dnia[trasa.id] > najlepsze[trasa.id][1]):
+                najlepsze[trasa.id] = (dzien, dnia[trasa.id])
+
+    assert najlepsze
+    assert {r['trasa'].id: (r['data'], r['score']) for r in zakres['najlepsze']} == najlepsze
+    assert [r['score'] for r in zakres['najlepsze']] == sorted((s for _, s in najlepsze.values()), reverse=True)
+    assert all(r['dane_pogodowe'].data == r['data'] for r in zakres['najlepsze'])
+
+def test_top_k_zgodne_z_pelnym_sortowaniem(tmp_path):
+    from benchmarks.dane_syntetyczne import generuj_trasy_csv, generuj_pogode_csv
+    generuj_trasy_csv(str(tmp_path / 'trasy.csv'), 2000)
+    generuj_pogode_csv(str(tmp_path / 'pogoda.csv'), 10)
+    magazyn = MenadzerDanychTras().wczytaj_trasy(str(tmp_path / 'trasy.csv'))
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(str(tmp_path / 'pogoda.csv'))
+
+    for wagi in ({'pogoda': 0.6, 'trudnosc': 0.4}, {'pogoda': 1, 'trudnosc': 0}, {'pogoda': 0.5, 'trudnosc': -0.2}):
+        pref = PreferencjeUzytkownika(temp_pref=(0, 30), max_opady_mm=6, max_trudnosc=4, max_dlugosc_km=25, wagi=wagi)
+        rekomendator = RekomendatorTras(magazyn, analizator._dane, pref, analizator.indeks)
+        pelne = wyniki(rekomendator.generuj_rekomendacje('2023-01-05'))
+        for k in (1, 10, 137, len(pelne) + 5):
+            assert wyniki(rekomendator.generuj_rekomendacje('2023-01-05', top_k=k)) == pelne[:k]
+    assert rekomendator.generuj_rekomendacje('2024-01-05', top_k=10) == []
+
+def test_rekomendacje_wsadowe_zgodne_z_osobnymi(tmp_path):
+    import random
+    from benchmarks.dane_syntetyczne import generuj_trasy_csv, generuj_pogode_csv
+    generuj_trasy_csv(str(tmp_path / 'trasy.csv'), 2000)
+    generuj_pogode_csv(str(tmp_path / 'pogoda.csv'), 10)
+    magazyn = MenadzerDanychTras().wczytaj_trasy(str(tmp_path / 'trasy.csv'))
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(str(tmp_path / 'pogoda.csv'))
+
+    losowe = random.Random(7)
+    uzytkownicy = [preferencje(), PreferencjeUzytkownika(temp_pref=(0, 30), max_opady_mm=3, max_trudnosc=5,
+                                                         max_dlugosc_km=40, wagi={'pogoda': 0.8})]
+    uzytkownicy += [
+        PreferencjeUzytkownika(temp_pref=(0, 30), max_opady_mm=losowe.uniform(0, 15),
+                               max_trudnosc=losowe.randint(1, 5), max_dlugosc_km=losowe.uniform(3, 30),
+                               wagi={'pogoda': losowe.random(), 'trudnosc': losowe.random()})
+        for _ in range(10)
+    ]
+    rekomendator = RekomendatorTras(magazyn, analizator._dane, preferencje(), analizator.indeks)
+    rekomendator.ROZMIAR_MACIERZY_WSADOWEJ = 5000  # kilka grup użytkowników
+    for top_k in (None, 5):
+        wsadowo = rekomendator.generuj_rekomendacje_wsadowo(uzytkownicy, '2023-01-05', top_k=top_k)
+        assert len(wsadowo) == len(uzytkownicy)
+        for pref, otrzymane in zip(uzytkownicy, wsadowo):
+            osobno = RekomendatorTras(magazyn, analizator._dane, pref, analizator.indeks)
+            assert wyniki(otrzymane) == wyniki(osobno.generuj_rekomendacje('2023-01-05', top_k=top_k))
+    assert rekomendator.generuj_rekomendacje_wsadowo(uzytkownicy, '2024-01-05') == [[] for _ in uzytkownicy]
+
+def test_zmiana_pogody_regionu_ocenia_ponownie_tylko_ten_region(tmp_path):
+    from datetime import date
+    from benchmarks.dane_syntetyczne import generuj_trasy_csv, generuj_pogode_csv
+    generuj_trasy_csv(str(tmp_path / 'trasy.csv'), 3000)
+    sciezka_pogody = str(tmp_path / 'pogoda.csv')
+    generuj_pogode_csv(sciezka_pogody, 10)
+    magazyn = MenadzerDanychTras().wczytaj_trasy(str(tmp_path / 'trasy.csv'))
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(sciezka_pogody)
+    pref = PreferencjeUzytkownika(temp_pref=(0, 30), max_opady_mm=50, max_trudnosc=4, max_dlugosc_km=25)
+    rekomendator = RekomendatorTras(magazyn, analizator._dane, pref, analizator.indeks)
+    dzien = date(2023, 1, 5)
+
+    def pelne(k):
+        swiezy = RekomendatorTras(magazyn, analizator._dane, pref, analizator.indeks)
+        return wyniki(swiezy.generuj_rekomendacje(dzien.isoformat()))[:k]
+
+    assert wyniki(rekomendator.generuj_rekomendacje(dzien.isoformat(), top_k=20)) == pelne(20)
+    assert rekomendator.ocen(dzien, 20) is rekomendator.ocen(dzien, 20)
+    partycje = dict(rekomendator._stan_top_k().partycje[dzien]['regiony'])
+
+    # Zmiana pogody jednego regionu w tym dniu - najlepszy region spada w rankingu
+    region = rekomendator.generuj_rekomendacje(dzien.isoformat(), top_k=1)[0]['trasa'].region
+    with open(sciezka_pogody, encoding='utf-8') as f:
+        linie = f.read().splitlines()
+    nr = next(i for i, l in enumerate(linie) if l.startswith(f'{dzien.isoformat()},{region},'))
+    pola = linie[nr].split(',')
+    pola[5] = '45.5'
+    linie[nr] = ','.join(pola)
+    with open(sciezka_pogody, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(linie) + '\n')
+    assert analizator.przeladuj_dane(sciezka_pogody, pelne_sprawdzenie=True) == (0, 1)
+
+    assert wyniki(rekomendator.generuj_rekomendacje(dzien.isoformat(), top_k=20)) == pelne(20)
+    kod = magazyn.kod_regionu(region)
+    po_zmianie = rekomendator._stan_top_k().partycje[dzien]['regiony']
+    # Region spadł w rankingu - jego partycja jest liczona ponownie albo region jest odcięty ograniczeniem;
+    # partycje pozostałych regionów są używane bez ponownej oceny
+    assert all(po_zmianie[r] is partycje[r] for r in partycje if r != kod)
+    for k in (5, 200):
+        assert wyniki(rekomendator.generuj_rekomendacje(dzien.isoformat(), top_k=k)) == pelne(k)
+
+def test_partycje_wspoldzielone_przez_rekomendatory_z_pamiecia(tmp_path):
+    from datetime import date
+    from benchmarks.dane_syntetyczne import generuj_trasy_csv, generuj_pogode_csv
+    from src.recommenders.pamiec_wynikow import PamiecWynikow
+    generuj_trasy_csv(str(tmp_path / 'trasy.csv'), 3000)
+    generuj_pogode_csv(str(tmp_path / 'pogoda.csv'), 10)
+    magazyn = MenadzerDanychTras().wczytaj_trasy(str(tmp_path / 'trasy.csv'))
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(str(tmp_path / 'pogoda.csv'))
+    pref = PreferencjeUzytkownika(temp_pref=(0, 30), max_opady_mm=50, max_trudnosc=4, max_dlugosc_km=25)
+    pamiec = PamiecWynikow()
+    dzien = date(2023, 1, 5)
+
+    # Jak serwer: nowy rekomendator na każde zapytanie, wspólna pamięć wyników
+    pierwszy = RekomendatorTras(magazyn, analizator._dane, pref, analizator.indeks, pamiec=pamiec)
+    oczekiwane = pierwszy.ocen(dzien, 3)
+    regiony = pierwszy._stan_top_k().partycje[dzien]['regiony']
+    # Regiony z ograniczeniem poniżej trzeciego wyniku nie są oceniane
+    assert 0 < len(regiony) < len(magazyn.regiony)
+    drugi = RekomendatorTras(magazyn, analizator._dane, pref, analizator.indeks, pamiec=pamiec)
+    assert drugi._stan_top_k() is pierwszy._stan_top_k()
+    assert drugi.ocen(dzien, 3) is oczekiwane
+    bez_pamieci = RekomendatorTras(magazyn, analizator._dane, pref, analizator.indeks).ocen(dzien, 3)
+    assert all((a == b).all() for a, b in zip(oczekiwane, bez_pamieci))
+
+def test_ranking_listy_tras_nie_jest_zapamietywany():
+    from src.models.trasy import Trasa
+    from src.recommenders.pamiec_wynikow import PamiecWynikow
+    trasy = list(MenadzerDanychTras().wczytaj_trasy(SCIEZKA_TRAS, uzyj_migawki=False))
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(SCIEZKA_POGODY, uzyj_migawki=False)
+    rekomendator = RekomendatorTras(trasy, analizator.magazyn, preferencje(), analizator.indeks, pamiec=PamiecWynikow())
+    najlepsza = rekomendator.generuj_rekomendacje('2023-07-05', top_k=1)[0]['trasa']
+
+    # Zamiana trasy w miejscu - długość listy bez zmian
+    i = trasy.index(najlepsza)
+    trasy[i] = Trasa(najlepsza.id, najlepsza.nazwa, najlepsza.region, 99.0, '30h00min', 5.0, 3000,
+                     'Start', 'Meta', '', 'Górska')
+    assert rekomendator.generuj_rekomendacje('2023-07-05', top_k=1)[0]['trasa'].id != najlepsza.id
+
+def test_front_pareto_zawiera_dokladnie_trasy_niezdominowane(tmp_path):
+    from benchmarks.dane_syntetyczne import generuj_trasy_csv, generuj_pogode_csv
+    generuj_trasy_csv(str(tmp_path / 'trasy.csv'), 2000)
+    generuj_pogode_csv(str(tmp_path / 'pogoda.csv'), 10)
+    magazyn = MenadzerDanychTras().wczytaj_trasy(str(tmp_path / 'trasy.csv'))
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(str(tmp_path / 'pogoda.csv'))
+    pref = PreferencjeUzytkownika(temp_pref=(0, 30), max_opady_mm=100, max_trudnosc=5, max_dlugosc_km=30)
+    rekomendator = RekomendatorTras(magazyn, analizator._dane, pref)
+
+    def kryteria(r):
+        t = r['trasa']
+        return (t.dlugosc_km, t.trudnosc, t.przewyzszenie_m, -r['dane_pogodowe'].oblicz_indeks_komfortu())
+
+    def dominuje(a, b):
+        return all(x <= y for x, y in zip(a, b)) and a != b
+
+    wszystkie = [kryteria(r) for r in rekomendator.generuj_rekomendacje('2023-01-05')]
+    oczekiwane = [k for k in wszystkie if not any(dominuje(inne, k) for inne in wszystkie)]
+    front = rekomendator.generuj_front_pareto('2023-01-05')
+    assert [kryteria(r) for r in front] == oczekiwane
+    assert [r['score'] for r in front] == sorted((r['score'] for r in front), reverse=True)
+
+def test_trasy_bez_wlasnej_stacji_dostaja_pogode_najblizszej():
+    magazyn = MenadzerDanychTras().wczytaj_trasy(SCIEZKA_TRAS, uzyj_migawki=False)
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(SCIEZKA_POGODY, uzyj_migawki=False)
+    pref = PreferencjeUzytkownika(temp_pref=(10, 25), max_opady_mm=50, max_trudnosc=5, max_dlugosc_km=50)
+
+    rekomendator = RekomendatorTras(magazyn, analizator.magazyn, pref, analizator.indeks,
+                                    lokalizacja_pogody=analizator.lokalizacja_pogody)
+    gorce = [r for r in rekomendator.generuj_rekomendacje('2023-07-03') if r['trasa'].region == 'Gorce']
+    assert gorce and all(r['dane_pogodowe'].lokalizacja == 'Pieniny' for r in gorce)
+
+    # Bez podanego przypisania - najbliższa stacja według config.REGION_COORDINATES
+    domyslny = RekomendatorTras(magazyn, analizator.magazyn, pref)
+    assert wyniki(domyslny.generuj_rekomendacje('2023-07-03')) == wyniki(rekomendator.generuj_rekomendacje('2023-07-03'))
+
+def test_interfejs_tekstowy_ocenia_trasy_bez_wlasnej_stacji(monkeypatch, capsys):
+    from src.ui.interfejs_user import InterfejsUzytkownika
+    odpowiedzi = iter(['2023-07-03', '10', '25', '50', '5', '50', '0.5', 'n'])
+    monkeypatch.setattr('builtins.input', lambda *_: next(odpowiedzi))
+    InterfejsUzytkownika().uruchom()
+    assert 'Szlak na Turbacz (Gorce)' in capsys.readouterr().out
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+from src.analyzers.analiza_pogody import AnalizatorPogodowy
+from src.data_handlers.menadzer_danych_tras import MenadzerDanychTras
+from src.interface.serwer_rekomendacji import SerwerRekomendacji, zapytanie
+from src.models.preferencje import PreferencjeUzytkownika
+from src.recommenders.rekomendator_tras import RekomendatorTras
+
+SCIEZKA_TRAS = 'data/trasy/trasy.csv'
+SCIEZKA_POGODY = 'data/pogoda/pogoda.csv'
+PREFERENCJE = {'temp_pref': [10, 25], 'max_opady_mm': 5, 'max_trudnosc': 3, 'max_dlugosc_km': 15}
+
+async def surowe_zapytanie(port, dane):
+    """Wysyła surowe bajty zapytania HTTP i zwraca (status, None)."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(dane)
+        await writer.drain()
+        return int((await reader.readline()).split()[1]), None
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+def test_bledy_wewnetrzne_i_zmiana_danych():
+    serwer = SerwerRekomendacji.z_plikow(SCIEZKA_TRAS, SCIEZKA_POGODY, watki=2)
+
+    def blad(parametry):
+        raise ValueError("wewnętrzny szczegół")
+
+    async def scenariusz():
+        nasluch = await serwer.uruchom('127.0.0.1', 0)
+        port = nasluch.sockets[0].getsockname()[1]
+        try:
+            klucz, _ = serwer._wyszukaj({'region': 'Tatry'})
+            # Po przeładowaniu danych klucz scalania jest inny
+            serwer._menadzer_tras.magazyn.dodaj_wiersze([
+                {'id': '99', 'nazwa': 'Nowa', 'region': 'Tatry', 'dlugosc_km': '5', 'czas_przejscia': '2h',
+                 'trudnosc': '2', 'przewyzszenie_m': '300', 'punkt_startowy': 'A', 'punkt_koncowy': 'B',
+                 'opis': '', 'kategoria': 'Górska'}
+            ])
+            assert serwer._wyszukaj({'region': 'Tatry'})[0] != klucz
+            serwer._znajdz_trasy = blad
+            return await zapytanie('127.0.0.1', port, 'POST', '/wyszukaj', {'region': 'Tatry'})
+        finally:
+            nasluch.close()
+            await nasluch.wait_closed()
+            serwer.zamknij()
+
+    # ValueError z wnętrza obliczenia to błąd serwera, bez szczegółów w odpowiedzi
+    assert asyncio.run(scenariusz()) == (500, {'blad': 'Wewnętrzny błąd serwera'})
+
+def test_serwer_odpowiada_jak_rekomendator_i_scala_zapytania():
+    serwer = SerwerRekomendacji.z_plikow(SCIEZKA_TRAS, SCIEZKA_POGODY, watki=2)
+    # Wolniejsze obliczenie, aby równoległe zapytania na pewno trafiły na zadanie w toku
+    zwolnienie = threading.Event()
+    rekomendacje = serwer._rekomendacje
+
+    def wolne_rekomendacje(dane):
+        klucz, oblicz = rekomendacje(dane)
+        return klucz, lambda: (zwolnienie.wait(5), oblicz())[1]
+    serwer._rekomendacje = wolne_rekomendacje
+
+    async def scenariusz():
+        nasluch = await serwer.uruchom('127.0.0.1', 0)
+        port = nasluch.sockets[0].getsockname()[1]
+        try:
+            assert (await zapytanie('127.0.0.1', port, 'GET', '/zdrowie'))[1]['trasy'] == 15
+            tresc = {'data': '2023-07-05', 'preferencje': PREFERENCJE, 'top_k': 5}
+            rownolegle = [asyncio.ensure_future(zapytanie('127.0.0.1', port, 'POST', '/rekomendacje', tresc))
+                          for _ in range(4)]
+            while serwer.statystyki()['zapytania'] < 5:
+                await asyncio.sleep(0.01)
+            zwolnienie.set()
+            odpowiedzi = await asyncio.gather(*rownolegle)
+            wyszukane = await zapytanie('127.0.0.1', port, 'POST', '/wyszukaj', {'region': 'Tatry', 'max_length': 10})
+            bledy = [
+                await zapytanie('127.0.0.1', port, 'POST', '/rekomendacje', {'data': '2023-07-05'}),
+                await zapytanie('127.0.0.1', port, 'POST', '/rekomendacje', {'data': 'jutro', 'preferencje': PREFERENCJE}),
+                await zapytanie('127.0.0.1', port, 'GET', '/rekomendacje'),
+                await zapytanie('127.0.0.1', port, 'GET', '/brak'),
+                await zapytanie('127.0.0.1', port, 'POST', '/wyszukaj', {'min_length': 'abc'}),
+                await zapytanie('127.0.0.1', port, 'POST', '/wyszukaj', {'region': ['Tatry']}),
+                await surowe_zapytanie(port, b'POST /wyszukaj HTTP/1.1\r\nContent-Length: -5\r\n\r\n'),
+                await zapytanie('127.0.0.1', port, 'POST', '/rekomendacje',
+                                {'data': '2023-07-05', 'preferencje': PREFERENCJE, 'top_k': True}),
+            ]
+            return odpowiedzi, wyszukane, bledy, (await zapytanie('127.0.0.1', port, 'GET', '/statystyki'))[1]
+        finally:
+            nasluch.close()
+            await nasluch.wait_closed()
+            serwer.zamknij()
+
+    odpowiedzi, wyszukane, bledy, statystyki = asyncio.run(scenariusz())
+
+    trasy = MenadzerDanychTras().wczytaj_trasy(SCIEZKA_TRAS)
+    analizator = AnalizatorPogodowy()
+    analizator.wczytaj_dane(SCIEZKA_POGODY)
+    pref = PreferencjeUzytkownika(temp_pref=(10, 25), max_opady_mm=5, max_trudnosc=3, max_dlugosc_km=15)
+    oczekiwane = RekomendatorTras(
+        trasy, analizator.magazyn, pref, analizator.indeks, lokalizacja_pogody=analizator.lokalizacja_pogody
+    ).generuj_rekomendacje('2023-07-05', 5)
+    for status, odpowiedz in odpowiedzi:
+        assert status == 200
+        assert [(r['trasa']['id'], r['pogoda']['lokalizacja'], r['score']) for r in odpowiedz['rekomendacje']] == \
+            [(r['trasa'].id, r['dane_pogodowe'].lokalizacja, r['score']) for r in oczekiwane]
+    # Jedno obliczenie rekomendacji dla czterech zapytań i wyszukiwanie; błędne zapytania nie są liczone
+    assert (statystyki['obliczenia'], statystyki['scalone']) == (2, 3)
+
+    assert wyszukane[0] == 200
+    assert [t['id'] for t in wyszukane[1]['trasy']] == \
+        [t.id for t in trasy if t.region == 'Tatry' and t.dlugosc_km <= 10]
+    assert [status for status, _ in bledy] == [400, 400, 405, 404, 400, 400, 400, 400]